@@ -0,0 +1,193 @@
+"""
+ResumeSense 2.0 - Batch Uploads
+Many resumes in one request: several files and/or zip archives. Archive
+members are decompressed one at a time in memory (nothing is unpacked to
+disk), processed in parallel in a process pool, and each result is
+streamed back as an NDJSON line as soon as it is ready.
+"""
+import asyncio
+import hashlib
+import io
+import multiprocessing
+import os
+import time
+import zipfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import PurePosixPath
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import BATCH_WORKERS, MAX_BATCH_FILES, MAX_UPLOAD_BYTES
+
+from .responses import dumps
+from .uploads import ARCHIVE_TYPES, RESUME_TYPES, IngestedUpload, is_docx, sniff_type
+
+BATCH_OPERATIONS = ("parse", "analyze", "match")
+
+# Entry: (index, filename, ext or None, data or error message)
+Entry = Tuple[int, str, Optional[str], Any]
+
+
+def is_archive(upload: IngestedUpload) -> bool:
+    """A zip upload that is not itself a DOCX document."""
+    return upload.ext in ARCHIVE_TYPES
+
+
+def iter_entries(uploads: List[IngestedUpload], max_files: int = MAX_BATCH_FILES) -> Iterator[Entry]:
+    """
+    Yield every resume in the uploads, expanding zip archives lazily.
+
+    Entries that cannot be processed (wrong type, too large, past
+    max_files) are yielded with ext None and an error message.
+    """
+    index = 0
+    for upload in uploads:
+        if not is_archive(upload):
+            if index >= max_files:
+                yield index, upload.filename, None, f"Batch limit of {max_files} files reached"
+            elif upload.size > MAX_UPLOAD_BYTES:
+                yield index, upload.filename, None, f"File too large ({upload.size} bytes)"
+            else:
+                yield index, upload.filename, upload.ext, upload.read_bytes()
+            index += 1
+            continue
+
+        with zipfile.ZipFile(upload.file) as archive:
+            for info in archive.infolist():
+                name = PurePosixPath(info.filename)
+                if info.is_dir() or name.name.startswith(".") or "__MACOSX" in name.parts:
+                    continue
+                filename = f"{upload.filename}/{info.filename}"
+                if index >= max_files:
+                    yield index, filename, None, f"Batch limit of {max_files} files reached"
+                elif info.file_size > MAX_UPLOAD_BYTES:
+                    yield index, filename, None, f"File too large ({info.file_size} bytes)"
+                else:
+                    # Cap the read too: the declared size can't be trusted
+                    with archive.open(info) as member:
+                        data = member.read(MAX_UPLOAD_BYTES + 1)
+                    ext = sniff_type(data[:2048], info.filename)
+                    if ext == ".docx" and not is_docx(io.BytesIO(data)):
+                        ext = ".zip"
+                    if len(data) > MAX_UPLOAD_BYTES:
+                        yield index, filename, None, "File too large"
+                    elif ext not in RESUME_TYPES:
+                        yield index, filename, None, f"Unsupported file content ({ext or 'unknown'})"
+                    else:
+                        yield index, filename, ext, data
+                index += 1
+
+
+def process_entry(operation: str, ext: str, data: bytes, jd_text: Optional[str]) -> Dict[str, Any]:
+    """Run one resume through the services (in a pool worker)."""
+    from app.services.parser_service import parse_resume_stream
+    from app.services.nlp_service import analyze_resume
+    from app.services.matcher_service import match_resume_to_jd
+
+    text = parse_resume_stream(io.BytesIO(data), ext)
+    if operation == "parse":
+        return {"text": text, "char_count": len(text)}
+    if operation == "analyze":
+        return {"data": analyze_resume(text)}
+    return {"resume_data": analyze_resume(text), "match_result": match_resume_to_jd(text, jd_text or "")}
+
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    """Process pool shared by batch requests (threads if BATCH_WORKERS is 0)."""
+    global _executor
+    if _executor is None:
+        if BATCH_WORKERS > 0:
+            _executor = ProcessPoolExecutor(BATCH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        else:
+            _executor = ThreadPoolExecutor(os.cpu_count() or 1)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def stream_results(
+    operation: str,
+    uploads: List[IngestedUpload],
+    jd_text: Optional[str] = None,
+    max_in_flight: Optional[int] = None
+) -> AsyncIterator[bytes]:
+    """
+    Yield one NDJSON line per resume in completion order, then a summary.
+
+    At most max_in_flight entries are decompressed and queued at once, so
+    memory stays bounded however large the archive is. Identical content
+    in flight at the same time is processed once; a result is released as
+    soon as its last waiting entry has been written.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_executor()
+    max_in_flight = max_in_flight or 2 * (BATCH_WORKERS or os.cpu_count() or 1)
+    started = time.perf_counter()
+    entries = iter_entries(uploads)
+    # content key -> [work, entries still waiting for it]
+    shared: Dict[bytes, List[Any]] = {}
+    pending: Dict[asyncio.Future, Tuple[bytes, int, str, float]] = {}
+    total = succeeded = 0
+    exhausted = False
+
+    def line(payload: Dict[str, Any]) -> bytes:
+        return dumps(payload) + b"\n"
+
+    try:
+        while pending or not exhausted:
+            # Top up the in-flight window from the (lazy) entry iterator
+            while not exhausted and len(pending) < max_in_flight:
+                entry = await asyncio.to_thread(next, entries, None)
+                if entry is None:
+                    exhausted = True
+                    break
+                index, filename, ext, payload = entry
+                total += 1
+                if ext is None:
+                    yield line({"index": index, "filename": filename, "success": False, "error": payload})
+                    continue
+                key = hashlib.blake2b(payload, digest_size=16).digest()
+                slot = shared.get(key)
+                if slot is None:
+                    slot = shared[key] = [
+                        loop.run_in_executor(executor, process_entry, operation, ext, payload, jd_text), 0
+                    ]
+                slot[1] += 1
+                pending[asyncio.ensure_future(asyncio.shield(slot[0]))] = (key, index, filename, time.perf_counter())
+
+            if not pending:
+                continue
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                key, index, filename, queued_at = pending.pop(future)
+                slot = shared[key]
+                slot[1] -= 1
+                if not slot[1]:
+                    del shared[key]
+                record: Dict[str, Any] = {"index": index, "filename": filename}
+                try:
+                    record.update(success=True, **future.result())
+                    succeeded += 1
+                except Exception as e:
+                    record.update(success=False, error=str(e) or type(e).__name__)
+                record["elapsed_ms"] = round((time.perf_counter() - queued_at) * 1000, 1)
+                yield line(record)
+    finally:
+        # Stopped early (client went away): drop work that has not started
+        for work, _ in shared.values():
+            work.cancel()
+
+    yield line({
+        "done": True,
+        "total": total,
+        "succeeded": succeeded,
+        "failed": total - succeeded,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+    })
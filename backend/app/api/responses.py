@@ -0,0 +1,209 @@
+"""
+ResumeSense 2.0 - Response Layer
+Fast JSON rendering, negotiated gzip/brotli compression and strong ETags
+for result endpoints, so repeat requests for the same content are
+answered with 304 before any parsing or model work.
+"""
+import gzip
+import hashlib
+import json
+from typing import Any, Optional
+
+from fastapi.responses import JSONResponse, Response
+
+from app.core.config import APP_VERSION, BROTLI_QUALITY, COMPRESS_MIN_BYTES, GZIP_LEVEL
+from app.services.parser_service import ParserService
+from app.services.nlp_service import NLPService
+from app.services.matcher_service import MatcherService
+from app.services.saliency_service import SaliencyService
+from app.services.cache_service import rule_set
+
+# Fastest available JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Brotli compression
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Every component whose output ends up in a result; any bump changes all
+# ETags. The rule-set fingerprints (shared with the result cache) cover
+# edits to the skill list, stopwords or patterns made without a bump.
+RESULT_VERSION = "|".join([
+    APP_VERSION,
+    ParserService.VERSION,
+    NLPService.VERSION,
+    MatcherService.KEYWORDS_VERSION,
+    SaliencyService.VERSION,
+    rule_set("analyze"),
+    rule_set("match")
+])
+
+# Content types that are already compressed or not worth compressing
+INCOMPRESSIBLE_PREFIXES = ("image/", "audio/", "video/", "application/zip", "application/gzip")
+
+# Streaming responses are passed through so events are not held back
+STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON with orjson, msgspec or the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    if msgspec is not None:
+        return msgspec.json.encode(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps()."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ============ ETags ============
+
+def result_etag(operation: str, *parts: Optional[str]) -> str:
+    """
+    Strong ETag for a result, from the operation, the input content hash
+    and parameters, and RESULT_VERSION. Result endpoints answer a matching
+    If-None-Match with 304 before any parsing or model work.
+    """
+    digest = hashlib.sha256(f"{RESULT_VERSION}\x00{operation}".encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x00" if part is None else b"\x01" + part.encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def _opaque(tag: str) -> str:
+    """Strip W/ and the -gzip/-br suffix added by CompressionMiddleware."""
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    for suffix in ('-gzip"', '-br"'):
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(_opaque(tag) == etag for tag in if_none_match.split(","))
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+# ============ Compression ============
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete response bodies of at least
+    minimum_size bytes with brotli (if installed) or gzip, according to
+    Accept-Encoding. Streamed bodies are passed through unchanged.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESS_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = _negotiate(scope)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if (
+                    b"content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or content_type.startswith(INCOMPRESSIBLE_PREFIXES + STREAMING_TYPES)
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message  # Held until we see the body
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small: send as-is
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = _compress(body, encoding)
+            headers = []
+            vary = b"Accept-Encoding"
+            for k, v in start.get("headers", []):
+                name = k.lower()
+                if name == b"etag" and v.endswith(b'"'):
+                    # Keep the ETag strong: the compressed bytes get their own tag
+                    headers.append((k, v[:-1] + b"-" + encoding.encode() + b'"'))
+                elif name == b"vary":
+                    vary = v + b", " + vary
+                elif name != b"content-length":
+                    headers.append((k, v))
+            headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(compressed)).encode()),
+                (b"vary", vary)
+            ]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _negotiate(scope) -> Optional[str]:
+    """Pick br or gzip from Accept-Encoding (ignoring q=0 entries)."""
+    accepted = set()
+    for name, value in scope.get("headers", []):
+        if name == b"accept-encoding":
+            for item in value.decode("latin-1").split(","):
+                coding, _, params = item.strip().partition(";")
+                if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+                    accepted.add(coding.strip().lower())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
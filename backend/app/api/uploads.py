@@ -0,0 +1,230 @@
+"""
+ResumeSense 2.0 - Upload Ingestion
+Chunked, size-capped reading of uploaded files with on-the-fly hashing
+and content-type sniffing from magic bytes.
+"""
+import hashlib
+import io
+import zipfile
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, Iterable, Optional
+
+from fastapi import HTTPException, UploadFile
+from fastapi.responses import JSONResponse
+
+from app.core.config import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE
+from app.core.metrics import UPLOAD_BYTES, stage
+
+RESUME_TYPES = {".pdf", ".docx", ".doc", ".txt"}
+# Zip archives of resumes (batch uploads only)
+ARCHIVE_TYPES = {".zip"}
+
+# Allowance for multipart boundaries and small form fields (jd_text, api_key)
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Control bytes that plain text normally contains (tab, LF, FF, CR, ESC)
+TEXT_CONTROLS = frozenset(b"\t\n\f\r\x1b")
+
+
+@dataclass
+class IngestedUpload:
+    """An uploaded file that has been size-checked, hashed and sniffed."""
+    filename: str
+    ext: str
+    size: int
+    sha256: str
+    file: BinaryIO
+
+    def read_bytes(self) -> bytes:
+        """Return the full content (bounded by MAX_UPLOAD_BYTES)."""
+        self.file.seek(0)
+        return self.file.read()
+
+    def detached(self) -> BinaryIO:
+        """An in-memory copy for work that may outlive the request (Starlette closes self.file)."""
+        return io.BytesIO(self.read_bytes())
+
+
+def sniff_type(head: bytes, filename: Optional[str] = None) -> Optional[str]:
+    """
+    Detect the resume file type from its leading bytes.
+
+    Zip content is reported as ".docx"; ingest_upload() tells DOCX
+    documents from other archives. Text has no magic bytes, so anything without NULs is taken as text in
+    some 8-bit encoding (UTF-8, latin-1, cp1252...). A .txt file with NULs
+    is still text if it is UTF-16.
+
+    Returns:
+        Extension such as ".pdf", or None if the content is not recognised.
+    """
+    # Offset-0 signatures first: a stored zip can contain "%PDF-" in a member
+    if head.startswith(ZIP_MAGIC):
+        return ".docx"
+    if head.startswith(OLE_MAGIC):
+        return ".doc"
+    # The PDF header may be preceded by junk; readers accept it within 1 KB
+    if PDF_MAGIC in head[:1024]:
+        return ".pdf"
+    if head and (_looks_like_text(head) or _looks_like_utf16(head, filename)):
+        return ".txt"
+    return None
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """Heuristic: no NUL bytes and few control characters."""
+    if b"\x00" in head:
+        return False
+    controls = sum(1 for byte in head if byte < 32 and byte not in TEXT_CONTROLS)
+    return controls <= len(head) // 100
+
+
+def _looks_like_utf16(head: bytes, filename: Optional[str]) -> bool:
+    """UTF-16 text: a byte-order mark, or a .txt name and a clean decode."""
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return True
+    if not (filename or "").lower().endswith(".txt"):
+        return False
+    even = head[:len(head) & ~1]
+    for codec in ("utf-16-le", "utf-16-be"):
+        try:
+            text = even.decode(codec)
+        except UnicodeDecodeError as e:
+            # Allow a surrogate pair cut off at the end of the head
+            if e.start < len(even) - 4:
+                continue
+            text = even[:e.start].decode(codec)
+        if text and _looks_like_text(text.encode("utf-8")):
+            return True
+    return False
+
+
+def is_docx(file: BinaryIO) -> bool:
+    """A readable zip holding a Word document part."""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        file.seek(0)
+
+
+def too_large(limit: int = MAX_UPLOAD_BYTES) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum upload size is {limit / (1024 * 1024):g} MB"
+    )
+
+
+async def ingest_upload(
+    file: UploadFile,
+    allowed: Iterable[str] = RESUME_TYPES,
+    max_bytes: int = MAX_UPLOAD_BYTES
+) -> IngestedUpload:
+    """
+    Stream an upload in chunks, hashing it and enforcing the size cap.
+
+    The data stays in Starlette's spooled temp file (in memory while small,
+    on disk beyond that), so memory per request is bounded by the chunk size
+    rather than the upload size. The returned file is rewound and can be
+    passed straight to the parser.
+
+    Raises:
+        HTTPException: 413 if the file exceeds max_bytes, 400 if its content
+            is not one of the allowed types (a zip that is not a DOCX
+            document is ".zip").
+    """
+    allowed = set(allowed)
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+
+    with stage("upload_read"):
+        await file.seek(0)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if not head:
+                head = chunk[:2048]
+            size += len(chunk)
+            if size > max_bytes:
+                raise too_large(max_bytes)
+            digest.update(chunk)
+        await file.seek(0)
+
+    ext = sniff_type(head, file.filename)
+    if ext == ".docx" and not is_docx(file.file):
+        ext = ".zip"
+    UPLOAD_BYTES.observe(size, type=ext or "unknown")
+    if ext is None or ext not in allowed:
+        detected = ext or "unknown"
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file content ({detected}) in {file.filename}. "
+                   f"Supported: {', '.join(sorted(t.lstrip('.').upper() for t in allowed))}"
+        )
+
+    return IngestedUpload(
+        filename=file.filename,
+        ext=ext,
+        size=size,
+        sha256=digest.hexdigest(),
+        file=file.file
+    )
+
+
+class UploadLimitMiddleware:
+    """
+    ASGI middleware that rejects oversized request bodies with 413.
+
+    Requests that declare a Content-Length above the limit are refused
+    before any body is read; chunked requests are cut off as soon as the
+    running total crosses it. Multi-file endpoints get their own limit via
+    path-prefix overrides.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_body_bytes: int = MAX_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+        overrides: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.overrides = overrides or {}
+
+    def limit_for(self, path: str) -> int:
+        for prefix, limit in self.overrides.items():
+            if path.startswith(prefix):
+                return limit
+        return self.max_body_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                response = JSONResponse(
+                    {"detail": too_large(limit - FORM_OVERHEAD_BYTES).detail},
+                    status_code=413
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large(limit - FORM_OVERHEAD_BYTES)
+            return message
+
+        await self.app(scope, limited_receive, send)
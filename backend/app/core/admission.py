@@ -0,0 +1,267 @@
+"""
+ResumeSense 2.0 - Admission Control
+Per-endpoint concurrency budgets with bounded FIFO queues, so a burst on a
+slow endpoint (saliency, pipeline) is shed quickly instead of starving
+everything else on the same worker.
+
+Every budgeted route has its own budget. Upload routes additionally share
+one budget for CPU/model-heavy work; cheap text-only routes skip it, so
+they keep being served while the heavy routes are saturated.
+
+Rejections:
+    429 - the route's own queue is full (slow down on this endpoint)
+    503 - the shared budget is full, or the request waited longer than the
+          queue timeout (the server as a whole is overloaded)
+Both carry Retry-After, estimated from recent service times.
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+
+from .config import (
+    ADMISSION_BUDGETS,
+    ADMISSION_CHEAP_ROUTES,
+    ADMISSION_QUEUE_TIMEOUT,
+    ADMISSION_SHARED_LIMIT,
+    ADMISSION_SHARED_QUEUE
+)
+from .metrics import REGISTRY, Counter, Gauge
+
+ADMISSION_ACTIVE = REGISTRY.register(Gauge(
+    "resumesense_admission_active",
+    "Requests holding a slot of each admission budget.",
+    labels=("budget",)
+))
+ADMISSION_QUEUED = REGISTRY.register(Gauge(
+    "resumesense_admission_queued",
+    "Requests waiting for a slot of each admission budget.",
+    labels=("budget",)
+))
+ADMISSION_REJECTED = REGISTRY.register(Counter(
+    "resumesense_admission_rejected_total",
+    "Requests shed by admission control, by budget and status (429/503).",
+    labels=("budget", "status")
+))
+
+SHARED_BUDGET = "shared"
+
+# Smoothing factor for the service-time estimate behind Retry-After
+_EWMA_ALPHA = 0.2
+_MAX_RETRY_AFTER = 60
+
+
+class Rejected(Exception):
+    """A request was refused by a budget."""
+
+    def __init__(self, budget: str, status: int, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.budget = budget
+        self.status = status
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class Budget:
+    """
+    A concurrency limit with a bounded FIFO queue.
+
+    Not thread-safe: used from the event loop only.
+    """
+
+    def __init__(self, name: str, limit: int, queue: int, timeout: float = ADMISSION_QUEUE_TIMEOUT,
+                 full_status: int = 429):
+        self.name = name
+        self.limit = max(1, limit)
+        self.queue = max(0, queue)
+        self.timeout = timeout
+        self.full_status = full_status
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.service_s = 0.0  # EWMA of time a slot is held
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Seconds until a new request would likely get a slot."""
+        ahead = self.queued + 1
+        return min(_MAX_RETRY_AFTER, max(1, math.ceil(self.service_s * ahead / self.limit)))
+
+    async def acquire(self) -> None:
+        """
+        Take a slot, waiting in line if the budget is busy.
+
+        Raises:
+            Rejected: The queue is full, or no slot freed up within timeout.
+        """
+        if self.active < self.limit and not self._waiters:
+            self._admit()
+            return
+        if self.queued >= self.queue:
+            raise self._reject(self.full_status, f"{self.name} is at capacity")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUED.set(self.queued, budget=self.name)
+        try:
+            # release() hands its slot straight to us by resolving the future
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self._forget(waiter)
+            raise self._reject(503, f"Timed out waiting for {self.name}")
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot that was already handed over
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0)
+            else:
+                self._forget(waiter)
+            raise
+        finally:
+            ADMISSION_QUEUED.set(self.queued, budget=self.name)
+        self.admitted += 1
+
+    def release(self, held_s: float) -> None:
+        """Give a slot back after holding it for held_s seconds."""
+        if held_s > 0:
+            self.service_s = held_s if not self.service_s else (
+                _EWMA_ALPHA * held_s + (1 - _EWMA_ALPHA) * self.service_s
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # Slot moves to the waiter; active unchanged
+                return
+        self.active -= 1
+        ADMISSION_ACTIVE.set(self.active, budget=self.name)
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "limit": self.limit,
+            "queue": self.queue,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "service_ms": round(self.service_s * 1000, 1),
+            "retry_after_s": self.retry_after()
+        }
+
+    def _admit(self) -> None:
+        self.active += 1
+        self.admitted += 1
+        ADMISSION_ACTIVE.set(self.active, budget=self.name)
+
+    def _forget(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def _reject(self, status: int, reason: str) -> Rejected:
+        self.rejected += 1
+        ADMISSION_REJECTED.inc(budget=self.name, status=str(status))
+        return Rejected(self.name, status, self.retry_after(), reason)
+
+
+def parse_budgets(spec: str) -> Dict[str, Tuple[int, int]]:
+    """Parse "path=limit:queue,..." into {path: (limit, queue)}."""
+    budgets = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        path, _, sizes = item.strip().rpartition("=")
+        limit, _, queue = sizes.partition(":")
+        budgets[path] = (int(limit), int(queue or 0))
+    return budgets
+
+
+class AdmissionController:
+    """Owns the per-route budgets and the shared budget for heavy routes."""
+
+    def __init__(
+        self,
+        budgets: Dict[str, Tuple[int, int]],
+        cheap_routes: Iterable[str] = (),
+        shared_limit: int = ADMISSION_SHARED_LIMIT,
+        shared_queue: int = ADMISSION_SHARED_QUEUE,
+        timeout: float = ADMISSION_QUEUE_TIMEOUT
+    ):
+        self.routes = {path: Budget(path, limit, queue, timeout) for path, (limit, queue) in budgets.items()}
+        self.cheap_routes = set(cheap_routes)
+        self.shared = Budget(SHARED_BUDGET, shared_limit, shared_queue, timeout, full_status=503)
+
+    def budgets_for(self, path: str) -> List[Budget]:
+        """Budgets a request must hold, in acquisition order."""
+        budget = self.routes.get(path)
+        if budget is None:
+            return []
+        if path in self.cheap_routes:
+            return [budget]
+        return [budget, self.shared]
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Live usage of every budget."""
+        usage = {path: budget.snapshot() for path, budget in self.routes.items()}
+        usage[SHARED_BUDGET] = self.shared.snapshot()
+        return usage
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware admitting budgeted requests or shedding them with
+    429/503 and Retry-After before any body is read.
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission
+
+    async def __call__(self, scope, receive, send):
+        # CORS preflights are answered without any work; they hold no slot
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        budgets = self.controller.budgets_for(scope["path"])
+        if not budgets:
+            await self.app(scope, receive, send)
+            return
+
+        held: List[Budget] = []
+        try:
+            for budget in budgets:
+                await budget.acquire()
+                held.append(budget)
+        except Rejected as e:
+            for budget in held:
+                budget.release(0.0)
+            response = JSONResponse(
+                {"detail": f"{e.reason}, retry later", "budget": e.budget},
+                status_code=e.status,
+                headers={"Retry-After": str(e.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        except BaseException:
+            for budget in held:
+                budget.release(0.0)
+            raise
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            elapsed = time.perf_counter() - started
+            for budget in reversed(held):
+                budget.release(elapsed)
+
+
+# Shared by the API of this process
+admission = AdmissionController(parse_budgets(ADMISSION_BUDGETS), ADMISSION_CHEAP_ROUTES)
@@ -0,0 +1,124 @@
+"""
+ResumeSense 2.0 - Lazy Backends
+Registry of heavy third-party libraries (PDF/DOCX parsers, imaging, the
+Gemini SDK, numpy) that are imported on first use instead of at module
+load, so CLI commands and new worker processes only pay for what they
+touch. Servers can load everything up front with warm_up().
+"""
+import importlib
+import importlib.util
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+from .metrics import stage
+
+
+@dataclass(frozen=True)
+class Backend:
+    """How to import an optional library and what to install if it is missing."""
+    module: str
+    attr: Optional[str] = None
+    package: str = ""
+
+
+class BackendRegistry:
+    """Imports registered backends on first use; thread-safe."""
+
+    def __init__(self):
+        self._specs: Dict[str, Backend] = {}
+        self._loaded: Dict[str, Any] = {}
+        self._failed: Dict[str, ImportError] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, module: str, attr: Optional[str] = None, package: str = "") -> None:
+        self._specs[name] = Backend(module, attr, package or module.split(".")[0])
+
+    def get(self, name: str) -> Any:
+        """
+        Return the backend, importing it on first use.
+
+        Raises:
+            ImportError: If the library is not installed.
+        """
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+
+        spec = self._specs[name]
+        with self._lock:
+            if name in self._loaded:
+                return self._loaded[name]
+            if name in self._failed:
+                raise self._failed[name]
+            try:
+                with stage(f"import_{name}"):
+                    value = importlib.import_module(spec.module)
+                    if spec.attr:
+                        value = getattr(value, spec.attr)
+            except ImportError as e:
+                self._failed[name] = ImportError(f"{spec.package} is required ({e})")
+                raise self._failed[name] from e
+            self._loaded[name] = value
+            return value
+
+    def optional(self, name: str) -> Optional[Any]:
+        """Like get(), but None if the library is not installed."""
+        try:
+            return self.get(name)
+        except ImportError:
+            return None
+
+    def available(self, name: str) -> bool:
+        """Whether the backend can be imported, without importing it."""
+        if name in self._loaded:
+            return True
+        if name in self._failed:
+            return False
+        try:
+            return importlib.util.find_spec(self._specs[name].module) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+        """
+        Import backends now (all registered by default).
+
+        Returns:
+            Seconds spent per backend, or None for missing libraries.
+        """
+        timings: Dict[str, Optional[float]] = {}
+        for name in names or list(self._specs):
+            started = time.perf_counter()
+            loaded = self.optional(name) is not None
+            timings[name] = round(time.perf_counter() - started, 4) if loaded else None
+        return timings
+
+
+BACKENDS = BackendRegistry()
+BACKENDS.register("fitz", "fitz", package="pymupdf")
+BACKENDS.register("pdfminer", "pdfminer.high_level", "extract_text", package="pdfminer.six")
+BACKENDS.register("docx", "docx", "Document", package="python-docx")
+BACKENDS.register("pil", "PIL.Image", package="Pillow")
+BACKENDS.register("genai", "google.generativeai", package="google-generativeai")
+BACKENDS.register("numpy", "numpy")
+
+
+def backend(name: str) -> Any:
+    """Import (once) and return a registered backend; ImportError if missing."""
+    return BACKENDS.get(name)
+
+
+def optional_backend(name: str) -> Optional[Any]:
+    """Import (once) and return a registered backend, or None if missing."""
+    return BACKENDS.optional(name)
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> Dict[str, Optional[float]]:
+    """Import heavy backends ahead of the first request."""
+    return BACKENDS.warm_up(names)
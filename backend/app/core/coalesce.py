@@ -0,0 +1,78 @@
+"""
+ResumeSense 2.0 - Request Coalescing
+Single-flight execution for expensive per-upload work: concurrent requests
+for the same operation on the same content await one shared computation
+instead of each parsing (and calling the model) separately.
+
+Coalescing is per process and only covers requests that overlap in time;
+nothing is cached once the shared computation finishes. The computation
+belongs to the first caller (the leader) but may outlive its request, so it
+must own its inputs rather than read the leader's upload; its progress
+events reach the leader's stream only.
+"""
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from .metrics import REGISTRY, Counter, Gauge
+
+SINGLE_FLIGHT_REQUESTS = REGISTRY.register(Counter(
+    "resumesense_singleflight_requests_total",
+    "Coalescible requests by operation and role (leader ran the work, follower shared it). "
+    "Coalescing rate = follower / (leader + follower).",
+    labels=("operation", "role")
+))
+SINGLE_FLIGHT_IN_PROGRESS = REGISTRY.register(Gauge(
+    "resumesense_singleflight_in_progress",
+    "Shared computations currently running.",
+    labels=("operation",)
+))
+
+
+def fingerprint(*parts: Optional[str]) -> str:
+    """Short stable digest of request parameters that affect the result."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(b"\x00" if part is None else b"\x01" + part.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls that share an (operation, key)."""
+
+    def __init__(self):
+        self._in_flight: Dict[Tuple[str, Hashable], asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, operation: str, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await factory() once per (operation, key) among overlapping callers.
+
+        The work runs as its own task, so a caller that disconnects or is
+        cancelled does not cancel it for the others. Exceptions are
+        delivered to every caller.
+        """
+        flight_key = (operation, key)
+        task = self._in_flight.get(flight_key)
+        if task is None:
+            SINGLE_FLIGHT_REQUESTS.inc(operation=operation, role="leader")
+            SINGLE_FLIGHT_IN_PROGRESS.inc(operation=operation)
+            task = asyncio.ensure_future(factory())
+            self._in_flight[flight_key] = task
+            task.add_done_callback(lambda t: self._finish(flight_key, operation, t))
+        else:
+            SINGLE_FLIGHT_REQUESTS.inc(operation=operation, role="follower")
+        return await asyncio.shield(task)
+
+    def _finish(self, flight_key: Tuple[str, Hashable], operation: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(flight_key, None)
+        SINGLE_FLIGHT_IN_PROGRESS.dec(operation=operation)
+        # Mark the exception retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+
+# Shared by all API endpoints of this process
+single_flight = SingleFlight()
@@ -11,9 +11,123 @@ DATA_DIR = BASE_DIR / "data"
 # Ensure data directory exists
 DATA_DIR.mkdir(exist_ok=True)
 
+# Reported by the API and part of every result ETag
+APP_VERSION = "2.0.0"
+
 # API Settings
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 
 # NLP Model
 SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Uploads
+MAX_UPLOAD_MB = float(os.getenv("MAX_UPLOAD_MB", "10"))
+MAX_UPLOAD_BYTES = int(MAX_UPLOAD_MB * 1024 * 1024)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(64 * 1024)))
+MAX_BATCH_UPLOAD_MB = float(os.getenv("MAX_BATCH_UPLOAD_MB", "200"))
+MAX_BATCH_UPLOAD_BYTES = int(MAX_BATCH_UPLOAD_MB * 1024 * 1024)
+# Streaming batch endpoint: files per request (after zip expansion) and pool size (0 = threads)
+MAX_BATCH_FILES = int(os.getenv("MAX_BATCH_FILES", "1000"))
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Response compression (brotli is used when installed and accepted)
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Admission control: "path=concurrency:queue" per endpoint (per worker process)
+ADMISSION_ENABLED = os.getenv("ADMISSION_ENABLED", "true").lower() in {"1", "true", "yes"}
+ADMISSION_BUDGETS = os.getenv("ADMISSION_BUDGETS", ",".join([
+    "/api/saliency=4:8",
+    "/api/pipeline=4:8",
+    "/api/parse=8:16",
+    "/api/analyze=8:16",
+    "/api/match/file=8:16",
+    "/api/jobs=4:8",
+    "/api/batch=2:4",
+    "/api/analyze/text=64:128",
+    "/api/match=64:128"
+]))
+# Text-only endpoints that skip the shared budget for upload endpoints
+ADMISSION_CHEAP_ROUTES = tuple(
+    p.strip() for p in os.getenv("ADMISSION_CHEAP_ROUTES", "/api/analyze/text,/api/match").split(",") if p.strip()
+)
+ADMISSION_SHARED_LIMIT = int(os.getenv("ADMISSION_SHARED_LIMIT", "16"))
+ADMISSION_SHARED_QUEUE = int(os.getenv("ADMISSION_SHARED_QUEUE", "32"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+
+# Background jobs
+JOBS_DB = DATA_DIR / "jobs.db"
+JOBS_DIR = DATA_DIR / "jobs"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_WORKER_NICE = int(os.getenv("JOB_WORKER_NICE", "10"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "0.5"))
+# A running task's worker renews its lease while it works; a task whose lease
+# ran out (worker crashed or was killed) is taken over by another worker
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+# Claims of a task before it is failed (a file that crashes every worker)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Finished jobs and their results are deleted after this long
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# Progress streams (Server-Sent Events): how long finished request events are
+# kept for late subscribers, and the keep-alive interval for idle streams
+PROGRESS_TTL_SECONDS = float(os.getenv("PROGRESS_TTL_SECONDS", "300"))
+PROGRESS_HEARTBEAT_SECONDS = float(os.getenv("PROGRESS_HEARTBEAT_SECONDS", "15"))
+# Progress IDs issued and not yet expired, per process
+PROGRESS_MAX_CHANNELS = int(os.getenv("PROGRESS_MAX_CHANNELS", "10000"))
+
+# Parsed-resume store
+RESUME_STORE_DB = Path(os.getenv("RESUME_STORE_DB", str(DATA_DIR / "resumes.db")))
+STORE_COMPRESSION_LEVEL = int(os.getenv("STORE_COMPRESSION_LEVEL", "6"))
+
+# Result cache for text analysis/matching: per-process memory budget, and an
+# optional SQLite file shared by all workers (unset = memory only)
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+RESULT_CACHE_MEMORY_BYTES = int(os.getenv("RESULT_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+RESULT_CACHE_DB = Path(os.environ["RESULT_CACHE_DB"]) if os.getenv("RESULT_CACHE_DB") else None
+RESULT_CACHE_DISK_BYTES = int(os.getenv("RESULT_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+# Pool-wide skill analytics, maintained with the resume store. "sketch" keeps
+# keyword counts in a count-min sketch (width x depth) and a top-k list of
+# fixed size instead of one row per distinct keyword
+ANALYTICS_MODE = os.getenv("ANALYTICS_MODE", "exact").lower()
+ANALYTICS_BUCKET = os.getenv("ANALYTICS_BUCKET", "week").lower()
+ANALYTICS_SKETCH_WIDTH = int(os.getenv("ANALYTICS_SKETCH_WIDTH", str(1 << 15)))
+ANALYTICS_SKETCH_DEPTH = int(os.getenv("ANALYTICS_SKETCH_DEPTH", "4"))
+ANALYTICS_TOP_K = int(os.getenv("ANALYTICS_TOP_K", "256"))
+# Keywords in fewer than this share of pooled resumes are reported as rare
+ANALYTICS_RARE_SHARE = float(os.getenv("ANALYTICS_RARE_SHARE", "0.05"))
+
+# Near-duplicate detection (MinHash/LSH)
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "128"))
+DEDUP_SHINGLE_SIZE = int(os.getenv("DEDUP_SHINGLE_SIZE", "5"))
+
+# Watch-folder indexing
+WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "5"))
+# Files modified more recently than this are still being written; pick them up next scan
+WATCH_SETTLE_SECONDS = float(os.getenv("WATCH_SETTLE_SECONDS", "2"))
+
+# Sharded candidate index (one store database per shard process)
+SHARDS_DIR = Path(os.getenv("SHARDS_DIR", str(DATA_DIR / "shards")))
+SHARD_CLUSTER_FILE = SHARDS_DIR / "cluster.json"
+SHARD_BASE_PORT = int(os.getenv("SHARD_BASE_PORT", "7400"))
+# Shared secret for shard connections. Messages are pickles, so whoever
+# holds it can run code on a shard: there is no default. Required to serve
+# shards for other nodes; `shard start` generates one per local cluster.
+SHARD_AUTHKEY = os.getenv("SHARD_AUTHKEY", "").encode("utf-8")
+# Virtual nodes per shard on the hash ring; more = more even placement
+SHARD_VNODES = int(os.getenv("SHARD_VNODES", "64"))
+
+# Import parsing/AI libraries at server start instead of on the first request
+WARM_UP_BACKENDS = os.getenv("WARM_UP_BACKENDS", "true").lower() in {"1", "true", "yes"}
+
+# Observability
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() in {"1", "true", "yes"}
+
+# Profiling (API profiling is disabled unless ADMIN_TOKEN is set)
+PROFILES_DIR = DATA_DIR / "profiles"
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "25"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
@@ -0,0 +1,305 @@
+"""
+ResumeSense 2.0 - Metrics
+Lightweight in-process instrumentation: per-stage latency histograms,
+counters and gauges exposed in Prometheus text format, plus optional
+Server-Timing headers.
+
+Metrics are per process; with several uvicorn workers each one exposes
+its own /metrics and the scraper aggregates them.
+"""
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import SERVER_TIMING
+
+# Seconds; spans cheap regex work up to slow remote model calls
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Bytes; 1 KB .. 64 MB
+SIZE_BUCKETS = tuple(1024 * 4 ** i for i in range(9))
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    """Base class holding name, help text and label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _format_labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labels, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [f"{self.name}{self._format_labels(k)} {_num(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observations (cumulative on render)."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(self.buckets) + 2)
+            series[idx] += 1
+            series[-1] += value
+
+    def count(self, **labels: str) -> int:
+        series = self._values.get(self._key(labels))
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                le = 'le="%s"' % _num(bound)
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_num(series[-1])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together at /metrics."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _num(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "resumesense_stage_duration_seconds",
+    "Latency of internal processing stages.",
+    labels=("stage",)
+))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "resumesense_request_duration_seconds",
+    "End-to-end HTTP request latency.",
+    labels=("method", "route", "status")
+))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "resumesense_requests_in_flight",
+    "HTTP requests currently being served.",
+    labels=("route",)
+))
+UPLOAD_BYTES = REGISTRY.register(Histogram(
+    "resumesense_upload_bytes",
+    "Size of uploaded files.",
+    labels=("type",),
+    buckets=SIZE_BUCKETS
+))
+RESPONSE_BYTES = REGISTRY.register(Histogram(
+    "resumesense_response_bytes",
+    "Size of HTTP response bodies.",
+    labels=("route",),
+    buckets=SIZE_BUCKETS
+))
+PARSER_BACKEND = REGISTRY.register(Counter(
+    "resumesense_parser_extractions_total",
+    "Documents extracted, by backend that produced the text.",
+    labels=("backend",)
+))
+PARSER_FALLBACKS = REGISTRY.register(Counter(
+    "resumesense_parser_fallbacks_total",
+    "PDFs that fell back from PyMuPDF to pdfminer.",
+    labels=("reason",)
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "resumesense_cache_lookups_total",
+    "Cache lookups by cache name and result (hit/miss).",
+    labels=("cache", "result")
+))
+
+
+# Stage timings collected for the current request's Server-Timing header
+_server_timing: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("server_timing", default=None)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a block as a named processing stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _server_timing.get()
+        if timings is not None:
+            timings.append((name, elapsed))
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of stage() for whole functions."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup for hit-ratio reporting."""
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def render_metrics() -> str:
+    """Render all metrics in Prometheus text exposition format."""
+    return REGISTRY.render()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency, in-flight requests and
+    response sizes, and adding a Server-Timing header when enabled.
+    """
+
+    def __init__(self, app, router=None, server_timing: bool = SERVER_TIMING):
+        self.app = app
+        self.router = router
+        self.server_timing = server_timing
+        if router is not None:
+            # Imported here so services and the CLI, which only use stage(),
+            # don't load Starlette
+            from starlette.routing import Match
+            self._full_match = Match.FULL
+
+    def _route_label(self, scope) -> str:
+        if self.router is not None:
+            for route in self.router.routes:
+                match, _ = route.matches(scope)
+                if match == self._full_match:
+                    return route.path
+        return "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = self._route_label(scope)
+        timings: List[Tuple[str, float]] = []
+        token = _server_timing.set(timings)
+        started = time.perf_counter()
+        status = 500
+        body_bytes = 0
+
+        async def send_wrapper(message):
+            nonlocal status, body_bytes
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    total = time.perf_counter() - started
+                    entries = [f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in timings]
+                    entries.append(f"app;dur={total * 1000:.1f}")
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (b"server-timing", ", ".join(entries).encode("latin-1"))
+                    ]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.inc(route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec(route=route)
+            _server_timing.reset(token)
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - started,
+                method=scope["method"], route=route, status=str(status)
+            )
+            RESPONSE_BYTES.observe(body_bytes, route=route)
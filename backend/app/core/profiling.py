@@ -0,0 +1,260 @@
+"""
+ResumeSense 2.0 - Profiling
+Opt-in capture of a single CLI run or API request with cProfile or a
+low-overhead sampling profiler. Profiles are saved under
+DATA_DIR/profiles together with a top-N hot-function summary.
+
+Nothing here runs unless a profile is explicitly requested.
+"""
+import cProfile
+import hmac
+import io
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .config import ADMIN_TOKEN, PROFILE_TOP_N, PROFILES_DIR
+
+MODES = {"cprofile", "sample"}
+
+# Only one profile at a time: cProfile cannot be nested and samples would mix
+_active = threading.Lock()
+
+
+@dataclass
+class Profile:
+    """A captured profile and where it was saved."""
+    id: str
+    label: str
+    mode: str
+    duration_ms: float = 0.0
+    data_path: Optional[Path] = None
+    summary_path: Optional[Path] = None
+    summary: str = ""
+    # API requests: other requests that ran while this one was profiled
+    overlapping: Optional[int] = None
+
+
+class SamplingProfiler:
+    """
+    Periodically snapshots the stacks of all threads.
+
+    Unlike cProfile this also sees work handed to worker threads
+    (asyncio.to_thread, the Starlette threadpool), which is where most of
+    an API request's CPU time is spent.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self.self_counts: Counter = Counter()
+        self.total_counts: Counter = Counter()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="resumesense-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if not stack or _is_idle(stack[0]):
+                    continue
+                self.samples += 1
+                self.self_counts[stack[0]] += 1
+                for func in set(stack):
+                    self.total_counts[func] += 1
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """Stacks in collapsed format, usable with flamegraph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+    def summary(self, top_n: int) -> str:
+        ms = self.interval * 1000
+        lines = [f"{self.samples} samples every {ms:g} ms", "", f"{'self%':>7} {'total%':>7}  function"]
+        total = self.samples or 1
+        for func, count in self.self_counts.most_common(top_n):
+            lines.append(f"{100 * count / total:7.1f} {100 * self.total_counts[func] / total:7.1f}  {func}")
+        return "\n".join(lines) + "\n"
+
+
+_IDLE_FUNCTIONS = re.compile(r"^(wait|select|poll|epoll|_worker|accept|sleep|get) \(")
+
+
+def _is_idle(leaf: str) -> bool:
+    """Skip threads parked in the event loop or an idle pool."""
+    return bool(_IDLE_FUNCTIONS.match(leaf))
+
+
+def is_admin(token: Optional[str]) -> bool:
+    """Check an admin token; always False when ADMIN_TOKEN is not configured."""
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+
+@contextmanager
+def profile_run(label: str, mode: str = "cprofile", top_n: int = PROFILE_TOP_N) -> Iterator[Optional[Profile]]:
+    """
+    Profile the enclosed block and save the result.
+
+    Yields None (and runs unprofiled) if another profile is in progress;
+    otherwise yields a Profile that is filled in when the block exits.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown profile mode: {mode}. Supported: {sorted(MODES)}")
+    if not _active.acquire(blocking=False):
+        yield None
+        return
+
+    profile = Profile(id=f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}", label=label, mode=mode)
+    profiler = cProfile.Profile() if mode == "cprofile" else SamplingProfiler()
+    started = time.perf_counter()
+    try:
+        if mode == "cprofile":
+            profiler.enable()
+        else:
+            profiler.start()
+        try:
+            yield profile
+        finally:
+            if mode == "cprofile":
+                profiler.disable()
+            else:
+                profiler.stop()
+            profile.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            _save(profile, profiler, top_n)
+    finally:
+        _active.release()
+
+
+def _save(profile: Profile, profiler, top_n: int) -> None:
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    safe_label = re.sub(r"[^\w.-]+", "_", profile.label)[:60]
+    base = PROFILES_DIR / f"{profile.id}-{safe_label}"
+
+    header = f"{profile.label} ({profile.mode}) - {profile.duration_ms} ms\n"
+    if profile.overlapping:
+        header += (
+            f"{profile.overlapping} other requests ran meanwhile; their work on the event loop"
+            f"{' and in threads' if profile.mode == 'sample' else ''} is included\n"
+        )
+    header += "\n"
+    if isinstance(profiler, cProfile.Profile):
+        profile.data_path = base.with_suffix(".prof")
+        profiler.dump_stats(str(profile.data_path))
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).strip_dirs().sort_stats("cumulative").print_stats(top_n)
+        profile.summary = header + out.getvalue().strip() + "\n"
+    else:
+        profile.data_path = base.with_suffix(".folded")
+        profile.data_path.write_text(profiler.folded())
+        profile.summary = header + profiler.summary(top_n)
+
+    profile.summary_path = base.with_suffix(".txt")
+    profile.summary_path.write_text(profile.summary)
+
+
+def load_summary(profile_id: str) -> Optional[str]:
+    """Return the saved summary for a profile ID, or None if unknown."""
+    if not re.fullmatch(r"[\w-]+", profile_id):
+        return None
+    matches = sorted(PROFILES_DIR.glob(f"{profile_id}-*.txt")) if PROFILES_DIR.exists() else []
+    return matches[0].read_text() if matches else None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a single request on demand.
+
+    Send "X-Profile: sample" (or "cprofile") together with a matching
+    "X-Admin-Token" header. The response carries X-Profile-Id; fetch the
+    summary from /api/admin/profiles/{id}. Only installed when ADMIN_TOKEN
+    is set, so unprofiled requests pay nothing.
+
+    Profilers are process-wide: cProfile sees every coroutine on the event
+    loop and the sampler every thread, so requests running at the same
+    time show up in the profile. The summary states how many did (profile
+    on an otherwise idle server for a clean capture). One profile runs at
+    a time; a profile request arriving meanwhile gets 409.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._in_flight = 0
+        self._profile: Optional[Profile] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        if self._profile is not None:
+            self._profile.overlapping += 1
+        try:
+            await self._handle(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _handle(self, scope, receive, send):
+
+        mode = token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                mode = value.decode("latin-1").strip().lower() or "sample"
+            elif name == b"x-admin-token":
+                token = value.decode("latin-1")
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not is_admin(token) or mode not in MODES:
+            status = 403 if not is_admin(token) else 400
+            detail = b"Profiling requires a valid X-Admin-Token" if status == 403 else b"X-Profile must be sample or cprofile"
+            await _plain_response(send, status, detail)
+            return
+
+        with profile_run(f"{scope['method']} {scope['path']}", mode) as profile:
+            if profile is None:
+                await _plain_response(send, 409, b"Another request is being profiled; retry when it finishes")
+                return
+
+            profile.overlapping = self._in_flight - 1
+            self._profile = profile
+
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", profile.id.encode())
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._profile = None
+
+
+async def _plain_response(send, status: int, body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": body})
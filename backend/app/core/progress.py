@@ -0,0 +1,237 @@
+"""
+ResumeSense 2.0 - Progress Events
+Stage events for long-running requests, streamed to clients over
+Server-Sent Events. A client asks for a request ID (POST /api/progress),
+sends it as X-Request-ID on the slow request and follows
+GET /api/progress/{id}; services report stages (parsed, analyzed, matched,
+rendered, model-responded) with their partial results as soon as they
+exist.
+
+Events carry partial results (contact details, page images), so IDs are
+unguessable, issued by the server and good for one request; unknown IDs
+are neither tracked nor subscribable.
+
+Like the metrics, channels live in the worker process that served the
+request; the SSE request must reach the same worker.
+"""
+import asyncio
+import json
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+from .config import PROGRESS_HEARTBEAT_SECONDS, PROGRESS_MAX_CHANNELS, PROGRESS_TTL_SECONDS
+
+# Events that end a stream
+TERMINAL_EVENTS = ("completed", "failed")
+
+# Shape of issued IDs (URL-safe base64), checked before any lookup
+REQUEST_ID = re.compile(r"^[A-Za-z0-9_-]{32}$")
+
+
+class ProgressFull(Exception):
+    """Too many progress IDs are outstanding in this process."""
+
+
+class Channel:
+    """Event history and live subscribers for one request ID."""
+
+    def __init__(self):
+        self.events: List[Tuple[int, str, Any]] = []
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.finished = False
+        self.claimed = False
+        self.touched = time.monotonic()
+
+
+class ProgressHub:
+    """Per-process registry of progress channels."""
+
+    def __init__(self, ttl: float = PROGRESS_TTL_SECONDS, max_channels: int = PROGRESS_MAX_CHANNELS):
+        self.ttl = ttl
+        self.max_channels = max_channels
+        self._channels: Dict[str, Channel] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self) -> int:
+        return len(self._channels)
+
+    def __contains__(self, request_id: str) -> bool:
+        self._expire()
+        return request_id in self._channels
+
+    def issue(self) -> str:
+        """
+        Open a channel under a new unguessable ID.
+
+        Raises:
+            ProgressFull: If max_channels IDs are outstanding.
+        """
+        self._expire()
+        if len(self._channels) >= self.max_channels:
+            raise ProgressFull(f"{len(self._channels)} progress streams open")
+        request_id = secrets.token_urlsafe(24)
+        self._channels[request_id] = Channel()
+        return request_id
+
+    def claim(self, request_id: str) -> bool:
+        """Bind an issued ID to the request now starting; False if unknown or used."""
+        channel = self._get(request_id)
+        if channel is None or channel.claimed:
+            return False
+        channel.claimed = True
+        return True
+
+    def publish(self, request_id: str, event: str, data: Any = None) -> None:
+        """Record an event; safe to call from worker threads."""
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is not None and running is not loop:
+            loop.call_soon_threadsafe(self._publish, request_id, event, data)
+        else:
+            self._publish(request_id, event, data)
+
+    def _publish(self, request_id: str, event: str, data: Any) -> None:
+        channel = self._get(request_id)
+        if channel is None or channel.finished:
+            return
+        seq = len(channel.events) + 1
+        channel.events.append((seq, event, data))
+        channel.finished = event in TERMINAL_EVENTS
+        for queue in channel.subscribers:
+            queue.put_nowait((seq, event, data))
+
+    async def subscribe(self, request_id: str, last_event_id: int = 0) -> AsyncIterator[Tuple[int, str, Any]]:
+        """
+        Yield past events after last_event_id, then live ones, until a
+        terminal event. Subscribing before the request starts is fine.
+        Yields (0, "heartbeat", None) while idle; yields nothing for an
+        unknown or expired ID.
+        """
+        self._loop = asyncio.get_running_loop()
+        channel = self._get(request_id)
+        if channel is None:
+            return
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in channel.events:
+            if item[0] > last_event_id:
+                queue.put_nowait(item)
+        channel.subscribers.add(queue)
+        idle_since = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(queue.get(), PROGRESS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Nothing for a whole TTL: the request never came
+                    if channel.finished or time.monotonic() - idle_since > self.ttl:
+                        return
+                    yield 0, "heartbeat", None
+                    continue
+                idle_since = time.monotonic()
+                yield item
+                if item[1] in TERMINAL_EVENTS:
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+            channel.touched = time.monotonic()
+
+    def _get(self, request_id: str) -> Optional[Channel]:
+        self._expire()
+        channel = self._channels.get(request_id)
+        if channel is not None:
+            channel.touched = time.monotonic()
+        return channel
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        stale = [
+            key for key, channel in self._channels.items()
+            if channel.touched < cutoff and not channel.subscribers
+        ]
+        for key in stale:
+            del self._channels[key]
+
+
+# Shared by the API of this process
+hub = ProgressHub()
+
+# Request ID whose stages the current code is part of (propagates into
+# asyncio.to_thread workers, like the Server-Timing collector)
+_current: ContextVar[Optional[str]] = ContextVar("progress_request", default=None)
+
+
+def report(event: str, data: Any = None) -> None:
+    """Publish a stage event for the current request, if it is being followed."""
+    request_id = _current.get()
+    if request_id is not None:
+        hub.publish(request_id, event, data)
+
+
+@contextmanager
+def tracking(request_id: Optional[str]) -> Iterator[None]:
+    token = _current.set(request_id)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def format_event(seq: int, event: str, data: Any) -> bytes:
+    """Encode one SSE message."""
+    if event == "heartbeat":
+        return b": keep-alive\n\n"
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+    return f"id: {seq}\nevent: {event}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class ProgressMiddleware:
+    """
+    ASGI middleware that tracks requests carrying an issued, unused
+    X-Request-ID: stage events inside the request are published under that
+    ID, ending with "completed" (status < 400) or "failed".
+    """
+
+    def __init__(self, app, progress_hub: ProgressHub = hub):
+        self.app = app
+        self.hub = progress_hub
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        self.hub._loop = asyncio.get_running_loop()
+        if request_id is None or not REQUEST_ID.match(request_id) or not self.hub.claim(request_id):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        self.hub.publish(request_id, "accepted", {"path": scope["path"]})
+        try:
+            with tracking(request_id):
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            self.hub.publish(
+                request_id,
+                "completed" if status < 400 else "failed",
+                {"status": status}
+            )
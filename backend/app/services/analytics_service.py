@@ -0,0 +1,560 @@
+"""
+ResumeSense 2.0 - Skill Analytics Service
+Pool-wide skill statistics kept up to date incrementally: every write to
+the resume store adds (and every replace or delete subtracts) a resume's
+contribution in the same transaction, so dashboards never re-analyze the
+pool.
+
+Maintained per store:
+    - resumes per skill, and per matcher keyword (for "which of the JD's
+      missing skills are rare in our pool")
+    - skill co-occurrence (resumes having both skills)
+    - resumes per skill per time bucket (day, week or month the resume was
+      first stored)
+
+Skills come from a fixed list, so skill, pair and bucket counts are bounded
+by the vocabulary, not the pool. Keywords are open-ended; in sketch mode
+(ANALYTICS_MODE=sketch) they are kept in a count-min sketch plus a
+space-saving top-k list of fixed size instead of one row per keyword.
+Every query reads a bounded number of rows or cells, whatever the pool size.
+"""
+import hashlib
+import heapq
+import json
+import math
+import sqlite3
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from itertools import combinations, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config import (
+    ANALYTICS_BUCKET,
+    ANALYTICS_MODE,
+    ANALYTICS_RARE_SHARE,
+    ANALYTICS_SKETCH_DEPTH,
+    ANALYTICS_SKETCH_WIDTH,
+    ANALYTICS_TOP_K,
+    RESUME_STORE_DB
+)
+
+from .nlp_service import NLPService
+
+ANALYTICS_MODES = ("exact", "sketch")
+BUCKETS = ("day", "week", "month")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skill_counts (
+    kind TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, term)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS skill_counts_rank ON skill_counts (kind, count);
+CREATE TABLE IF NOT EXISTS skill_pairs (
+    a TEXT NOT NULL,
+    b TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (a, b)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS skill_buckets (
+    bucket TEXT NOT NULL,
+    term TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, term)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS analytics_state (
+    name TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+# skill_counts kinds; "pool" holds the totals
+SKILL, KEYWORD, POOL = "skill", "keyword", "pool"
+
+# Resumes aggregated in memory at a time while rebuilding
+REBUILD_CHUNK = 5000
+
+
+@dataclass(slots=True)
+class Contribution:
+    """What one stored resume adds to the analytics."""
+    skills: Tuple[str, ...]
+    keywords: FrozenSet[str]
+    created_at: float
+
+
+def bucket_key(timestamp: float, granularity: str = ANALYTICS_BUCKET) -> str:
+    """UTC bucket label: 2024-03-05 (day), 2024-W10 (ISO week) or 2024-03 (month)."""
+    moment = datetime.fromtimestamp(timestamp, timezone.utc)
+    if granularity == "day":
+        return moment.strftime("%Y-%m-%d")
+    if granularity == "month":
+        return moment.strftime("%Y-%m")
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def recent_buckets(periods: int, granularity: str = ANALYTICS_BUCKET, now: Optional[float] = None) -> List[str]:
+    """Labels of the current bucket and the periods - 1 before it, newest first."""
+    moment = datetime.fromtimestamp(time.time() if now is None else now, timezone.utc)
+    keys = []
+    for _ in range(max(1, periods)):
+        keys.append(bucket_key(moment.timestamp(), granularity))
+        if granularity == "day":
+            moment -= timedelta(days=1)
+        elif granularity == "week":
+            moment -= timedelta(weeks=1)
+        else:
+            moment = moment.replace(day=1) - timedelta(days=1)
+    return keys
+
+
+def skill_label(skill: str) -> str:
+    """Canonical label for user input ("python" -> "Python")."""
+    return NLPService.SKILL_LABELS.get(skill.strip().lower(), skill.strip())
+
+
+def cell_indexes(term: str, width: int, depth: int) -> List[int]:
+    """Flat index of term's cell in each of the depth rows of a count-min sketch."""
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=4 * depth).digest()
+    return [row * width + int.from_bytes(digest[4 * row:4 * row + 4], "little") % width for row in range(depth)]
+
+
+class CountMinSketch:
+    """
+    Approximate counts in depth x width cells. Estimates never undercount;
+    they overcount by at most e / width of the total with probability
+    1 - exp(-depth). Supports removals while true counts stay >= 0.
+    """
+
+    def __init__(self, width: int = ANALYTICS_SKETCH_WIDTH, depth: int = ANALYTICS_SKETCH_DEPTH,
+                 cells: Optional[bytes] = None):
+        self.width = width
+        self.depth = depth
+        self.cells = array("q", cells or bytes(8 * width * depth))
+
+    def add(self, term: str, count: int = 1) -> None:
+        for i in cell_indexes(term, self.width, self.depth):
+            self.cells[i] += count
+
+    def estimate(self, term: str) -> int:
+        return max(0, min(self.cells[i] for i in cell_indexes(term, self.width, self.depth)))
+
+    @staticmethod
+    def error_bound(width: int, total: int) -> int:
+        """Overcount bound of a width-cell-wide sketch after total additions."""
+        return math.ceil(math.e / width * total)
+
+    def tobytes(self) -> bytes:
+        return self.cells.tobytes()
+
+
+class SpaceSaving:
+    """
+    Approximate top-k (Metwally et al.): capacity counters; an untracked
+    term takes over the smallest counter and inherits its count as error.
+    Any term with a true count above total / capacity is tracked.
+    """
+
+    def __init__(self, capacity: int = ANALYTICS_TOP_K, counters: Optional[Dict[str, List[int]]] = None):
+        self.capacity = capacity
+        self.counters: Dict[str, List[int]] = counters or {}  # term -> [count, error]
+        self._heap = [(count, term) for term, (count, _) in self.counters.items()]
+        heapq.heapify(self._heap)
+
+    def add(self, term: str, count: int = 1) -> None:
+        counter = self.counters.get(term)
+        if counter is not None:
+            counter[0] = max(counter[1], counter[0] + count)
+            heapq.heappush(self._heap, (counter[0], term))
+        elif count <= 0:
+            return  # Removal of an untracked term: already folded into errors
+        elif len(self.counters) < self.capacity:
+            self.counters[term] = [count, 0]
+            heapq.heappush(self._heap, (count, term))
+        else:
+            floor, victim = self._pop_min()
+            del self.counters[victim]
+            self.counters[term] = [floor + count, floor]
+            heapq.heappush(self._heap, (floor + count, term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(count, term) for term, (count, _) in self.counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[int, str]:
+        # Heap entries go stale when a count changes; skip those
+        while True:
+            count, term = heapq.heappop(self._heap)
+            counter = self.counters.get(term)
+            if counter is not None and counter[0] == count:
+                return count, term
+
+    def top(self, limit: int) -> List[Tuple[str, int, int]]:
+        """(term, count, error) for the largest counters."""
+        ranked = sorted(self.counters.items(), key=lambda item: (-item[1][0], item[0]))
+        return [(term, count, error) for term, (count, error) in ranked[:limit]]
+
+    def tojson(self) -> str:
+        return json.dumps(self.counters, separators=(",", ":"))
+
+
+class _Sketches:
+    """The keyword sketches of one store, loaded on first use."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self._cms: Optional[CountMinSketch] = None
+        self._top: Optional[SpaceSaving] = None
+
+    def _state(self, name: str) -> Optional[bytes]:
+        row = self.conn.execute("SELECT value FROM analytics_state WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    @property
+    def cms(self) -> CountMinSketch:
+        if self._cms is None:
+            self._cms = CountMinSketch(cells=self._state("keyword_cms"))
+        return self._cms
+
+    @property
+    def top(self) -> SpaceSaving:
+        if self._top is None:
+            counters = self._state("keyword_top")
+            self._top = SpaceSaving(counters=json.loads(counters) if counters else None)
+        return self._top
+
+    def estimates(self, terms: Iterable[str]) -> Dict[str, int]:
+        """Count-min estimates reading only the depth cells of each term."""
+        # substr() on a BLOB slices bytes (1-based); one query per term
+        query = "SELECT {} FROM analytics_state WHERE name = 'keyword_cms'".format(
+            ", ".join(["substr(value, ?, 8)"] * ANALYTICS_SKETCH_DEPTH)
+        )
+        counts = {}
+        for term in terms:
+            offsets = [8 * i + 1 for i in cell_indexes(term, ANALYTICS_SKETCH_WIDTH, ANALYTICS_SKETCH_DEPTH)]
+            row = self.conn.execute(query, offsets).fetchone()
+            cells = [int.from_bytes(cell, "little", signed=True) for cell in row] if row else [0]
+            counts[term] = max(0, min(cells))
+        return counts
+
+    def save(self) -> None:
+        if self._cms is not None:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analytics_state (name, value) VALUES ('keyword_cms', ?)", (self._cms.tobytes(),)
+            )
+        if self._top is not None:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analytics_state (name, value) VALUES ('keyword_top', ?)", (self._top.tojson(),)
+            )
+
+
+class SkillAnalytics:
+    """Maintains and queries the skill analytics tables of a resume store."""
+
+    @staticmethod
+    def config() -> Dict[str, Any]:
+        """Settings the stored aggregates depend on; a change triggers a rebuild."""
+        config: Dict[str, Any] = {"mode": ANALYTICS_MODE, "bucket": ANALYTICS_BUCKET}
+        if ANALYTICS_MODE == "sketch":
+            config.update(width=ANALYTICS_SKETCH_WIDTH, depth=ANALYTICS_SKETCH_DEPTH, top_k=ANALYTICS_TOP_K)
+        return config
+
+    @classmethod
+    def ensure_schema(cls, conn: sqlite3.Connection) -> None:
+        if ANALYTICS_MODE not in ANALYTICS_MODES:
+            raise ValueError(f"Unknown ANALYTICS_MODE: {ANALYTICS_MODE}. Supported: {', '.join(ANALYTICS_MODES)}")
+        if ANALYTICS_BUCKET not in BUCKETS:
+            raise ValueError(f"Unknown ANALYTICS_BUCKET: {ANALYTICS_BUCKET}. Supported: {', '.join(BUCKETS)}")
+        conn.executescript(SCHEMA)
+
+    @classmethod
+    def in_sync(cls, conn: sqlite3.Connection) -> bool:
+        row = conn.execute("SELECT value FROM analytics_state WHERE name = 'config'").fetchone()
+        return row is not None and json.loads(row[0]) == cls.config()
+
+    @classmethod
+    def sync(cls, conn: sqlite3.Connection, source: Callable[[], Iterable[Contribution]]) -> bool:
+        """
+        Rebuild from source() if the aggregates were built with other
+        settings, or never built (a store created before analytics).
+
+        Returns:
+            True if a rebuild ran.
+        """
+        if cls.in_sync(conn):
+            return False
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have rebuilt while we waited for the lock
+            rebuilt = not cls.in_sync(conn)
+            if rebuilt:
+                cls.rebuild(conn, source())
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return rebuilt
+
+    @classmethod
+    def rebuild(cls, conn: sqlite3.Connection, contributions: Iterable[Contribution]) -> None:
+        """Recompute every aggregate (caller holds a write transaction)."""
+        for table in ("skill_counts", "skill_pairs", "skill_buckets", "analytics_state"):
+            conn.execute(f"DELETE FROM {table}")
+        sketches = _Sketches(conn) if ANALYTICS_MODE == "sketch" else None
+        contributions = iter(contributions)
+        while True:
+            chunk = list(islice(contributions, REBUILD_CHUNK))
+            if not chunk:
+                break
+            cls._write(conn, cls._deltas(chunk, ()), sketches)
+        if sketches is not None:
+            sketches.save()
+        conn.execute(
+            "INSERT OR REPLACE INTO analytics_state (name, value) VALUES ('config', ?)",
+            (json.dumps(cls.config()),)
+        )
+
+    @classmethod
+    def apply(cls, conn: sqlite3.Connection, added: Sequence[Contribution], removed: Sequence[Contribution]) -> None:
+        """Add and subtract resume contributions (caller holds a write transaction)."""
+        if not added and not removed:
+            return
+        sketches = _Sketches(conn) if ANALYTICS_MODE == "sketch" else None
+        cls._write(conn, cls._deltas(added, removed), sketches)
+        if sketches is not None:
+            sketches.save()
+
+    @staticmethod
+    def _deltas(added: Iterable[Contribution], removed: Iterable[Contribution]):
+        counts: Counter = Counter()
+        pairs: Counter = Counter()
+        buckets: Counter = Counter()
+        keywords: Counter = Counter()
+        for sign, contributions in ((1, added), (-1, removed)):
+            for c in contributions:
+                skills = sorted(set(c.skills))
+                bucket = bucket_key(c.created_at)
+                counts[(POOL, "resumes")] += sign
+                counts[(POOL, "keywords")] += sign * len(c.keywords)
+                buckets[(bucket, "")] += sign
+                for skill in skills:
+                    counts[(SKILL, skill)] += sign
+                    buckets[(bucket, skill)] += sign
+                for a, b in combinations(skills, 2):
+                    pairs[(a, b)] += sign
+                    pairs[(b, a)] += sign
+                for keyword in c.keywords:
+                    keywords[keyword] += sign
+        return counts, pairs, buckets, keywords
+
+    @staticmethod
+    def _write(conn: sqlite3.Connection, deltas, sketches: Optional[_Sketches]) -> None:
+        counts, pairs, buckets, keywords = deltas
+        if sketches is None:
+            counts.update({(KEYWORD, keyword): n for keyword, n in keywords.items()})
+        else:
+            for keyword, n in keywords.items():
+                if n:
+                    sketches.cms.add(keyword, n)
+                    sketches.top.add(keyword, n)
+
+        for table, columns, delta in (
+            ("skill_counts", ("kind", "term"), counts),
+            ("skill_pairs", ("a", "b"), pairs),
+            ("skill_buckets", ("bucket", "term"), buckets)
+        ):
+            key = ", ".join(columns)
+            conn.executemany(
+                f"INSERT INTO {table} ({key}, count) VALUES (?, ?, ?) "
+                f"ON CONFLICT({key}) DO UPDATE SET count = count + excluded.count",
+                [(*k, n) for k, n in delta.items() if n]
+            )
+            # Drop rows whose count reached zero (the pool totals stay)
+            conn.executemany(
+                f"DELETE FROM {table} WHERE {columns[0]} = ? AND {columns[1]} = ? AND count <= 0",
+                [k for k, n in delta.items() if n < 0 and k[0] != POOL]
+            )
+
+    # ---- queries ----
+
+    @staticmethod
+    def _count(conn: sqlite3.Connection, kind: str, term: str) -> int:
+        row = conn.execute("SELECT count FROM skill_counts WHERE kind = ? AND term = ?", (kind, term)).fetchone()
+        return row[0] if row else 0
+
+    @classmethod
+    def summary(cls, conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Pool size, settings and the size of the aggregates."""
+        info = {
+            **cls.config(),
+            "resumes": cls._count(conn, POOL, "resumes"),
+            "skills": conn.execute("SELECT COUNT(*) FROM skill_counts WHERE kind = ?", (SKILL,)).fetchone()[0],
+            "skill_pairs": conn.execute("SELECT COUNT(*) FROM skill_pairs").fetchone()[0] // 2,
+            "buckets": conn.execute("SELECT COUNT(*) FROM skill_buckets WHERE term = ''").fetchone()[0]
+        }
+        if ANALYTICS_MODE == "exact":
+            info["keywords"] = conn.execute("SELECT COUNT(*) FROM skill_counts WHERE kind = ?", (KEYWORD,)).fetchone()[0]
+        return info
+
+    @classmethod
+    def top_skills(cls, conn: sqlite3.Connection, limit: int = 20, bucket: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Most common skills in the pool, or among resumes stored in one bucket.
+
+        Returns:
+            {"bucket", "resumes", "skills": [{"skill", "count", "share"}]};
+            share is the fraction of those resumes listing the skill.
+        """
+        if bucket is None:
+            total = cls._count(conn, POOL, "resumes")
+            rows = conn.execute(
+                "SELECT term, count FROM skill_counts WHERE kind = ? ORDER BY count DESC, term LIMIT ?",
+                (SKILL, limit)
+            ).fetchall()
+        else:
+            row = conn.execute("SELECT count FROM skill_buckets WHERE bucket = ? AND term = ''", (bucket,)).fetchone()
+            total = row[0] if row else 0
+            rows = conn.execute(
+                "SELECT term, count FROM skill_buckets WHERE bucket = ? AND term != '' "
+                "ORDER BY count DESC, term LIMIT ?",
+                (bucket, limit)
+            ).fetchall()
+        return {
+            "bucket": bucket,
+            "resumes": total,
+            "skills": [
+                {"skill": term, "count": count, "share": round(count / total, 4) if total else 0.0}
+                for term, count in rows
+            ]
+        }
+
+    @classmethod
+    def trends(cls, conn: sqlite3.Connection, periods: int = 4, limit: int = 10) -> List[Dict[str, Any]]:
+        """top_skills() for the current bucket and the ones before it, newest first."""
+        return [cls.top_skills(conn, limit, bucket) for bucket in recent_buckets(periods)]
+
+    @classmethod
+    def related(cls, conn: sqlite3.Connection, skill: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Skills that appear together with skill.
+
+        Returns:
+            {"skill", "count", "related": [{"skill", "count", "confidence",
+            "lift"}]}: confidence = P(other | skill); lift > 1 means the
+            pair is more common than chance.
+        """
+        skill = skill_label(skill)
+        total = cls._count(conn, POOL, "resumes")
+        count = cls._count(conn, SKILL, skill)
+        rows = conn.execute(
+            "SELECT p.b, p.count, c.count FROM skill_pairs p "
+            "JOIN skill_counts c ON c.kind = ? AND c.term = p.b "
+            "WHERE p.a = ? ORDER BY p.count DESC, p.b LIMIT ?",
+            (SKILL, skill, limit)
+        ).fetchall()
+        return {
+            "skill": skill,
+            "count": count,
+            "related": [
+                {
+                    "skill": other,
+                    "count": both,
+                    "confidence": round(both / count, 4) if count else 0.0,
+                    "lift": round(both * total / (count * other_count), 3) if count and other_count else 0.0
+                }
+                for other, both, other_count in rows
+            ]
+        }
+
+    @classmethod
+    def rarity(cls, conn: sqlite3.Connection, terms: Iterable[str]) -> Dict[str, Any]:
+        """
+        How many pooled resumes mention each keyword (e.g. a match's
+        missing_skills), rarest first. Terms below ANALYTICS_RARE_SHARE of
+        the pool are flagged rare.
+
+        In sketch mode counts are upper-bound estimates; error_bound is the
+        most any of them can overcount (with high probability).
+        """
+        total = cls._count(conn, POOL, "resumes")
+        terms = list(dict.fromkeys(t.strip().lower() for t in terms if t.strip()))
+        info: Dict[str, Any] = {"resumes": total, "approximate": ANALYTICS_MODE == "sketch"}
+        if ANALYTICS_MODE == "sketch":
+            counts = _Sketches(conn).estimates(terms)
+            info["error_bound"] = CountMinSketch.error_bound(ANALYTICS_SKETCH_WIDTH, cls._count(conn, POOL, "keywords"))
+        else:
+            counts = {term: cls._count(conn, KEYWORD, term) for term in terms}
+        info["terms"] = [
+            {
+                "term": term,
+                "count": count,
+                "share": round(count / total, 4) if total else 0.0,
+                "rare": count < ANALYTICS_RARE_SHARE * total
+            }
+            for term, count in sorted(counts.items(), key=lambda item: (item[1], item[0]))
+        ]
+        return info
+
+    @classmethod
+    def top_keywords(cls, conn: sqlite3.Connection, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most common matcher keywords (sketch mode: count and guaranteed minimum)."""
+        if ANALYTICS_MODE == "sketch":
+            return [
+                {"term": term, "count": count, "min_count": count - error}
+                for term, count, error in _Sketches(conn).top.top(limit)
+            ]
+        return [
+            {"term": term, "count": count}
+            for term, count in conn.execute(
+                "SELECT term, count FROM skill_counts WHERE kind = ? ORDER BY count DESC, term LIMIT ?",
+                (KEYWORD, limit)
+            )
+        ]
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    # The store owns the database and brings the aggregates up to date on
+    # connect (imported here: the store imports this module)
+    from .store_service import StoreService
+    return StoreService.connect(db_path)
+
+
+def _query(db_path: Path, method: Callable, *args):
+    conn = _connect(db_path)
+    try:
+        return method(conn, *args)
+    finally:
+        conn.close()
+
+
+# Convenience functions
+def analytics_summary(db_path: Path = RESUME_STORE_DB) -> Dict[str, Any]:
+    return _query(db_path, SkillAnalytics.summary)
+
+
+def top_skills(limit: int = 20, bucket: Optional[str] = None, db_path: Path = RESUME_STORE_DB) -> Dict[str, Any]:
+    """Top skills overall, or in a bucket ("current" = the bucket of now)."""
+    if bucket == "current":
+        bucket = bucket_key(time.time())
+    return _query(db_path, SkillAnalytics.top_skills, limit, bucket)
+
+
+def skill_trends(periods: int = 4, limit: int = 10, db_path: Path = RESUME_STORE_DB) -> List[Dict[str, Any]]:
+    return _query(db_path, SkillAnalytics.trends, periods, limit)
+
+
+def related_skills(skill: str, limit: int = 10, db_path: Path = RESUME_STORE_DB) -> Dict[str, Any]:
+    return _query(db_path, SkillAnalytics.related, skill, limit)
+
+
+def term_rarity(terms: Iterable[str], db_path: Path = RESUME_STORE_DB) -> Dict[str, Any]:
+    return _query(db_path, SkillAnalytics.rarity, terms)
+
+
+def top_keywords(limit: int = 20, db_path: Path = RESUME_STORE_DB) -> List[Dict[str, Any]]:
+    return _query(db_path, SkillAnalytics.top_keywords, limit)
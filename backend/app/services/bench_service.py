@@ -0,0 +1,255 @@
+"""
+ResumeSense 2.0 - Benchmark Service
+Per-stage and end-to-end throughput/latency measurements over a
+synthetic corpus, with baseline comparison to flag regressions.
+"""
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .corpus_service import Corpus
+from .parser_service import parse_resume
+from .nlp_service import analyze_resume
+from .matcher_service import match_resume_to_jd
+
+STAGES = ("parse", "analyze", "match", "end_to_end", "http", "startup_cli", "startup_api")
+
+# Cold-start stages launch a fresh interpreter per operation
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+STARTUP_COMMANDS = {
+    "startup_cli": [sys.executable, "cli.py", "version"],
+    "startup_api": [sys.executable, "-c", "import main"]
+}
+STARTUP_RUNS = 5
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Linear-interpolated percentile of a sequence (pct in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class BenchService:
+    """Runs benchmarks and compares results against a baseline."""
+
+    @classmethod
+    def run(
+        cls,
+        corpus: Corpus,
+        stages: Sequence[str] = ("parse", "analyze", "match", "end_to_end"),
+        concurrency: Sequence[int] = (1,),
+        iterations: int = 1,
+        url: Optional[str] = None,
+        progress: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Benchmark the requested stages at each concurrency level.
+
+        Args:
+            corpus: Corpus with resume files written to disk.
+            stages: Any of STAGES. "http" posts to {url}/api/match/file;
+                "startup_cli" and "startup_api" time STARTUP_RUNS cold starts
+                of `cli.py version` and of importing the API app.
+            concurrency: Worker thread counts to measure.
+            iterations: Passes over the corpus per measurement.
+            url: Base URL of a running API server for the "http" stage.
+            progress: Optional callback receiving a line per measurement.
+
+        Returns:
+            Report dict with environment info and per-stage results.
+        """
+        unknown = set(stages) - set(STAGES)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}. Supported: {STAGES}")
+        if "http" in stages and not url:
+            raise ValueError("The http stage needs --url of a running server")
+
+        texts = {r.id: parse_resume(r.path) for r in corpus.resumes}
+        jds = [j.text for j in corpus.jds] or [""]
+
+        report: Dict[str, Any] = {
+            "seed": corpus.seed,
+            "resumes": len(corpus.resumes),
+            "jds": len(corpus.jds),
+            "iterations": iterations,
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "machine": platform.machine()
+            },
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": {}
+        }
+
+        for stage in stages:
+            work = cls._work_items(stage, corpus, texts, jds, url)
+            cls._warm_up(work)
+            for workers in concurrency:
+                key = f"{stage}@c{workers}"
+                result = cls._measure(work * iterations, workers)
+                report["results"][key] = result
+                if progress:
+                    progress(
+                        f"{key}: {result['throughput_per_s']:.1f} ops/s, "
+                        f"p50 {result['p50_ms']:.2f} ms, p95 {result['p95_ms']:.2f} ms, "
+                        f"p99 {result['p99_ms']:.2f} ms"
+                    )
+
+        return report
+
+    @classmethod
+    def _work_items(cls, stage, corpus, texts, jds, url) -> List[Callable[[], Any]]:
+        """Build one zero-argument callable per operation."""
+        if stage in STARTUP_COMMANDS:
+            return [lambda c=STARTUP_COMMANDS[stage]: cls._cold_start(c)] * STARTUP_RUNS
+        items = []
+        for i, resume in enumerate(corpus.resumes):
+            jd = jds[i % len(jds)]
+            text = texts[resume.id]
+            if stage == "parse":
+                items.append(lambda p=resume.path: parse_resume(p))
+            elif stage == "analyze":
+                items.append(lambda t=text: analyze_resume(t))
+            elif stage == "match":
+                items.append(lambda t=text, j=jd: match_resume_to_jd(t, j))
+            elif stage == "end_to_end":
+                items.append(lambda p=resume.path, j=jd: cls._end_to_end(p, j))
+            elif stage == "http":
+                items.append(lambda p=resume.path, j=jd: cls._post_match(url, p, j))
+        return items
+
+    @staticmethod
+    def _warm_up(work: List[Callable[[], Any]], count: int = 3) -> None:
+        """Run a few operations unmeasured so one-time setup does not skew p95."""
+        for fn in work[:count]:
+            try:
+                fn()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _cold_start(command: List[str]) -> None:
+        subprocess.run(command, cwd=BACKEND_DIR, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    @staticmethod
+    def _end_to_end(path: Path, jd: str) -> Dict[str, Any]:
+        text = parse_resume(path)
+        return {"resume_data": analyze_resume(text), "match_result": match_resume_to_jd(text, jd)}
+
+    @staticmethod
+    def _measure(work: List[Callable[[], Any]], workers: int) -> Dict[str, Any]:
+        latencies: List[float] = []
+        errors = 0
+
+        def timed_call(fn):
+            started = time.perf_counter()
+            try:
+                fn()
+                ok = True
+            except Exception:
+                ok = False
+            return time.perf_counter() - started, ok
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for elapsed, ok in pool.map(timed_call, work):
+                latencies.append(elapsed * 1000)
+                errors += not ok
+        wall = time.perf_counter() - started
+
+        return {
+            "operations": len(work),
+            "errors": errors,
+            "concurrency": workers,
+            "wall_s": round(wall, 4),
+            "throughput_per_s": round(len(work) / wall, 2) if wall else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3)
+        }
+
+    @staticmethod
+    def _post_match(url: str, path: Path, jd: str) -> None:
+        """POST a resume to /api/match/file using only the standard library."""
+        boundary = uuid.uuid4().hex
+        body = b"".join([
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"jd_text\"\r\n\r\n".encode(),
+            jd.encode("utf-8"),
+            f"\r\n--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; "
+            f"filename=\"{path.name}\"\r\nContent-Type: application/octet-stream\r\n\r\n".encode(),
+            path.read_bytes(),
+            f"\r\n--{boundary}--\r\n".encode()
+        ])
+        request = urllib.request.Request(
+            url.rstrip("/") + "/api/match/file",
+            data=body,
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        )
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+
+    @classmethod
+    def compare(
+        cls,
+        report: Dict[str, Any],
+        baseline: Dict[str, Any],
+        threshold_pct: float = 10.0
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare a report with a baseline report.
+
+        Returns:
+            One entry per measurement present in both, with percentage
+            changes and a "regression" flag when throughput drops or p95
+            latency rises by more than threshold_pct.
+        """
+        rows = []
+        for key, current in report["results"].items():
+            previous = baseline.get("results", {}).get(key)
+            if not previous:
+                continue
+            throughput = _pct_change(previous["throughput_per_s"], current["throughput_per_s"])
+            p95 = _pct_change(previous["p95_ms"], current["p95_ms"])
+            rows.append({
+                "benchmark": key,
+                "throughput_change_pct": throughput,
+                "p95_change_pct": p95,
+                "regression": throughput < -threshold_pct or p95 > threshold_pct
+            })
+        return rows
+
+
+def _pct_change(before: float, after: float) -> float:
+    if not before:
+        return 0.0
+    return round(100 * (after - before) / before, 1)
+
+
+def save_report(report: Dict[str, Any], path: Path) -> None:
+    """Write a benchmark report as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2))
+
+
+def load_report(path: Path) -> Dict[str, Any]:
+    """Read a benchmark report written by save_report."""
+    return json.loads(Path(path).read_text())
+
+
+# Convenience function
+def run_benchmarks(corpus: Corpus, **kwargs) -> Dict[str, Any]:
+    """Benchmark the services over a corpus."""
+    return BenchService.run(corpus, **kwargs)
@@ -0,0 +1,304 @@
+"""
+ResumeSense 2.0 - Result Cache
+Memoizes analyze_resume and match_resume_to_jd, which are pure functions
+of their text inputs, for integrations that send the same text repeatedly.
+
+Keys are a hash of the input text(s) plus a fingerprint of the service's
+rule set (version, skill list, stopwords, patterns and module code), so
+editing any of them invalidates old entries automatically. The same
+fingerprints go into result ETags. Resume text is keyed as-is: extraction
+is sensitive to line endings and whitespace, so only matching (which
+lower-cases and splits on words) is keyed on a normalized form.
+
+Two tiers:
+    memory - per-process LRU bounded by the size of the stored results
+    disk   - optional SQLite database shared by every worker on the host
+             (RESULT_CACHE_DB), trimmed least-recently-used first
+"""
+import hashlib
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import (
+    RESULT_CACHE_DB,
+    RESULT_CACHE_DISK_BYTES,
+    RESULT_CACHE_ENABLED,
+    RESULT_CACHE_MEMORY_BYTES
+)
+from app.core.metrics import record_cache
+
+from .matcher_service import MatcherService, match_resume_to_jd
+from .nlp_service import NLPService, analyze_resume
+
+# Fastest available JSON codec (results are stored serialized, so callers
+# can never mutate a cached value)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    rules TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_used ON results(used_at);
+"""
+
+# Bookkeeping bytes per memory entry on top of key and value
+ENTRY_OVERHEAD = 120
+
+# A disk hit refreshes used_at at most this often (keeps reads read-only)
+TOUCH_INTERVAL_S = 60.0
+
+
+def _dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _digest(*parts: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _rules(cls: type, *data: Any) -> str:
+    """Fingerprint of a service's rule data and source code."""
+    try:
+        source = Path(inspect.getfile(cls)).read_text(encoding="utf-8")
+    except (OSError, TypeError):
+        source = ""
+    return _digest(repr(data), source)[:16]
+
+
+def analyzer_rules() -> str:
+    """Rule-set fingerprint for NLPService.extract()."""
+    return _rules(
+        NLPService,
+        NLPService.VERSION,
+        sorted(NLPService.SKILL_LABELS.items()),
+        NLPService.EDUCATION_HEADERS,
+        NLPService.EXPERIENCE_HEADERS,
+        NLPService.SKILLS_HEADERS,
+        [
+            pattern.pattern for pattern in (
+                NLPService.EMAIL_PATTERN, NLPService.PHONE_PATTERN, NLPService.URL_PATTERN,
+                NLPService.LINKEDIN_PATTERN, NLPService.GITHUB_PATTERN
+            )
+        ]
+    )
+
+
+def matcher_rules() -> str:
+    """Rule-set fingerprint for MatcherService.match()."""
+    return _rules(MatcherService, MatcherService.KEYWORDS_VERSION, sorted(MatcherService.STOPWORDS))
+
+
+def normalize_keywords(text: str) -> str:
+    """Lower-case and collapse whitespace: keyword extraction sees no difference."""
+    return " ".join(text.lower().split())
+
+
+class ResultCache:
+    """Size-bounded LRU in memory, backed by an optional shared SQLite tier."""
+
+    def __init__(
+        self,
+        max_bytes: int = RESULT_CACHE_MEMORY_BYTES,
+        db_path: Optional[Path] = RESULT_CACHE_DB,
+        disk_bytes: int = RESULT_CACHE_DISK_BYTES
+    ):
+        self.max_bytes = max_bytes
+        # One result may take at most an eighth of the memory tier
+        self.max_entry_bytes = max_bytes // 8
+        self.db_path = Path(db_path) if db_path else None
+        self.disk_bytes = disk_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_lock = threading.Lock()
+        self._written = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(self, operation: str, key: str, rules: str, compute: Callable[[], Any]) -> Any:
+        """Return the cached result for key, computing and storing it on a miss."""
+        data = self._get_memory(key)
+        record_cache(f"{operation}_memory", data is not None)
+        if data is None and self.db_path is not None:
+            data = self._get_disk(key)
+            record_cache(f"{operation}_disk", data is not None)
+            if data is not None:
+                self._put_memory(key, data)
+        if data is not None:
+            return _loads(data)
+
+        value = compute()
+        data = _dumps(value)
+        self._put_memory(key, data)
+        if self.db_path is not None:
+            self._put_disk(key, operation, rules, data)
+        return value
+
+    def clear(self) -> None:
+        """Empty the memory tier and the disk tier."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+        if self.db_path is not None:
+            with self._disk_lock:
+                self._connect().execute("DELETE FROM results")
+
+    def stats(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes
+        }
+        if self.db_path is not None:
+            with self._disk_lock:
+                row = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+            info["disk"] = {"path": str(self.db_path), "entries": row[0], "bytes": row[1], "max_bytes": self.disk_bytes}
+        return info
+
+    # ---- memory tier ----
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            return data
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        size = len(key) + len(data) + ENTRY_OVERHEAD
+        if size > self.max_entry_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(key) + len(previous) + ENTRY_OVERHEAD
+            self._entries[key] = data
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                old_key, old_data = self._entries.popitem(last=False)
+                self.bytes -= len(old_key) + len(old_data) + ENTRY_OVERHEAD
+
+    # ---- disk tier ----
+
+    def _connect(self) -> sqlite3.Connection:
+        """Shared connection, opened on first use (callers hold _disk_lock)."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            # Entries from other rule sets can never hit again
+            conn.execute(
+                "DELETE FROM results WHERE (operation = 'analyze' AND rules != ?) "
+                "OR (operation = 'match' AND rules != ?)",
+                (analyzer_rules(), matcher_rules())
+            )
+            self._conn = conn
+        return self._conn
+
+    def _get_disk(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        try:
+            with self._disk_lock:
+                conn = self._connect()
+                row = conn.execute("SELECT value, used_at FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                if row[1] < now - TOUCH_INTERVAL_S:
+                    conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (now, key))
+                return bytes(row[0])
+        except sqlite3.Error:
+            # The shared tier is best-effort; a locked or broken file is a miss
+            return None
+
+    def _put_disk(self, key: str, operation: str, rules: str, data: bytes) -> None:
+        try:
+            with self._disk_lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, operation, rules, value, size, used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, operation, rules, data, len(data), time.time())
+                )
+                self._written += len(data)
+                if self._written > self.disk_bytes // 16:
+                    self._written = 0
+                    self._trim(conn)
+        except sqlite3.Error:
+            pass
+
+    def _trim(self, conn: sqlite3.Connection) -> None:
+        """Drop least-recently-used rows until the tier fits its budget."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        excess = total - self.disk_bytes
+        if excess <= 0:
+            return
+        stale = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY used_at"):
+            stale.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM results WHERE key = ?", stale)
+
+
+# Shared by every caller in this process
+result_cache = ResultCache()
+
+_rule_sets: Dict[str, str] = {}
+
+
+def rule_set(operation: str) -> str:
+    """Rule-set fingerprint for "analyze" or "match", computed once per process."""
+    rules = _rule_sets.get(operation)
+    if rules is None:
+        rules = _rule_sets[operation] = analyzer_rules() if operation == "analyze" else matcher_rules()
+    return rules
+
+
+# Convenience functions
+def cached_analyze_resume(text: str) -> Dict[str, Any]:
+    """analyze_resume() through the result cache."""
+    if not RESULT_CACHE_ENABLED:
+        return analyze_resume(text)
+    rules = rule_set("analyze")
+    key = "analyze:" + _digest(rules, text)
+    return result_cache.get_or_compute("analyze", key, rules, lambda: analyze_resume(text))
+
+
+def cached_match_resume_to_jd(resume_text: str, jd_text: str) -> Dict[str, Any]:
+    """match_resume_to_jd() through the result cache."""
+    if not RESULT_CACHE_ENABLED:
+        return match_resume_to_jd(resume_text, jd_text)
+    resume_text, jd_text = normalize_keywords(resume_text), normalize_keywords(jd_text)
+    rules = rule_set("match")
+    key = "match:" + _digest(rules, resume_text, jd_text)
+    return result_cache.get_or_compute("match", key, rules, lambda: match_resume_to_jd(resume_text, jd_text))
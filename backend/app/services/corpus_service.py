@@ -0,0 +1,226 @@
+"""
+ResumeSense 2.0 - Corpus Service
+Reproducible synthetic resumes and job descriptions for benchmarking
+and regression checks. All people and companies are fictional.
+"""
+import random
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from app.core.backends import backend
+
+from .nlp_service import NLPService
+
+
+FIRST_NAMES = [
+    "Avery", "Jordan", "Riley", "Morgan", "Casey", "Taylor", "Quinn", "Rowan",
+    "Harper", "Emerson", "Sasha", "Devon", "Kai", "Reese", "Skyler", "Parker"
+]
+LAST_NAMES = [
+    "Hale", "Moreno", "Okafor", "Lindqvist", "Tanaka", "Brennan", "Ivanova",
+    "Castillo", "Nakamura", "Fischer", "Adeyemi", "Kowalski", "Duarte", "Singh"
+]
+COMPANIES = [
+    "Northwind Labs", "Bluefin Analytics", "Cobalt Systems", "Lumen Health",
+    "Juniper Robotics", "Solstice Media", "Quarry Financial", "Helix Logistics"
+]
+TITLES = [
+    "Software Engineer", "Backend Developer", "Data Scientist", "DevOps Engineer",
+    "Frontend Developer", "Machine Learning Engineer", "Platform Engineer"
+]
+UNIVERSITIES = [
+    "State University", "Institute of Technology", "Polytechnic University",
+    "College of Engineering"
+]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "MSc Mathematics"]
+VERBS = [
+    "Built", "Designed", "Led", "Optimized", "Migrated", "Automated", "Maintained",
+    "Scaled", "Refactored", "Delivered"
+]
+OBJECTS = [
+    "a reporting pipeline", "the billing service", "an internal API gateway",
+    "customer-facing dashboards", "the search backend", "a recommendation engine",
+    "deployment tooling", "the data warehouse", "mobile sync services"
+]
+OUTCOMES = [
+    "reducing latency by {n}%", "cutting costs by {n}%", "serving {n}k daily users",
+    "improving test coverage to {n}%", "shortening release cycles by {n}%"
+]
+
+# Resume lengths as number of experience entries x bullets per entry
+LENGTHS = {"short": (1, 2), "medium": (3, 4), "long": (6, 8)}
+
+FORMATS = ("pdf", "docx", "txt")
+
+
+@dataclass
+class CorpusItem:
+    """A generated resume or job description."""
+    id: str
+    kind: str  # "resume" or "jd"
+    text: str
+    path: Optional[Path] = None
+    format: str = "txt"
+    length: str = ""
+    skills: List[str] = field(default_factory=list)
+
+
+@dataclass
+class Corpus:
+    """Generated resumes and job descriptions."""
+    seed: int
+    resumes: List[CorpusItem] = field(default_factory=list)
+    jds: List[CorpusItem] = field(default_factory=list)
+
+    def manifest(self) -> Dict:
+        return {
+            "seed": self.seed,
+            "resumes": [
+                {"id": r.id, "format": r.format, "length": r.length, "path": str(r.path) if r.path else None}
+                for r in self.resumes
+            ],
+            "jds": [j.id for j in self.jds]
+        }
+
+
+class CorpusService:
+    """Generates synthetic resume/JD corpora from a seed."""
+
+    @classmethod
+    def generate(
+        cls,
+        seed: int = 42,
+        resumes: int = 30,
+        jds: int = 5,
+        formats: Sequence[str] = FORMATS,
+        out_dir: Optional[Path] = None
+    ) -> Corpus:
+        """
+        Generate a corpus. The same seed always yields the same texts.
+
+        Args:
+            seed: Random seed.
+            resumes: Number of resumes.
+            jds: Number of job descriptions.
+            formats: Resume file formats to cycle through (pdf, docx, txt).
+            out_dir: If given, resumes are written there as files.
+
+        Returns:
+            Corpus with texts (and file paths when out_dir is given).
+        """
+        unknown = set(formats) - set(FORMATS)
+        if unknown:
+            raise ValueError(f"Unsupported formats: {sorted(unknown)}. Supported: {FORMATS}")
+
+        rng = random.Random(seed)
+        skills = sorted(NLPService.TECH_SKILLS)
+        corpus = Corpus(seed=seed)
+
+        if out_dir is not None:
+            out_dir = Path(out_dir)
+            out_dir.mkdir(parents=True, exist_ok=True)
+
+        lengths = list(LENGTHS)
+        for i in range(resumes):
+            length = lengths[i % len(lengths)]
+            fmt = formats[i % len(formats)]
+            item = cls._resume(rng, f"resume-{i:05d}", length, skills)
+            item.format = fmt
+            if out_dir is not None:
+                item.path = cls.write(item, out_dir / f"{item.id}.{fmt}", fmt)
+            corpus.resumes.append(item)
+
+        for i in range(jds):
+            corpus.jds.append(cls._jd(rng, f"jd-{i:03d}", skills))
+
+        return corpus
+
+    @classmethod
+    def _resume(cls, rng: random.Random, item_id: str, length: str, skills: List[str]) -> CorpusItem:
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = f"{first}{last}".lower()
+        picked = rng.sample(skills, rng.randint(4, 14))
+        jobs, bullets = LENGTHS[length]
+
+        lines = [
+            f"{first} {last}",
+            f"{handle}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            f"linkedin.com/in/{handle} | github.com/{handle}",
+            "",
+            "Summary",
+            f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience.",
+            "",
+            "Experience"
+        ]
+        for _ in range(jobs):
+            lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2010, 2024)})")
+            for _ in range(bullets):
+                outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+                used = ", ".join(rng.sample(picked, min(2, len(picked))))
+                lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using {used}, {outcome}.")
+        lines += [
+            "",
+            "Education",
+            f"{rng.choice(DEGREES)}, {rng.choice(UNIVERSITIES)} ({rng.randint(2005, 2022)})",
+            "",
+            "Skills",
+            ", ".join(picked)
+        ]
+        return CorpusItem(id=item_id, kind="resume", text="\n".join(lines), length=length, skills=picked)
+
+    @classmethod
+    def _jd(cls, rng: random.Random, item_id: str, skills: List[str]) -> CorpusItem:
+        title = rng.choice(TITLES)
+        required = rng.sample(skills, rng.randint(5, 10))
+        nice = rng.sample([s for s in skills if s not in required], 3)
+        text = "\n".join([
+            f"{title} at {rng.choice(COMPANIES)}",
+            "",
+            f"We are looking for a {title.lower()} to join our team and own {rng.choice(OBJECTS)}.",
+            "",
+            "Requirements:",
+            *[f"- Experience with {s}" for s in required],
+            "",
+            "Nice to have: " + ", ".join(nice),
+            f"{rng.randint(2, 8)}+ years of professional experience."
+        ])
+        return CorpusItem(id=item_id, kind="jd", text=text, skills=required)
+
+    @classmethod
+    def write(cls, item: CorpusItem, path: Path, fmt: str) -> Path:
+        """Write an item as a PDF, DOCX or TXT file."""
+        if fmt == "txt":
+            path.write_text(item.text, encoding="utf-8")
+        elif fmt == "docx":
+            doc = backend("docx")()
+            for line in item.text.split("\n"):
+                doc.add_paragraph(line)
+            doc.save(str(path))
+        elif fmt == "pdf":
+            cls._write_pdf(item.text, path)
+        else:
+            raise ValueError(f"Unsupported format: {fmt}")
+        return path
+
+    @staticmethod
+    def _write_pdf(text: str, path: Path, lines_per_page: int = 50) -> None:
+        doc = backend("fitz").open()
+        lines = text.split("\n")
+        for start in range(0, len(lines), lines_per_page):
+            page = doc.new_page()
+            page.insert_text((56, 64), "\n".join(lines[start:start + lines_per_page]), fontsize=10)
+        doc.save(str(path))
+        doc.close()
+
+
+# Convenience function
+def generate_corpus(
+    seed: int = 42,
+    resumes: int = 30,
+    jds: int = 5,
+    formats: Sequence[str] = FORMATS,
+    out_dir: Optional[Path] = None
+) -> Corpus:
+    """Generate a reproducible synthetic resume/JD corpus."""
+    return CorpusService.generate(seed, resumes, jds, formats, out_dir)
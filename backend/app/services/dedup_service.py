@@ -0,0 +1,172 @@
+"""
+ResumeSense 2.0 - Dedup Service
+Near-duplicate detection for resume text: MinHash signatures over word
+shingles, indexed with LSH banding so candidates are found without
+comparing against every stored resume.
+"""
+import hashlib
+import random
+import re
+import zlib
+from array import array
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.backends import optional_backend
+from app.core.config import DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+
+
+# Smallest prime above 2**32: a * h + b stays below 2**64 for 32-bit a, b, h
+_PRIME = 4294967311
+_MAX_HASH = 0xFFFFFFFF
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+Signature = array  # array("I") of num_perm 32-bit minima
+
+
+class MinHasher:
+    """Computes MinHash signatures of text over word shingles."""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._a = [rng.randint(1, _MAX_HASH) for _ in range(num_perm)]
+        self._b = [rng.randint(0, _MAX_HASH) for _ in range(num_perm)]
+        self._np_params = None
+
+    def shingles(self, text: str) -> Set[int]:
+        """32-bit hashes of the normalized word k-grams of text."""
+        words = _WORD.findall(text.lower())
+        k = min(self.shingle_size, len(words))
+        if k == 0:
+            return set()
+        return {
+            zlib.crc32(" ".join(words[i:i + k]).encode("utf-8"))
+            for i in range(len(words) - k + 1)
+        }
+
+    def signature(self, text: str) -> Optional[Signature]:
+        """MinHash signature of text, or None if it has no words."""
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+        # Vectorised when numpy is available; same values either way
+        np = optional_backend("numpy")
+        if np is not None:
+            if self._np_params is None:
+                self._np_params = (np.array(self._a, dtype=np.uint64), np.array(self._b, dtype=np.uint64))
+            a, b = self._np_params
+            h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            minima = ((np.outer(h, a) + b) % _PRIME).min(axis=0)
+            return array("I", (minima & _MAX_HASH).astype(np.uint32).tobytes())
+        return array("I", (
+            min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH
+            for a, b in zip(self._a, self._b)
+        ))
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1/bands) ** (1/rows) is closest to, and not above, threshold. Leaning
+    low favours recall; candidates are verified against the signature.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def band_keys(signature: Signature, bands: int, rows: int) -> List[int]:
+    """One 63-bit bucket key per band (fits an SQLite INTEGER)."""
+    raw = signature.tobytes()
+    width = rows * signature.itemsize
+    return [
+        int.from_bytes(hashlib.blake2b(raw[i * width:(i + 1) * width], digest_size=8).digest(), "big") >> 1
+        for i in range(bands)
+    ]
+
+
+class LSHIndex:
+    """In-memory LSH index mapping keys to signatures."""
+
+    def __init__(self, num_perm: int = DEDUP_NUM_PERM, threshold: float = DEDUP_THRESHOLD):
+        self.threshold = threshold
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self._buckets: List[Dict[int, List[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, Signature] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, key: str, signature: Signature) -> None:
+        self._signatures[key] = signature
+        for band, bucket_key in enumerate(band_keys(signature, self.bands, self.rows)):
+            self._buckets[band].setdefault(bucket_key, []).append(key)
+
+    def query(self, signature: Signature) -> List[Tuple[str, float]]:
+        """Indexed keys at or above the threshold, most similar first."""
+        candidates: Set[str] = set()
+        for band, bucket_key in enumerate(band_keys(signature, self.bands, self.rows)):
+            candidates.update(self._buckets[band].get(bucket_key, ()))
+        scored = [(key, similarity(signature, self._signatures[key])) for key in candidates]
+        return sorted((item for item in scored if item[1] >= self.threshold), key=lambda item: -item[1])
+
+    def find(self, signature: Optional[Signature]) -> Optional[str]:
+        """Key of the closest indexed near-duplicate, if any."""
+        if signature is None:
+            return None
+        matches = self.query(signature)
+        return matches[0][0] if matches else None
+
+
+class DedupService:
+    """Groups near-duplicate resumes."""
+
+    hasher = MinHasher()
+
+    @classmethod
+    def signature(cls, text: str) -> Optional[Signature]:
+        return cls.hasher.signature(text)
+
+    @classmethod
+    def collapse(cls, items: Iterable[Tuple[str, str]], threshold: float = DEDUP_THRESHOLD) -> Dict[str, Optional[str]]:
+        """
+        Assign each (key, text) to the first earlier item it nearly
+        duplicates.
+
+        Returns:
+            key -> canonical key, or None for items that are kept.
+        """
+        index = LSHIndex(cls.hasher.num_perm, threshold)
+        canonical: Dict[str, Optional[str]] = {}
+        for key, text in items:
+            signature = cls.signature(text)
+            canonical[key] = index.find(signature)
+            if canonical[key] is None and signature is not None:
+                index.add(key, signature)
+        return canonical
+
+
+def signature_from_bytes(raw: Optional[bytes]) -> Optional[Signature]:
+    """Rebuild a signature stored with Signature.tobytes()."""
+    if not raw:
+        return None
+    signature = array("I")
+    signature.frombytes(raw)
+    return signature
+
+
+# Convenience function
+def find_near_duplicates(texts: Dict[str, str], threshold: float = DEDUP_THRESHOLD) -> Dict[str, str]:
+    """Map each near-duplicate key to the key it duplicates."""
+    return {key: dup for key, dup in DedupService.collapse(texts.items(), threshold).items() if dup}
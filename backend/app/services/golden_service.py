@@ -0,0 +1,262 @@
+"""
+ResumeSense 2.0 - Golden Service
+Differential checks for engine changes: snapshot the current outputs of
+parsing, analyze_resume and match_resume_to_jd over a generated corpus
+(all people and companies are fictional), then re-run a new engine on the
+same corpus and diff it field by field, with per-stage speedups alongside
+the accuracy deltas.
+"""
+import difflib
+import hashlib
+import importlib
+import json
+import platform
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import APP_VERSION
+
+from .corpus_service import FORMATS, Corpus, CorpusService
+from .matcher_service import MatcherService, match_resume_to_jd
+from .nlp_service import NLPService, analyze_resume
+from .parser_service import ParserService, parse_resume
+
+# Diff examples kept per field
+MAX_EXAMPLES = 5
+
+# Fields compared as strings; all other list fields are compared as sets
+TEXT_FIELDS = ("name", "summary")
+SCORE_FIELDS = ("overall_score", "skill_score")
+
+
+@dataclass
+class Engine:
+    """The functions under test; defaults are the current implementations."""
+    parse: Callable[[Path], str] = parse_resume
+    analyze: Callable[[str], Dict[str, Any]] = analyze_resume
+    match: Callable[[str, str], Dict[str, Any]] = match_resume_to_jd
+
+
+def load_engine(spec: Optional[str]) -> Engine:
+    """Resolve "package.module:attr" to an Engine (None -> current engine)."""
+    if not spec:
+        return Engine()
+    module, _, attr = spec.partition(":")
+    engine = getattr(importlib.import_module(module), attr or "ENGINE")
+    if not isinstance(engine, Engine):
+        raise TypeError(f"{spec} is not an Engine")
+    return engine
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+class GoldenService:
+    """Snapshots engine outputs and diffs new engines against them."""
+
+    @classmethod
+    def snapshot(cls, corpus: Corpus, engine: Optional[Engine] = None, repeat: int = 3) -> Dict[str, Any]:
+        """
+        Run the engine over the corpus and record every output.
+
+        Args:
+            corpus: Corpus with resume files written to disk.
+            repeat: Passes per stage; the fastest is kept as its timing.
+
+        Returns:
+            Golden dict with corpus parameters, versions, outputs and timings.
+        """
+        outputs, timings = cls._run(corpus, engine or Engine(), repeat)
+        return {
+            "corpus": {
+                "seed": corpus.seed,
+                "resumes": len(corpus.resumes),
+                "jds": len(corpus.jds),
+                "formats": list(dict.fromkeys(r.format for r in corpus.resumes)) or list(FORMATS)
+            },
+            "versions": {
+                "app": APP_VERSION,
+                "parser": ParserService.VERSION,
+                "analyzer": NLPService.VERSION,
+                "keywords": MatcherService.KEYWORDS_VERSION
+            },
+            "environment": {"python": platform.python_version(), "machine": platform.machine()},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "timings_s": timings,
+            "outputs": outputs
+        }
+
+    @classmethod
+    def diff(cls, golden: Dict[str, Any], corpus: Corpus, engine: Optional[Engine] = None, repeat: int = 3) -> Dict[str, Any]:
+        """
+        Re-run an engine on the golden corpus and compare field by field.
+
+        Returns:
+            Report with per-field accuracy (exact-match rate, set
+            precision/recall/F1, score deltas), examples of changed
+            values, and per-stage speedups (golden time / new time).
+
+        Raises:
+            ValueError: If the corpus does not regenerate the golden
+                inputs (e.g. the corpus generator changed).
+        """
+        expected = golden["outputs"]
+        for resume in corpus.resumes:
+            entry = expected.get(resume.id)
+            if entry is None or entry["source_sha"] != _sha(resume.text):
+                raise ValueError(f"Corpus does not match the golden snapshot at {resume.id}; regenerate the snapshot")
+
+        outputs, timings = cls._run(corpus, engine or Engine(), repeat)
+        fields: Dict[str, _FieldDiff] = {}
+
+        for resume_id, current in outputs.items():
+            before = expected[resume_id]
+            cls._field(fields, "parse.text", resume_id).compare_text(before["text"], current["text"])
+            for key, value in before["analysis"].items():
+                cls._field(fields, f"analyze.{key}", resume_id).compare(key, value, current["analysis"].get(key))
+            for jd_id, match in before["matches"].items():
+                for key, value in match.items():
+                    cls._field(fields, f"match.{key}", f"{resume_id}/{jd_id}").compare(
+                        key, value, current["matches"].get(jd_id, {}).get(key)
+                    )
+
+        speedups = {
+            stage: round(golden["timings_s"][stage] / seconds, 2) if seconds else None
+            for stage, seconds in timings.items() if stage in golden.get("timings_s", {})
+        }
+        rows = [d.summary() for d in fields.values()]
+        return {
+            "golden_created_at": golden.get("created_at"),
+            "golden_versions": golden.get("versions"),
+            "identical": all(row["changed"] == 0 for row in rows),
+            "fields": rows,
+            "timings_s": {"golden": golden.get("timings_s", {}), "current": timings},
+            "speedups": speedups
+        }
+
+    @classmethod
+    def _field(cls, fields: Dict[str, "_FieldDiff"], name: str, item_id: str) -> "_FieldDiff":
+        diff = fields.setdefault(name, _FieldDiff(name))
+        diff.item_id = item_id
+        return diff
+
+    @staticmethod
+    def _run(corpus: Corpus, engine: Engine, repeat: int):
+        """Outputs per resume id, and the fastest of repeat passes per stage."""
+        timings: Dict[str, float] = {}
+
+        def timed(stage: str, fn: Callable[[], Any]) -> Any:
+            best, result = None, None
+            for _ in range(max(1, repeat)):
+                started = time.perf_counter()
+                result = fn()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            timings[stage] = round(best, 6)
+            return result
+
+        resumes, jds = corpus.resumes, corpus.jds
+        texts = timed("parse", lambda: [engine.parse(r.path) for r in resumes])
+        analyses = timed("analyze", lambda: [engine.analyze(t) for t in texts])
+        matches = timed("match", lambda: [[engine.match(t, jd.text) for jd in jds] for t in texts])
+
+        outputs = {
+            resume.id: {
+                "source_sha": _sha(resume.text),
+                "text": text,
+                "analysis": analysis,
+                "matches": {jd.id: match for jd, match in zip(jds, per_jd)}
+            }
+            for resume, text, analysis, per_jd in zip(resumes, texts, analyses, matches)
+        }
+        return outputs, timings
+
+
+class _FieldDiff:
+    """Accumulates accuracy statistics for one output field."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.item_id = ""
+        self.compared = 0
+        self.changed = 0
+        self.true_positives = self.false_positives = self.false_negatives = 0
+        self.abs_delta = 0.0
+        self.similarity = 0.0
+        self.examples: List[Dict[str, Any]] = []
+
+    def compare(self, key: str, before: Any, after: Any) -> None:
+        if key in SCORE_FIELDS:
+            self.abs_delta += abs((after or 0) - (before or 0))
+        elif isinstance(before, list) and key not in TEXT_FIELDS:
+            expected, actual = set(before), set(after or ())
+            self.true_positives += len(expected & actual)
+            self.false_positives += len(actual - expected)
+            self.false_negatives += len(expected - actual)
+        self._count(before, after)
+
+    def compare_text(self, before: str, after: str) -> None:
+        if before != after:
+            self.similarity += difflib.SequenceMatcher(None, before, after, autojunk=False).ratio()
+            self._count(before, after, show=False)
+        else:
+            self.similarity += 1.0
+            self._count(before, after)
+
+    def _count(self, before: Any, after: Any, show: bool = True) -> None:
+        self.compared += 1
+        if before != after:
+            self.changed += 1
+            if len(self.examples) < MAX_EXAMPLES:
+                example: Dict[str, Any] = {"id": self.item_id}
+                if show:
+                    example.update(golden=before, current=after)
+                self.examples.append(example)
+
+    def summary(self) -> Dict[str, Any]:
+        row: Dict[str, Any] = {
+            "field": self.name,
+            "compared": self.compared,
+            "changed": self.changed,
+            "exact_pct": round(100 * (self.compared - self.changed) / self.compared, 2) if self.compared else 100.0
+        }
+        if self.true_positives or self.false_positives or self.false_negatives:
+            tp, fp, fn = self.true_positives, self.false_positives, self.false_negatives
+            precision = tp / (tp + fp) if tp + fp else 1.0
+            recall = tp / (tp + fn) if tp + fn else 1.0
+            row.update(
+                precision=round(precision, 4),
+                recall=round(recall, 4),
+                f1=round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0
+            )
+        if self.name.split(".")[-1] in SCORE_FIELDS:
+            row["mean_abs_delta"] = round(self.abs_delta / self.compared, 4) if self.compared else 0.0
+        if self.name == "parse.text":
+            row["mean_similarity"] = round(self.similarity / self.compared, 4) if self.compared else 1.0
+        row["examples"] = self.examples
+        return row
+
+
+def regenerate_corpus(golden: Dict[str, Any], out_dir: Path) -> Corpus:
+    """Rebuild the corpus a golden snapshot was taken from."""
+    params = golden["corpus"]
+    return CorpusService.generate(params["seed"], params["resumes"], params["jds"], params["formats"], out_dir)
+
+
+def save_golden(golden: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(golden, indent=1, sort_keys=True))
+
+
+def load_golden(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text())
+
+
+# Convenience function
+def diff_against_golden(path: Path, out_dir: Path, engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """Diff an engine (default: current code) against a saved snapshot."""
+    golden = load_golden(path)
+    return GoldenService.diff(golden, regenerate_corpus(golden, out_dir), engine)
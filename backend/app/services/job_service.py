@@ -0,0 +1,622 @@
+"""
+ResumeSense 2.0 - Job Service
+SQLite-backed job queue under DATA_DIR with local worker processes for
+bulk and slow operations. No external broker is required.
+
+A claimed task holds a lease that its worker renews while it works; a task
+whose lease runs out (the worker crashed) is claimed again, up to
+JOB_MAX_ATTEMPTS times. Finished jobs are deleted after
+JOB_RETENTION_SECONDS.
+"""
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import (
+    JOBS_DB,
+    JOBS_DIR,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+    JOB_RETENTION_SECONDS,
+    JOB_WORKER_NICE
+)
+
+from .parser_service import parse_resume
+from .nlp_service import analyze_resume
+from .matcher_service import match_resume_to_jd
+from .saliency_service import analyze_resume_saliency
+
+# One API process per host runs the workers: the one holding this lock
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    operation TEXT NOT NULL,
+    status TEXT NOT NULL,
+    params TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_until REAL,
+    claim TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS tasks_pending ON tasks (status, job_id);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, updated_at);
+"""
+
+# Columns added after the first release of the queue
+MIGRATIONS = {
+    "attempts": "ALTER TABLE tasks ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+    "lease_until": "ALTER TABLE tasks ADD COLUMN lease_until REAL",
+    "claim": "ALTER TABLE tasks ADD COLUMN claim TEXT"
+}
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+# How often the pool checks its workers and the pool lock
+SUPERVISE_INTERVAL = 5.0
+
+# How often finished jobs past their retention are deleted
+PURGE_INTERVAL = 3600.0
+
+
+class JobService:
+    """Submits, tracks and executes background jobs."""
+
+    OPERATIONS = {"parse", "analyze", "match", "rank", "saliency"}
+
+    # Operations that need a job description
+    JD_OPERATIONS = {"match", "rank"}
+
+    ACTIVE_STATUSES = ("queued", "running")
+
+    @classmethod
+    def connect(cls, db_path: Path = JOBS_DB) -> sqlite3.Connection:
+        """Open a connection to the job database, creating it if needed."""
+        conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        cls._migrate(conn)
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+        for name, statement in MIGRATIONS.items():
+            if name not in columns:
+                conn.execute(statement)
+
+    @classmethod
+    def submit(
+        cls,
+        operation: str,
+        files: List[Tuple[str, str, BinaryIO]],
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Queue a job over one or more files.
+
+        Args:
+            operation: One of OPERATIONS.
+            files: (filename, ext, stream) tuples; streams are copied to JOBS_DIR.
+            params: Operation parameters (e.g. {"jd_text": ...}).
+
+        Returns:
+            The new job ID.
+
+        Raises:
+            ValueError: If the operation or its parameters are invalid.
+        """
+        params = params or {}
+        if operation not in cls.OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}. Supported: {sorted(cls.OPERATIONS)}")
+        if operation in cls.JD_OPERATIONS and not (params.get("jd_text") or "").strip():
+            raise ValueError(f"jd_text is required for {operation} jobs")
+        if not files:
+            raise ValueError("At least one file is required")
+
+        job_id = uuid.uuid4().hex
+        job_dir = JOBS_DIR / job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+        tasks = []
+        for idx, (filename, ext, stream) in enumerate(files):
+            path = job_dir / f"{idx}{ext}"
+            stream.seek(0)
+            with open(path, "wb") as f:
+                shutil.copyfileobj(stream, f)
+            tasks.append((job_id, idx, filename, str(path), "pending"))
+
+        now = time.time()
+        conn = cls.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO jobs (id, operation, status, params, total, created_at, updated_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, operation, json.dumps(params), len(tasks), now, now)
+            )
+            conn.executemany(
+                "INSERT INTO tasks (job_id, idx, filename, path, status) VALUES (?, ?, ?, ?, ?)",
+                tasks
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        return job_id
+
+    @classmethod
+    def get(cls, job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """Return job status, progress and (optionally) per-file results."""
+        conn = cls.connect()
+        try:
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+
+            counts = {
+                row["status"]: row["n"]
+                for row in conn.execute(
+                    "SELECT status, COUNT(*) AS n FROM tasks WHERE job_id = ? GROUP BY status",
+                    (job_id,)
+                )
+            }
+            finished = counts.get("done", 0) + counts.get("failed", 0) + counts.get("cancelled", 0)
+
+            info = {
+                "job_id": job["id"],
+                "operation": job["operation"],
+                "status": job["status"],
+                "created_at": job["created_at"],
+                "updated_at": job["updated_at"],
+                "progress": {
+                    "total": job["total"],
+                    "pending": counts.get("pending", 0),
+                    "running": counts.get("running", 0),
+                    "done": counts.get("done", 0),
+                    "failed": counts.get("failed", 0),
+                    "cancelled": counts.get("cancelled", 0),
+                    "percent": round(100 * finished / job["total"], 1) if job["total"] else 100.0
+                }
+            }
+
+            if include_results:
+                rows = conn.execute(
+                    "SELECT idx, filename, status, result, error FROM tasks "
+                    "WHERE job_id = ? ORDER BY idx",
+                    (job_id,)
+                ).fetchall()
+                results = [
+                    {
+                        "index": row["idx"],
+                        "filename": row["filename"],
+                        "status": row["status"],
+                        "result": json.loads(row["result"]) if row["result"] else None,
+                        "error": row["error"]
+                    }
+                    for row in rows
+                ]
+                if job["operation"] == "rank":
+                    results.sort(key=lambda r: -(r["result"] or {}).get("overall_score", -1))
+                info["results"] = results
+
+            return info
+        finally:
+            conn.close()
+
+    @classmethod
+    def cancel(cls, job_id: str) -> bool:
+        """
+        Cancel a job. Pending files are skipped; files already being
+        processed run to completion.
+
+        Returns:
+            False if the job does not exist.
+        """
+        conn = cls.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            job = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                conn.execute("ROLLBACK")
+                return False
+            if job["status"] in cls.ACTIVE_STATUSES:
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', updated_at = ? WHERE id = ?",
+                    (now, job_id)
+                )
+                pending = conn.execute(
+                    "SELECT path FROM tasks WHERE job_id = ? AND status = 'pending'",
+                    (job_id,)
+                ).fetchall()
+                conn.execute(
+                    "UPDATE tasks SET status = 'cancelled', finished_at = ? "
+                    "WHERE job_id = ? AND status = 'pending'",
+                    (now, job_id)
+                )
+                conn.execute("COMMIT")
+                for row in pending:
+                    _remove(row["path"])
+                try:
+                    # Only succeeds once no in-flight task still holds a file
+                    (JOBS_DIR / job_id).rmdir()
+                except OSError:
+                    pass
+            else:
+                conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    @classmethod
+    def claim_task(cls, conn: sqlite3.Connection) -> Optional[Dict[str, Any]]:
+        """
+        Atomically take the oldest pending task of an active job, or a
+        running one whose lease has expired.
+
+        Returns:
+            The task, with the "claim" token that renew_lease() and
+            finish_task() must present, or None if there is nothing to do.
+        """
+        now = time.time()
+        abandoned: List[Tuple[str, str]] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                task = conn.execute(
+                    "SELECT t.job_id, t.idx, t.path, t.attempts, j.operation, j.params FROM tasks t "
+                    "JOIN jobs j ON j.id = t.job_id "
+                    "WHERE (t.status = 'pending' OR (t.status = 'running' AND t.lease_until < ?)) "
+                    "AND j.status IN ('queued', 'running') "
+                    "ORDER BY j.created_at, t.idx LIMIT 1",
+                    (now,)
+                ).fetchone()
+                if task is None or task["attempts"] < JOB_MAX_ATTEMPTS:
+                    break
+                # Every worker that took this file died on it
+                error = f"Worker stopped while processing the file ({task['attempts']} attempts)"
+                cls._record_outcome(conn, task["job_id"], task["idx"], None, None, error, now)
+                abandoned.append((task["path"], task["job_id"]))
+
+            claimed = None
+            if task is not None:
+                claimed = {**dict(task), "claim": uuid.uuid4().hex}
+                conn.execute(
+                    "UPDATE tasks SET status = 'running', started_at = ?, lease_until = ?, "
+                    "attempts = attempts + 1, claim = ? WHERE job_id = ? AND idx = ?",
+                    (now, now + JOB_LEASE_SECONDS, claimed["claim"], task["job_id"], task["idx"])
+                )
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', updated_at = ? WHERE id = ? AND status = 'queued'",
+                    (now, task["job_id"])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        for path, job_id in abandoned:
+            _remove(path)
+            cls._cleanup_if_finished(conn, job_id)
+        return claimed
+
+    @classmethod
+    def renew_lease(cls, conn: sqlite3.Connection, job_id: str, idx: int, claim: str) -> bool:
+        """Extend a running task's lease; False if the claim was lost."""
+        cur = conn.execute(
+            "UPDATE tasks SET lease_until = ? WHERE job_id = ? AND idx = ? AND claim = ? AND status = 'running'",
+            (time.time() + JOB_LEASE_SECONDS, job_id, idx, claim)
+        )
+        return cur.rowcount > 0
+
+    @classmethod
+    def finish_task(
+        cls,
+        conn: sqlite3.Connection,
+        job_id: str,
+        idx: int,
+        claim: str,
+        result: Optional[Dict[str, Any]],
+        error: Optional[str]
+    ) -> bool:
+        """
+        Record a task outcome and close the job once every task has finished.
+
+        Returns:
+            False if the task was claimed by another worker in the meantime
+            (the outcome is dropped).
+        """
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            remaining = cls._record_outcome(conn, job_id, idx, claim, result, error, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if remaining is None:
+            return False
+        if remaining == 0:
+            shutil.rmtree(JOBS_DIR / job_id, ignore_errors=True)
+        return True
+
+    @classmethod
+    def _cleanup_if_finished(cls, conn: sqlite3.Connection, job_id: str) -> None:
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status IN ('pending', 'running')",
+            (job_id,)
+        ).fetchone()[0]
+        if remaining == 0:
+            shutil.rmtree(JOBS_DIR / job_id, ignore_errors=True)
+
+    @classmethod
+    def _record_outcome(cls, conn, job_id, idx, claim, result, error, now) -> Optional[int]:
+        # claim None: recorded by the queue itself, not by the worker
+        cur = conn.execute(
+            "UPDATE tasks SET status = ?, result = ?, error = ?, finished_at = ?, lease_until = NULL "
+            "WHERE job_id = ? AND idx = ? AND status = 'running' AND (? IS NULL OR claim = ?)",
+            (
+                "failed" if error else "done",
+                json.dumps(result) if result is not None else None,
+                error,
+                now,
+                job_id,
+                idx,
+                claim,
+                claim
+            )
+        )
+        if cur.rowcount == 0:
+            return None
+        remaining = conn.execute(
+            "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status IN ('pending', 'running')",
+            (job_id,)
+        ).fetchone()[0]
+        if remaining == 0:
+            succeeded = conn.execute(
+                "SELECT COUNT(*) FROM tasks WHERE job_id = ? AND status = 'done'",
+                (job_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                ("completed" if succeeded else "failed", now, job_id)
+            )
+        else:
+            conn.execute("UPDATE jobs SET updated_at = ? WHERE id = ?", (now, job_id))
+        return remaining
+
+    @classmethod
+    def purge_finished(cls, older_than: float = JOB_RETENTION_SECONDS) -> int:
+        """Delete finished jobs last updated more than older_than seconds ago."""
+        conn = cls.connect()
+        try:
+            cutoff = time.time() - older_than
+            job_ids = [
+                row["id"] for row in conn.execute(
+                    f"SELECT id FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) "
+                    "AND updated_at < ?",
+                    (*FINISHED_STATUSES, cutoff)
+                )
+            ]
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM tasks WHERE job_id = ?", [(job_id,) for job_id in job_ids])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        for job_id in job_ids:
+            shutil.rmtree(JOBS_DIR / job_id, ignore_errors=True)
+        return len(job_ids)
+
+    @classmethod
+    def run_task(cls, operation: str, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one file of a job using the regular services."""
+        if operation == "saliency":
+            # Uses the server's GOOGLE_API_KEY; keys are never written to the job DB
+            result = analyze_resume_saliency(Path(path))
+            if not result.get("success", False):
+                raise ValueError(result.get("error", "Saliency analysis failed"))
+            result.pop("success", None)
+            return result
+
+        text = parse_resume(path)
+
+        if operation == "parse":
+            return {"text": text, "char_count": len(text)}
+        if operation == "analyze":
+            return {"data": analyze_resume(text)}
+        if operation == "match":
+            return {
+                "resume_data": analyze_resume(text),
+                "match_result": match_resume_to_jd(text, params["jd_text"])
+            }
+        if operation == "rank":
+            return match_resume_to_jd(text, params["jd_text"])
+
+        raise ValueError(f"Unknown operation: {operation}")
+
+
+class JobWorkerPool:
+    """
+    Keeps N worker processes draining the job queue, replacing any that
+    die, and purges expired jobs. With several API processes on a host
+    (uvicorn --workers), only the one holding the pool lock runs workers;
+    another takes over when it exits.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._ctx = multiprocessing.get_context("spawn")
+        # A lock-free flag: a worker killed mid-wait could leave an Event's lock held
+        self._stop = self._ctx.RawValue("b", 0)
+        self._processes: List[multiprocessing.Process] = []
+        self._spawned = 0
+        self._closing = threading.Event()
+        self._supervisor: Optional[threading.Thread] = None
+        self._lock_file: Optional[IO] = None
+
+    def start(self) -> None:
+        self._supervisor = threading.Thread(target=self._supervise, name="resumesense-job-pool", daemon=True)
+        self._supervisor.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._closing.set()
+        if self._supervisor is not None:
+            self._supervisor.join(timeout)
+        self._stop.value = 1
+        for proc in self._processes:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._processes.clear()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _supervise(self) -> None:
+        last_purge = 0.0
+        while not self._closing.is_set():
+            if self._lock_file is None:
+                self._lock_file = _acquire_pool_lock()
+            if self._lock_file is not None:
+                self._processes = [proc for proc in self._processes if proc.is_alive()]
+                while len(self._processes) < self.workers:
+                    self._spawn()
+                if time.monotonic() - last_purge > PURGE_INTERVAL:
+                    last_purge = time.monotonic()
+                    JobService.purge_finished()
+            self._closing.wait(SUPERVISE_INTERVAL)
+
+    def _spawn(self) -> None:
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self._stop,),
+            name=f"resumesense-job-worker-{self._spawned}",
+            daemon=True
+        )
+        proc.start()
+        self._processes.append(proc)
+        self._spawned += 1
+
+
+def _acquire_pool_lock() -> Optional[IO]:
+    """Open and lock the pool lock file; None if another process holds it."""
+    JOBS_DB.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(JOBS_DB.with_suffix(".lock"), "a")
+    if fcntl is None:
+        # No cross-process lock here; leases still keep each task exclusive
+        return lock_file
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+@contextmanager
+def _keep_lease(job_id: str, idx: int, claim: str) -> Iterator[None]:
+    """Renew a task's lease from a background thread while the body runs."""
+    done = threading.Event()
+
+    def renew() -> None:
+        conn = JobService.connect()
+        try:
+            while not done.wait(JOB_LEASE_SECONDS / 3):
+                if not JobService.renew_lease(conn, job_id, idx, claim):
+                    return
+        finally:
+            conn.close()
+
+    thread = threading.Thread(target=renew, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def _worker_main(stop_flag) -> None:
+    """Worker process loop: claim a task, run it, record the result."""
+    # Batch work yields the CPU to interactive API requests
+    if JOB_WORKER_NICE and hasattr(os, "nice"):
+        os.nice(JOB_WORKER_NICE)
+
+    conn = JobService.connect()
+    try:
+        while not stop_flag.value:
+            task = JobService.claim_task(conn)
+            if task is None:
+                time.sleep(JOB_POLL_INTERVAL)
+                continue
+
+            result, error = None, None
+            with _keep_lease(task["job_id"], task["idx"], task["claim"]):
+                try:
+                    result = JobService.run_task(task["operation"], task["path"], json.loads(task["params"]))
+                except Exception as e:
+                    error = str(e) or type(e).__name__
+            # A worker that lost its claim leaves the file to the new owner
+            if JobService.finish_task(conn, task["job_id"], task["idx"], task["claim"], result, error):
+                _remove(task["path"])
+    finally:
+        conn.close()
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# Convenience functions
+def submit_job(
+    operation: str,
+    files: List[Tuple[str, str, BinaryIO]],
+    params: Optional[Dict[str, Any]] = None
+) -> str:
+    """Queue a background job and return its ID."""
+    return JobService.submit(operation, files, params)
+
+
+def get_job(job_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+    """Return job status and results, or None if the job does not exist."""
+    return JobService.get(job_id, include_results)
+
+
+def cancel_job(job_id: str) -> bool:
+    """Cancel a job; returns False if it does not exist."""
+    return JobService.cancel(job_id)
@@ -3,13 +3,17 @@ ResumeSense 2.0 - Matcher Service
 Compare resume against job description and calculate match score.
 """
 import re
-from typing import Dict, List, Set, Any
+import sys
+from array import array
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Set
 from dataclasses import dataclass, field
 
+from app.core.metrics import timed
 
-@dataclass
+
+@dataclass(slots=True)
 class MatchResult:
-    """Result of matching a resume against a job description."""
+    """Result of matching a resume against a job description. Slotted: no per-instance __dict__."""
     overall_score: float = 0.0
     skill_score: float = 0.0
     matching_skills: List[str] = field(default_factory=list)
@@ -29,6 +33,9 @@ class MatchResult:
 class MatcherService:
     """Handles resume-to-job-description matching."""
     
+    # Bump when _extract_keywords() output changes so stored keywords are rebuilt
+    KEYWORDS_VERSION = "1"
+    
     # Extended stopwords for better keyword extraction
     STOPWORDS: Set[str] = {
         "the", "a", "an", "and", "or", "but", "is", "are", "was", "were", "be", "been",
@@ -46,6 +53,7 @@ class MatcherService:
     }
     
     @classmethod
+    @timed("match")
     def match(cls, resume_text: str, jd_text: str) -> MatchResult:
         """
         Match resume against job description.
@@ -57,12 +65,48 @@ class MatcherService:
         Returns:
             MatchResult with scores and analysis.
         """
-        result = MatchResult()
-        
         # Extract keywords from both
         resume_keywords = cls._extract_keywords(resume_text)
         jd_keywords = cls._extract_keywords(jd_text)
         
+        return cls.match_keywords(resume_keywords, jd_keywords)
+    
+    @classmethod
+    def extract_keywords(cls, text: str) -> Set[str]:
+        """Extract the keyword set used for matching (resume or JD)."""
+        return cls._extract_keywords(text)
+    
+    @classmethod
+    def compile_jd(cls, jd_text: str) -> FrozenSet[str]:
+        """
+        Pre-extract a job description's keywords.
+        
+        Batch callers compile the JD once and score every resume against
+        it with match_keywords().
+        """
+        return frozenset(cls._extract_keywords(jd_text))
+    
+    @classmethod
+    def match_keywords(
+        cls,
+        resume_keywords: AbstractSet[str],
+        jd_keywords: AbstractSet[str],
+        recommendations: bool = True
+    ) -> MatchResult:
+        """
+        Score already-extracted resume keywords against JD keywords.
+        
+        Args:
+            resume_keywords: Output of _extract_keywords() for the resume.
+            jd_keywords: Output of compile_jd() for the job description.
+            recommendations: Generate recommendations; batch callers that
+                only keep scores (e.g. MatchResultSet) can skip them.
+            
+        Returns:
+            MatchResult with scores and analysis.
+        """
+        result = MatchResult()
+        
         if not jd_keywords:
             result.recommendations.append("Job description appears to be empty or too short.")
             return result
@@ -80,7 +124,8 @@ class MatcherService:
         result.missing_skills = sorted(list(missing))
         
         # Generate recommendations
-        result.recommendations = cls._generate_recommendations(result)
+        if recommendations:
+            result.recommendations = cls._generate_recommendations(result)
         
         return result
     
@@ -93,9 +138,10 @@ class MatcherService:
         # Extract words (3+ characters)
         words = re.findall(r'\b[a-z][a-z\+\#\.]+\b', text)
         
-        # Filter stopwords and short words
+        # Filter stopwords and short words. Interned, so keyword sets held
+        # for many resumes share one string object per distinct word.
         keywords = {
-            w for w in words 
+            sys.intern(w) for w in words 
             if len(w) >= 3 and w not in cls.STOPWORDS
         }
         
@@ -132,6 +178,85 @@ class MatcherService:
         return recs
 
 
+class MatchResultSet:
+    """
+    Columnar container for many match results against one JD.
+
+    Scores live in parallel double arrays (exactly the floats MatchResult
+    holds, so rounding and tie order match) and skills as ids into a shared
+    vocabulary (flat id arrays plus offsets), so 100k results cost a few
+    bytes per row plus the skill ids instead of a dataclass, two lists and
+    a dict each. Rows are materialized to dicts only when read, e.g. for
+    the page being displayed.
+    """
+
+    __slots__ = (
+        "ids", "overall", "skill", "_vocab", "_vocab_index",
+        "_matching", "_matching_offsets", "_missing", "_missing_offsets"
+    )
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.overall = array("d")
+        self.skill = array("d")
+        self._vocab: List[str] = []
+        self._vocab_index: Dict[str, int] = {}
+        self._matching = array("I")
+        self._matching_offsets = array("I", [0])
+        self._missing = array("I")
+        self._missing_offsets = array("I", [0])
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, row_id: str, result: MatchResult) -> None:
+        self.ids.append(row_id)
+        self.overall.append(result.overall_score)
+        self.skill.append(result.skill_score)
+        self._matching.extend(self._skill_id(s) for s in result.matching_skills)
+        self._matching_offsets.append(len(self._matching))
+        self._missing.extend(self._skill_id(s) for s in result.missing_skills)
+        self._missing_offsets.append(len(self._missing))
+
+    def _skill_id(self, skill: str) -> int:
+        skill_id = self._vocab_index.get(skill)
+        if skill_id is None:
+            skill_id = self._vocab_index[skill] = len(self._vocab)
+            self._vocab.append(skill)
+        return skill_id
+
+    def result(self, i: int) -> MatchResult:
+        """Rebuild row i as a MatchResult (recommendations included)."""
+        matching, missing = self._matching_offsets, self._missing_offsets
+        result = MatchResult(
+            overall_score=self.overall[i],
+            skill_score=self.skill[i],
+            matching_skills=[self._vocab[j] for j in self._matching[matching[i]:matching[i + 1]]],
+            missing_skills=[self._vocab[j] for j in self._missing[missing[i]:missing[i + 1]]]
+        )
+        result.recommendations = MatcherService._generate_recommendations(result)
+        return result
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Materialize row i as an API-style dict with its id."""
+        return {"id": self.ids[i], **self.result(i).to_dict()}
+
+    def order(self, descending: bool = True) -> List[int]:
+        """Row indices sorted by overall score (ties by id)."""
+        if descending:
+            return sorted(range(len(self.ids)), key=lambda i: (-self.overall[i], self.ids[i]))
+        return sorted(range(len(self.ids)), key=lambda i: (self.overall[i], self.ids[i]))
+
+    def page(self, offset: int = 0, limit: int = 50, order: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+        """Materialize one page of rows, best score first unless an order is given."""
+        order = self.order() if order is None else order
+        return [self.row(i) for i in order[offset:offset + limit]]
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        """Lazily materialize every row in insertion order."""
+        return (self.row(i) for i in range(len(self.ids)))
+
+
 # Convenience function
 def match_resume_to_jd(resume_text: str, jd_text: str) -> Dict[str, Any]:
     """Match resume against job description and return results."""
@@ -3,13 +3,16 @@ ResumeSense 2.0 - NLP Service
 Entity extraction and skill identification from resume text.
 """
 import re
+import sys
 from typing import Dict, List, Any, Set
 from dataclasses import dataclass, field
 
+from app.core.metrics import timed
 
-@dataclass
+
+@dataclass(slots=True)
 class ResumeData:
-    """Structured resume data."""
+    """Structured resume data. Slotted: no per-instance __dict__."""
     name: str = ""
     emails: List[str] = field(default_factory=list)
     phones: List[str] = field(default_factory=list)
@@ -35,6 +38,9 @@ class ResumeData:
 class NLPService:
     """Handles NLP-based extraction from resume text."""
     
+    # Bump when extract() output changes so stored ResumeData is rebuilt
+    VERSION = "2"
+    
     # Common tech skills (expandable)
     TECH_SKILLS: Set[str] = {
         # Programming Languages
@@ -56,6 +62,13 @@ class NLPService:
         "agile", "scrum", "jira", "figma", "api", "rest", "graphql", "microservices"
     }
     
+    # Display label per skill, built once so every ResumeData shares the
+    # same interned strings instead of allocating new ones per resume
+    SKILL_LABELS: Dict[str, str] = {
+        skill: sys.intern(skill.title() if len(skill) > 3 else skill.upper())
+        for skill in TECH_SKILLS
+    }
+    
     # Regex patterns
     EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
     PHONE_PATTERN = re.compile(r'[\+]?[(]?[0-9]{1,4}[)]?[-\s\./0-9]{7,}')
@@ -69,6 +82,7 @@ class NLPService:
     SKILLS_HEADERS = ["skills", "technical skills", "technologies", "proficiencies", "competencies"]
     
     @classmethod
+    @timed("nlp_extract")
     def extract(cls, text: str) -> ResumeData:
         """
         Extract structured information from resume text.
@@ -106,7 +120,7 @@ class NLPService:
     def _extract_emails(cls, text: str) -> List[str]:
         """Extract email addresses."""
         emails = cls.EMAIL_PATTERN.findall(text)
-        return list(set(emails))  # Remove duplicates
+        return list(dict.fromkeys(emails))  # Remove duplicates, keep document order
     
     @classmethod
     def _extract_phones(cls, text: str) -> List[str]:
@@ -118,7 +132,7 @@ class NLPService:
             digits = re.sub(r'\D', '', phone)
             if 10 <= len(digits) <= 15:  # Valid phone length
                 cleaned.append(phone.strip())
-        return list(set(cleaned))
+        return list(dict.fromkeys(cleaned))
     
     @classmethod
     def _extract_links(cls, text: str) -> List[str]:
@@ -137,7 +151,7 @@ class NLPService:
         urls = cls.URL_PATTERN.findall(text)
         links.extend(urls)
         
-        return list(set(links))
+        return list(dict.fromkeys(links))
     
     @classmethod
     def _extract_name(cls, text: str) -> str:
@@ -172,7 +186,7 @@ class NLPService:
             # Use word boundary matching
             pattern = r'\b' + re.escape(skill) + r'\b'
             if re.search(pattern, text_lower):
-                found_skills.append(skill.title() if len(skill) > 3 else skill.upper())
+                found_skills.append(cls.SKILL_LABELS[skill])
         
         return sorted(list(set(found_skills)))
     
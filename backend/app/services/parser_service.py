@@ -2,20 +2,34 @@
 ResumeSense 2.0 - Parser Service
 Robust extraction of text from PDF, DOCX, and TXT files.
 """
+import io
 import re
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 
-# PDF extraction
-try:
-    import fitz  # PyMuPDF - more reliable than pdfminer
-except ImportError:
-    fitz = None
+# PyMuPDF (preferred), pdfminer (fallback) and python-docx are imported on
+# first use, so TXT-only work and CLI startup do not load them
+from app.core.backends import BACKENDS, backend, optional_backend
+from app.core.metrics import PARSER_BACKEND, PARSER_FALLBACKS, stage
 
-from pdfminer.high_level import extract_text as pdfminer_extract
 
-# DOCX extraction  
-from docx import Document
+# A parser source is either a path on disk or an open binary stream
+Source = Union[str, Path, BinaryIO]
+
+
+def _is_stream(source: Source) -> bool:
+    return hasattr(source, "read")
+
+
+def open_pdf(source: Source):
+    """Open a PDF from a path or binary stream with PyMuPDF."""
+    fitz = optional_backend("fitz")
+    if not fitz:
+        raise ImportError("PyMuPDF (fitz) is required for PDF conversion")
+    if _is_stream(source):
+        source.seek(0)
+        return fitz.open(stream=source.read(), filetype="pdf")
+    return fitz.open(str(source))
 
 
 class ParserService:
@@ -23,6 +37,9 @@ class ParserService:
     
     SUPPORTED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
     
+    # Bump when extraction output changes so stored text is re-parsed
+    VERSION = "1"
+    
     @classmethod
     def extract_text(cls, file_path: str | Path) -> str:
         """
@@ -58,54 +75,121 @@ class ParserService:
         return ""
     
     @classmethod
-    def _extract_pdf(cls, path: Path) -> str:
+    def extract_stream(cls, stream: BinaryIO, ext: str) -> str:
+        """
+        Extract text content from an open binary stream.
+        
+        Used for uploads so the data never has to be copied to a temp file.
+        
+        Args:
+            stream: Seekable binary file object.
+            ext: File type as an extension (e.g. ".pdf").
+            
+        Returns:
+            Extracted text content.
+            
+        Raises:
+            ValueError: If file type is not supported.
+        """
+        ext = ext.lower()
+        
+        if ext not in cls.SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file type: {ext}. Supported: {cls.SUPPORTED_EXTENSIONS}")
+        
+        stream.seek(0)
+        if ext == ".pdf":
+            # PyMuPDF needs the bytes in memory; uploads are size-capped
+            return cls._extract_pdf(io.BytesIO(stream.read()))
+        elif ext in {".docx", ".doc"}:
+            return cls._extract_docx(stream)
+        elif ext == ".txt":
+            return cls._extract_txt(stream)
+        
+        return ""
+    
+    @classmethod
+    def _extract_pdf(cls, path: Source) -> str:
         """Extract text from PDF using PyMuPDF (preferred) or pdfminer (fallback)."""
         text = ""
         
         # Try PyMuPDF first (faster and more reliable)
-        if fitz:
+        if BACKENDS.available("fitz"):
             try:
-                doc = fitz.open(str(path))
-                for page in doc:
-                    text += page.get_text()
-                doc.close()
-                if text.strip():
-                    return cls._clean_text(text)
+                doc = open_pdf(path)
+                try:
+                    text = cls.extract_pdf_document(doc)
+                finally:
+                    doc.close()
+                if text:
+                    PARSER_BACKEND.inc(backend="pymupdf")
+                    return text
+                PARSER_FALLBACKS.inc(reason="no_text")
             except Exception:
-                pass  # Fall back to pdfminer
+                PARSER_FALLBACKS.inc(reason="error")  # Fall back to pdfminer
         
         # Fallback to pdfminer
         try:
-            text = pdfminer_extract(str(path))
+            pdfminer_extract = backend("pdfminer")
+            with stage("parse_pdf_pdfminer"):
+                if _is_stream(path):
+                    path.seek(0)
+                    text = pdfminer_extract(path)
+                else:
+                    text = pdfminer_extract(str(path))
         except Exception as e:
             raise ValueError(f"Failed to extract PDF text: {e}")
         
+        PARSER_BACKEND.inc(backend="pdfminer")
         return cls._clean_text(text)
     
     @classmethod
-    def _extract_docx(cls, path: Path) -> str:
+    def extract_pdf_document(cls, doc) -> str:
+        """
+        Extract text from an already-open PyMuPDF document.
+        
+        Lets callers that also render the document (e.g. the pipeline)
+        open it once and share it between stages.
+        
+        Returns:
+            Cleaned text, or an empty string if the PDF has no text layer.
+        """
+        with stage("parse_pdf_pymupdf"):
+            text = "".join(page.get_text() for page in doc)
+        return cls._clean_text(text) if text.strip() else ""
+    
+    @classmethod
+    def _extract_docx(cls, path: Source) -> str:
         """Extract text from DOCX file."""
         try:
-            doc = Document(str(path))
-            paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-            
-            # Also extract from tables
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            paragraphs.append(cell.text)
+            Document = backend("docx")
+            with stage("parse_docx"):
+                doc = Document(path if _is_stream(path) else str(path))
+                paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+                
+                # Also extract from tables
+                for table in doc.tables:
+                    for row in table.rows:
+                        for cell in row.cells:
+                            if cell.text.strip():
+                                paragraphs.append(cell.text)
             
+            PARSER_BACKEND.inc(backend="docx")
             return cls._clean_text("\n".join(paragraphs))
         except Exception as e:
             raise ValueError(f"Failed to extract DOCX text: {e}")
     
     @classmethod
-    def _extract_txt(cls, path: Path) -> str:
+    def _extract_txt(cls, path: Source) -> str:
         """Extract text from TXT file."""
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                return cls._clean_text(f.read())
+            with stage("parse_txt"):
+                if _is_stream(path):
+                    text = path.read().decode("utf-8", errors="ignore")
+                else:
+                    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                        text = f.read()
+            PARSER_BACKEND.inc(backend="txt")
+            return cls._clean_text(text)
         except Exception as e:
             raise ValueError(f"Failed to read TXT file: {e}")
     
@@ -127,3 +211,8 @@ class ParserService:
 def parse_resume(file_path: str | Path) -> str:
     """Parse a resume file and return extracted text."""
     return ParserService.extract_text(file_path)
+
+
+def parse_resume_stream(stream: BinaryIO, ext: str) -> str:
+    """Parse an uploaded resume stream and return extracted text."""
+    return ParserService.extract_stream(stream, ext)
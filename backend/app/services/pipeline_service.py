@@ -0,0 +1,167 @@
+"""
+ResumeSense 2.0 - Pipeline Service
+Parse a resume once and run analysis, JD matching and saliency on the
+shared result, with the slow saliency stage running concurrently.
+"""
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.core.backends import BACKENDS
+from app.core.metrics import PARSER_BACKEND
+from app.core.progress import report
+
+from .parser_service import ParserService, Source, open_pdf
+from .nlp_service import analyze_resume
+from .matcher_service import match_resume_to_jd
+from .saliency_service import SaliencyService
+
+
+class PipelineService:
+    """Runs the parse -> analyze/match/saliency stages for a single upload."""
+
+    @classmethod
+    async def run(
+        cls,
+        source: Source,
+        jd_text: Optional[str] = None,
+        api_key: Optional[str] = None,
+        saliency: bool = True,
+        ext: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the full pipeline for one resume file.
+
+        The document is opened once. For PDFs the same PyMuPDF handle is used
+        for text extraction and for rendering the page sent to Gemini, and
+        analyze/match run in parallel with the render + model call.
+
+        Args:
+            source: Path to the resume file, or an open binary stream.
+            jd_text: Optional job description to match against.
+            api_key: Optional Gemini API key (falls back to GOOGLE_API_KEY).
+            saliency: Whether to run the saliency stage (PDF only).
+            ext: File type (e.g. ".pdf"); required when source is a stream.
+
+        Returns:
+            Combined result with resume_data, match_result, saliency and
+            per-stage timings in milliseconds.
+        """
+        if ext is None:
+            ext = Path(source).suffix
+        ext = ext.lower()
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        want_saliency = saliency and ext == ".pdf"
+        text, doc = await asyncio.to_thread(cls._parse, source, ext, want_saliency, timings)
+
+        try:
+            tasks = [asyncio.to_thread(cls._analyze_and_match, text, jd_text, timings)]
+            if want_saliency:
+                tasks.append(asyncio.to_thread(cls._saliency, doc, api_key, timings))
+            results = await asyncio.gather(*tasks)
+        finally:
+            if doc is not None:
+                doc.close()
+
+        resume_data, match_result = results[0]
+        if want_saliency:
+            saliency_result = results[1]
+        elif saliency:
+            saliency_result = {"success": False, "error": "Saliency analysis only supports PDF files"}
+        else:
+            saliency_result = None
+
+        timings["total_ms"] = cls._elapsed_ms(started)
+
+        return {
+            "resume_data": resume_data,
+            "match_result": match_result,
+            "saliency": saliency_result,
+            "char_count": len(text),
+            "timings": timings
+        }
+
+    @classmethod
+    def _parse(cls, source: Source, ext: str, keep_open: bool, timings: Dict[str, float]):
+        """Extract text, returning the open PyMuPDF document when saliency needs it."""
+        started = time.perf_counter()
+        doc = None
+        text = ""
+
+        if keep_open and BACKENDS.available("fitz"):
+            try:
+                doc = open_pdf(source)
+                text = ParserService.extract_pdf_document(doc)
+                if text:
+                    PARSER_BACKEND.inc(backend="pymupdf")
+            except Exception:
+                if doc is not None:
+                    doc.close()
+                doc = None
+
+        if not text:
+            # No text layer or not a PDF - use the regular parser fallbacks
+            if hasattr(source, "read"):
+                text = ParserService.extract_stream(source, ext)
+            else:
+                text = ParserService.extract_text(source)
+
+        timings["parse_ms"] = cls._elapsed_ms(started)
+        report("parsed", {"char_count": len(text), "parse_ms": timings["parse_ms"]})
+        return text, doc
+
+    @classmethod
+    def _analyze_and_match(cls, text: str, jd_text: Optional[str], timings: Dict[str, float]):
+        """Run NLP analysis and, if a JD was given, matching."""
+        started = time.perf_counter()
+        resume_data = analyze_resume(text)
+        timings["analyze_ms"] = cls._elapsed_ms(started)
+        report("analyzed", {"resume_data": resume_data})
+
+        match_result = None
+        if jd_text and jd_text.strip():
+            started = time.perf_counter()
+            match_result = match_resume_to_jd(text, jd_text)
+            timings["match_ms"] = cls._elapsed_ms(started)
+            report("matched", {"match_result": match_result})
+
+        return resume_data, match_result
+
+    @classmethod
+    def _saliency(cls, doc, api_key: Optional[str], timings: Dict[str, float]) -> Dict[str, Any]:
+        """Render the first page from the shared document and call the vision model."""
+        try:
+            key = SaliencyService.check_ready(api_key)
+            if doc is None:
+                raise ValueError("Failed to open PDF for rendering")
+
+            started = time.perf_counter()
+            image_bytes = SaliencyService.render_page(doc)
+            timings["render_ms"] = cls._elapsed_ms(started)
+
+            started = time.perf_counter()
+            result = SaliencyService.analyze_image(image_bytes, key)
+            timings["saliency_model_ms"] = cls._elapsed_ms(started)
+            return result
+        except (ImportError, ValueError) as e:
+            report("model-responded", {"success": False, "error": str(e)})
+            return {"success": False, "error": str(e)}
+
+    @staticmethod
+    def _elapsed_ms(started: float) -> float:
+        return round((time.perf_counter() - started) * 1000, 1)
+
+
+# Convenience function
+async def run_pipeline(
+    source: Source,
+    jd_text: Optional[str] = None,
+    api_key: Optional[str] = None,
+    saliency: bool = True,
+    ext: Optional[str] = None
+) -> Dict[str, Any]:
+    """Parse a resume once and run analyze, match and saliency on it."""
+    return await PipelineService.run(source, jd_text, api_key, saliency, ext)
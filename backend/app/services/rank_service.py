@@ -0,0 +1,309 @@
+"""
+ResumeSense 2.0 - Rank Service
+Rank a directory or zip archive of resumes against one job description
+using a process pool, streaming results to JSONL/CSV with resumable
+checkpoints.
+"""
+import base64
+import csv
+import hashlib
+import heapq
+import io
+import json
+import multiprocessing
+import os
+import time
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+
+from .parser_service import ParserService, parse_resume
+from .matcher_service import MatcherService
+from .dedup_service import DedupService, LSHIndex, signature_from_bytes
+
+CSV_FIELDS = ["id", "overall_score", "skill_score", "matching", "missing", "top_missing", "duplicate_of", "error"]
+
+
+@dataclass(frozen=True)
+class RankTask:
+    """One resume to score: a file on disk or a member of a zip archive."""
+    id: str
+    path: str
+    ext: str
+    member: Optional[str] = None
+
+
+@dataclass
+class RankSummary:
+    """Outcome of a ranking run."""
+    total: int = 0
+    processed: int = 0
+    skipped: int = 0
+    errors: int = 0
+    duplicates: int = 0
+    elapsed_s: float = 0.0
+    top: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class RankService:
+    """Ranks many resumes against a single job description."""
+
+    @classmethod
+    def discover(cls, source: Path) -> List[RankTask]:
+        """List supported resume files in a directory tree or zip archive."""
+        source = Path(source)
+        if not source.exists():
+            raise FileNotFoundError(f"Not found: {source}")
+
+        supported = ParserService.SUPPORTED_EXTENSIONS
+        tasks = []
+        if source.is_file() and zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                for info in archive.infolist():
+                    ext = Path(info.filename).suffix.lower()
+                    if not info.is_dir() and ext in supported:
+                        tasks.append(RankTask(f"{source.name}!{info.filename}", str(source), ext, info.filename))
+        elif source.is_dir():
+            for path in sorted(source.rglob("*")):
+                ext = path.suffix.lower()
+                if path.is_file() and ext in supported:
+                    tasks.append(RankTask(str(path.relative_to(source)), str(path), ext))
+        else:
+            raise ValueError(f"Expected a directory or zip archive: {source}")
+        return tasks
+
+    @classmethod
+    def rank(
+        cls,
+        source: Path,
+        jd_text: str,
+        output: Path,
+        csv_path: Optional[Path] = None,
+        workers: Optional[int] = None,
+        top_k: int = 20,
+        fresh: bool = False,
+        dedup: bool = False,
+        on_start: Optional[Callable[[int, int], None]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> RankSummary:
+        """
+        Score every resume under source against jd_text.
+
+        Results are appended to the JSONL output (and CSV, if given) as they
+        arrive. The JSONL file doubles as the checkpoint: rerunning with the
+        same output skips files already scored for the same JD and retries
+        files that failed (their new line supersedes the error).
+
+        Args:
+            source: Directory or zip archive.
+            jd_text: Job description text (compiled once).
+            output: JSONL results / checkpoint file.
+            csv_path: Optional CSV results file.
+            workers: Process count (default: CPU count). 1 runs inline.
+            top_k: Size of the returned leaderboard.
+            fresh: Ignore and overwrite an existing checkpoint.
+            dedup: Collapse near-duplicate resumes onto the first one in
+                input order; duplicates are recorded with duplicate_of and
+                left out of the leaderboard. Results then arrive in input
+                order.
+            on_start: Called with (pending, already_done) before scoring.
+            on_result: Called with each new result record.
+
+        Returns:
+            RankSummary with counts and the top_k results.
+        """
+        started = time.perf_counter()
+        jd_keywords = MatcherService.compile_jd(jd_text)
+        jd_hash = hashlib.sha256(jd_text.encode("utf-8")).hexdigest()[:16]
+        tasks = cls.discover(source)
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        if fresh:
+            output.unlink(missing_ok=True)
+            if csv_path:
+                Path(csv_path).unlink(missing_ok=True)
+
+        summary = RankSummary(total=len(tasks))
+        top: List = []
+        index = LSHIndex() if dedup else None
+        done = cls._load_checkpoint(output, jd_hash, top, top_k, index)
+        pending = [t for t in tasks if t.id not in done]
+        summary.skipped = len(tasks) - len(pending)
+        if on_start:
+            on_start(len(pending), summary.skipped)
+
+        workers = workers or os.cpu_count() or 1
+        with open(output, "a", encoding="utf-8") as jsonl, _open_csv(csv_path) as csv_writer:
+            for record in cls._score_all(pending, jd_keywords, workers, dedup):
+                record["jd"] = jd_hash
+                if index is not None and _collapse(index, record):
+                    summary.duplicates += 1
+                jsonl.write(json.dumps(record) + "\n")
+                jsonl.flush()
+                if csv_writer:
+                    csv_writer.writerow(_csv_row(record))
+
+                summary.processed += 1
+                if record.get("error"):
+                    summary.errors += 1
+                elif not record.get("duplicate_of"):
+                    _push(top, record, top_k)
+                if on_result:
+                    on_result(record)
+
+        summary.top = _sorted_top(top)
+        summary.elapsed_s = round(time.perf_counter() - started, 3)
+        return summary
+
+    @staticmethod
+    def _load_checkpoint(output: Path, jd_hash: str, top: List, top_k: int, index: Optional[LSHIndex]) -> Set[str]:
+        """Read finished ids from an earlier run and seed the leaderboard."""
+        done: Set[str] = set()
+        if not output.exists():
+            return done
+        with open(output, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line from an interrupted run
+                if record.get("jd") != jd_hash:
+                    raise ValueError(
+                        f"{output} holds results for a different job description. "
+                        "Use a new output file or --fresh."
+                    )
+                if record.get("error"):
+                    continue  # Retried by this run
+                done.add(record["id"])
+                if index is not None and not record.get("duplicate_of"):
+                    _collapse(index, record)
+                if not record.get("error") and not record.get("duplicate_of"):
+                    _push(top, record, top_k)
+        return done
+
+    @staticmethod
+    def _score_all(tasks: List[RankTask], jd_keywords: FrozenSet[str], workers: int, dedup: bool) -> Iterable[Dict[str, Any]]:
+        if not tasks:
+            return
+        if workers <= 1:
+            _init_worker(jd_keywords, dedup)
+            yield from map(_score, tasks)
+            return
+
+        # Small chunks keep the progress bar moving while amortising IPC
+        chunksize = max(1, min(16, len(tasks) // (workers * 8)))
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(jd_keywords, dedup)) as pool:
+            # Dedup keeps the first resume of a group, which must not depend on timing
+            imap = pool.imap if dedup else pool.imap_unordered
+            yield from imap(_score, tasks, chunksize=chunksize)
+
+
+# ============ Worker process state ============
+
+_jd_keywords: FrozenSet[str] = frozenset()
+_dedup = False
+_archives: Dict[str, zipfile.ZipFile] = {}
+
+
+def _init_worker(jd_keywords: FrozenSet[str], dedup: bool = False) -> None:
+    global _jd_keywords, _dedup
+    _jd_keywords = jd_keywords
+    _dedup = dedup
+
+
+def _score(task: RankTask) -> Dict[str, Any]:
+    """Parse and score one resume; failures are returned, not raised."""
+    try:
+        if task.member is not None:
+            archive = _archives.get(task.path)
+            if archive is None:
+                archive = _archives[task.path] = zipfile.ZipFile(task.path)
+            text = ParserService.extract_stream(io.BytesIO(archive.read(task.member)), task.ext)
+        else:
+            text = parse_resume(task.path)
+
+        result = MatcherService.match_keywords(
+            MatcherService.extract_keywords(text), _jd_keywords, recommendations=False
+        ).to_dict()
+        record = {
+            "id": task.id,
+            "overall_score": result["overall_score"],
+            "skill_score": result["skill_score"],
+            "matching_skills": result["matching_skills"],
+            "missing_skills": result["missing_skills"]
+        }
+        if _dedup:
+            # Signatures travel with the record so a resumed run can rebuild the index
+            signature = DedupService.signature(text)
+            if signature is not None:
+                record["minhash"] = base64.b64encode(signature.tobytes()).decode("ascii")
+        return record
+    except Exception as e:
+        return {"id": task.id, "error": str(e) or type(e).__name__}
+
+
+# ============ Helpers ============
+
+def _collapse(index: LSHIndex, record: Dict[str, Any]) -> bool:
+    """Mark record as a duplicate of an indexed resume, or index it. True if duplicate."""
+    signature = signature_from_bytes(base64.b64decode(record["minhash"])) if record.get("minhash") else None
+    if signature is None:
+        return False
+    duplicate_of = index.find(signature)
+    if duplicate_of:
+        record["duplicate_of"] = duplicate_of
+        return True
+    index.add(record["id"], signature)
+    return False
+
+
+def _push(top: List, record: Dict[str, Any], top_k: int) -> None:
+    """Keep the top_k highest scores in a min-heap."""
+    entry = (record["overall_score"], record["id"], record)
+    if len(top) < top_k:
+        heapq.heappush(top, entry)
+    elif entry[:2] > top[0][:2]:
+        heapq.heapreplace(top, entry)
+
+
+def _sorted_top(top: List) -> List[Dict[str, Any]]:
+    return [entry[2] for entry in sorted(top, key=lambda e: (-e[0], e[1]))]
+
+
+def _csv_row(record: Dict[str, Any]) -> Dict[str, Any]:
+    missing = record.get("missing_skills", [])
+    return {
+        "id": record["id"],
+        "overall_score": record.get("overall_score", ""),
+        "skill_score": record.get("skill_score", ""),
+        "matching": len(record.get("matching_skills", [])),
+        "missing": len(missing),
+        "top_missing": " ".join(missing[:5]),
+        "duplicate_of": record.get("duplicate_of", ""),
+        "error": record.get("error", "")
+    }
+
+
+@contextmanager
+def _open_csv(path: Optional[Path]) -> Iterator[Optional[csv.DictWriter]]:
+    """Yield a DictWriter appending to path (header only for new files), or None."""
+    if path is None:
+        yield None
+        return
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    new = not path.exists() or path.stat().st_size == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        if new:
+            writer.writeheader()
+        yield writer
+
+
+# Convenience function
+def rank_resumes(source: Path, jd_text: str, output: Path, **kwargs) -> RankSummary:
+    """Rank a directory or zip of resumes against a job description."""
+    return RankService.rank(source, jd_text, output, **kwargs)
@@ -10,31 +10,54 @@ import io
 import base64
 import json
 import re
-from pathlib import Path
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
-# PDF to Image
-try:
-    import fitz  # PyMuPDF
-except ImportError:
-    fitz = None
+# PyMuPDF, Pillow and the Gemini SDK (about a second to import) are loaded
+# on first use through the backend registry
+from app.core.backends import BACKENDS, backend, optional_backend
+from app.core.metrics import stage, timed
+from app.core.progress import report
 
-# Image processing
-try:
-    from PIL import Image
-except ImportError:
-    Image = None
+from .parser_service import Source, open_pdf
 
-# Google Gemini
-try:
-    import google.generativeai as genai
-except ImportError:
-    genai = None
+
+class _KeyGate:
+    """
+    Serializes use of genai's process-wide API key: calls with the
+    configured key run concurrently, a call with another key waits until
+    they finish, then reconfigures.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._key: Optional[str] = None
+        self._active = 0
+
+    @contextmanager
+    def using(self, genai, key: str) -> Iterator[None]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._active == 0 or self._key == key)
+            if self._key != key:
+                genai.configure(api_key=key)
+                self._key = key
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if self._active == 0:
+                    self._cond.notify_all()
 
 
 class SaliencyService:
     """Analyzes resume visual attention using AI."""
     
+    # Bump when the prompt, model or render settings change
+    VERSION = "1"
+    
     # Prompt for Gemini Vision
     ANALYSIS_PROMPT = """You are a recruiter analysis AI. Analyze this resume image and identify the regions that would catch a recruiter's attention during a 6-second initial scan.
 
@@ -70,50 +93,59 @@ Rules:
     @classmethod
     def is_available(cls) -> bool:
         """Check if all dependencies are available."""
-        return all([fitz, Image, genai])
+        return all(BACKENDS.available(name) for name in ("fitz", "pil", "genai"))
+    
+    _gate = _KeyGate()
     
     @classmethod
-    def configure_api(cls, api_key: Optional[str] = None) -> bool:
-        """Configure the Gemini API with the provided key."""
-        key = api_key or os.environ.get("GOOGLE_API_KEY")
-        if not key:
-            return False
+    def configure_api(cls, api_key: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve the Gemini API key (the caller's, else GOOGLE_API_KEY).
         
-        if genai:
-            genai.configure(api_key=key)
-            return True
-        return False
+        The key is applied per call in analyze_image(), under a gate, since
+        genai.configure() sets it for the whole process.
+        """
+        key = api_key or os.environ.get("GOOGLE_API_KEY")
+        if not key or not optional_backend("genai"):
+            return None
+        return key
     
     @classmethod
-    def pdf_to_image(cls, pdf_path: Path, page_num: int = 0, dpi: int = 150) -> Optional[bytes]:
-        """Convert a PDF page to PNG image bytes."""
-        if not fitz:
+    def pdf_to_image(cls, pdf_path: Source, page_num: int = 0, dpi: int = 150) -> Optional[bytes]:
+        """Convert a PDF page (from a path or binary stream) to PNG image bytes."""
+        if not BACKENDS.available("fitz"):
             raise ImportError("PyMuPDF (fitz) is required for PDF conversion")
         
         try:
-            doc = fitz.open(str(pdf_path))
-            page = doc[page_num]
-            
-            # Render at specified DPI
-            zoom = dpi / 72  # 72 is default PDF DPI
-            matrix = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=matrix)
-            
-            # Convert to PNG bytes
-            img_bytes = pix.tobytes("png")
-            doc.close()
-            
-            return img_bytes
+            doc = open_pdf(pdf_path)
+            try:
+                return cls.render_page(doc, page_num, dpi)
+            finally:
+                doc.close()
         except Exception as e:
             raise ValueError(f"Failed to convert PDF to image: {e}")
     
+    @classmethod
+    @timed("pdf_render")
+    def render_page(cls, doc, page_num: int = 0, dpi: int = 150) -> bytes:
+        """Render a page of an already-open PyMuPDF document to PNG bytes."""
+        page = doc[page_num]
+        
+        # Render at specified DPI
+        zoom = dpi / 72  # 72 is default PDF DPI
+        matrix = backend("fitz").Matrix(zoom, zoom)
+        pix = page.get_pixmap(matrix=matrix)
+        
+        # Convert to PNG bytes
+        return pix.tobytes("png")
+    
     @classmethod
     def image_to_base64(cls, image_bytes: bytes) -> str:
         """Convert image bytes to base64 string."""
         return base64.b64encode(image_bytes).decode("utf-8")
     
     @classmethod
-    def analyze_saliency(cls, pdf_path: Path, api_key: Optional[str] = None) -> dict:
+    def analyze_saliency(cls, pdf_path: Source, api_key: Optional[str] = None) -> dict:
         """
         Analyze a resume PDF for visual attention patterns.
         
@@ -125,32 +157,61 @@ Rules:
                 "summary": str
             }
         """
+        key = cls.check_ready(api_key)
+        
+        # Convert PDF to image
+        image_bytes = cls.pdf_to_image(pdf_path)
+        return cls.analyze_image(image_bytes, key)
+    
+    @classmethod
+    def check_ready(cls, api_key: Optional[str] = None) -> str:
+        """
+        Verify dependencies and resolve the Gemini API key.
+        
+        Returns:
+            The key to pass to analyze_image().
+        
+        Raises:
+            ImportError: If a required library is missing.
+            ValueError: If no API key is available.
+        """
         # Check dependencies
         if not cls.is_available():
             missing = []
-            if not fitz: missing.append("pymupdf")
-            if not Image: missing.append("Pillow")
-            if not genai: missing.append("google-generativeai")
+            if not BACKENDS.available("fitz"): missing.append("pymupdf")
+            if not BACKENDS.available("pil"): missing.append("Pillow")
+            if not BACKENDS.available("genai"): missing.append("google-generativeai")
             raise ImportError(f"Missing dependencies: {', '.join(missing)}")
         
-        # Configure API
-        if not cls.configure_api(api_key):
+        # Resolve the API key
+        key = cls.configure_api(api_key)
+        if not key:
             raise ValueError("GOOGLE_API_KEY not set. Get one at https://makersuite.google.com/app/apikey")
+        return key
+    
+    @classmethod
+    def analyze_image(cls, image_bytes: bytes, api_key: str) -> dict:
+        """
+        Run the Gemini attention analysis on a rendered resume page.
         
-        # Convert PDF to image
-        image_bytes = cls.pdf_to_image(pdf_path)
+        Expects api_key to come from check_ready().
+        """
         image_base64 = cls.image_to_base64(image_bytes)
+        report("rendered", {"image_base64": image_base64})
         
         # Create PIL Image for Gemini
-        pil_image = Image.open(io.BytesIO(image_bytes))
+        pil_image = backend("pil").open(io.BytesIO(image_bytes))
         
         # Call Gemini Vision API
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            response = model.generate_content([
-                cls.ANALYSIS_PROMPT,
-                pil_image
-            ])
+            genai = backend("genai")
+            # The key stays configured until the response is back
+            with cls._gate.using(genai, api_key), stage("gemini"):
+                model = genai.GenerativeModel("gemini-1.5-flash")
+                response = model.generate_content([
+                    cls.ANALYSIS_PROMPT,
+                    pil_image
+                ])
             
             # Parse the response
             response_text = response.text.strip()
@@ -164,12 +225,15 @@ Rules:
                 raise ValueError("Could not parse JSON from Gemini response")
             
             # Add the image to the result
-            result["image_base64"] = image_base64
             result["success"] = True
+            # The image was already sent with "rendered"
+            report("model-responded", dict(result))
+            result["image_base64"] = image_base64
             
             return result
             
         except Exception as e:
+            report("model-responded", {"success": False, "error": str(e)})
             # Return a fallback with error info
             return {
                 "success": False,
@@ -182,6 +246,6 @@ Rules:
 
 
 # Convenience function
-def analyze_resume_saliency(pdf_path: Path, api_key: Optional[str] = None) -> dict:
+def analyze_resume_saliency(pdf_path: Source, api_key: Optional[str] = None) -> dict:
     """Analyze a resume for visual attention patterns."""
     return SaliencyService.analyze_saliency(pdf_path, api_key)
@@ -0,0 +1,524 @@
+"""
+ResumeSense 2.0 - Shard Service
+Candidate index partitioned across shard processes (local or on other
+nodes). Each shard owns a resume store database and keeps the keyword
+profiles of its resumes in memory. A coordinator places resumes on shards
+by content hash with a consistent-hash ring, fans JD queries out to every
+shard and merges the per-shard top-k.
+
+Adding a shard moves only the resumes the ring now assigns to it
+(roughly 1/N of the pool); every other placement is unchanged.
+
+Connections are authenticated with a shared secret (SHARD_AUTHKEY, or
+one generated for a local cluster and kept in its cluster file); a shard
+refuses to listen beyond loopback without an explicit one.
+"""
+import bisect
+import hashlib
+import heapq
+import ipaddress
+import json
+import multiprocessing
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.core.config import (
+    DEDUP_NUM_PERM, DEDUP_THRESHOLD, SHARD_AUTHKEY, SHARD_BASE_PORT, SHARD_CLUSTER_FILE, SHARD_VNODES, SHARDS_DIR
+)
+from app.core.metrics import stage
+
+from .dedup_service import LSHIndex, signature_from_bytes
+from .matcher_service import MatcherService
+from .store_service import BATCH_SIZE, StoreService, StoredResume, hash_bytes
+
+Address = Tuple[str, int]
+
+# Files sent to a shard per ingest call
+INGEST_BATCH = 100
+
+PROFILE_FIELDS = ("filename", "keywords", "keywords_version", "duplicate_of")
+
+# Shortest SHARD_AUTHKEY accepted for a shard reachable from other hosts
+MIN_AUTHKEY_BYTES = 16
+
+
+class ShardError(Exception):
+    """A shard could not be reached or failed to handle a request."""
+
+
+class HashRing:
+    """Consistent-hash ring mapping content hashes to shard names."""
+
+    def __init__(self, names: Sequence[str], vnodes: int = SHARD_VNODES):
+        self.names = sorted(names)
+        self.vnodes = vnodes
+        points = sorted((_point(f"{name}#{i}"), name) for name in self.names for i in range(vnodes))
+        self._points = [p for p, _ in points]
+        self._owners = [name for _, name in points]
+
+    def owner(self, key: str) -> str:
+        if not self._points:
+            raise ShardError("No shards in the ring")
+        i = bisect.bisect(self._points, _point(key)) % len(self._points)
+        return self._owners[i]
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def parse_address(address: str) -> Address:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def format_address(address: Address) -> str:
+    return f"{address[0]}:{address[1]}"
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# ============ Shard (server side) ============
+
+class ShardIndex:
+    """One shard: a store database plus in-memory keyword profiles."""
+
+    # Operations a coordinator may invoke
+    OPERATIONS = ("ping", "ingest", "put", "query", "placement", "fetch", "drop", "stats")
+
+    def __init__(self, name: str, db_path: Path):
+        self.name = name
+        self.db_path = Path(db_path)
+        self.profiles: Dict[str, Tuple[str, FrozenSet[str]]] = {}
+        self.duplicate_of: Dict[str, str] = {}
+        self.duplicates: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+
+    def load(self) -> None:
+        """Read keyword profiles for every stored resume."""
+        with self._lock:
+            self.profiles.clear()
+            self.duplicate_of.clear()
+            self.duplicates.clear()
+            for record in StoreService.read_many(fields=PROFILE_FIELDS, db_path=self.db_path):
+                self._index(record)
+
+    def handle(self, operation: str, kwargs: Dict[str, Any]) -> Any:
+        if operation not in self.OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation}")
+        with self._lock:
+            return getattr(self, operation)(**kwargs)
+
+    def ping(self) -> str:
+        return self.name
+
+    def ingest(self, files: List[Tuple[str, bytes]]) -> Dict[str, Any]:
+        """Parse and store uploaded files, skipping content already held."""
+        records, errors, skipped = [], [], 0
+        with stage("shard_ingest"):
+            for filename, data in files:
+                content_hash = hash_bytes(data)
+                if content_hash in self.profiles or content_hash in self.duplicate_of:
+                    skipped += 1
+                    continue
+                try:
+                    records.append(StoreService.build(data, filename))
+                except Exception as e:
+                    errors.append({"filename": filename, "error": str(e) or type(e).__name__})
+        added = self.put(records)
+        return {"added": added, "skipped": skipped, "errors": errors}
+
+    def put(self, records: List[StoredResume]) -> int:
+        """Store already-built records (ingest, or a rebalance move)."""
+        added = StoreService.put_many(records, self.db_path)
+        for record in StoreService.read_many([r.hash for r in records], fields=PROFILE_FIELDS, db_path=self.db_path):
+            self._forget(record.hash)
+            self._index(record)
+        return added
+
+    def query(self, jd_keywords: FrozenSet[str], top_k: int) -> List[Dict[str, Any]]:
+        """This shard's top_k resumes for the JD keywords, best first."""
+        with stage("shard_query"):
+            # Overall score is matches / len(jd_keywords), so ranking by the
+            # overlap size is exact; full results are built for the winners only
+            best = heapq.nsmallest(
+                top_k,
+                ((-len(keywords & jd_keywords), filename, content_hash)
+                 for content_hash, (filename, keywords) in self.profiles.items())
+            )
+            # Signatures let the coordinator collapse near-duplicates held by other shards
+            signatures = {
+                record.hash: record.signature for record in StoreService.read_many(
+                    [content_hash for _, _, content_hash in best], fields=("signature",), db_path=self.db_path
+                )
+            }
+            rows = []
+            for _, filename, content_hash in best:
+                keywords = self.profiles[content_hash][1]
+                result = MatcherService.match_keywords(keywords, jd_keywords, recommendations=False)
+                signature = signatures.get(content_hash)
+                rows.append({
+                    "hash": content_hash,
+                    "filename": filename,
+                    "shard": self.name,
+                    **result.to_dict(),
+                    "duplicates": list(self.duplicates.get(content_hash, ())),
+                    "signature": signature.tobytes() if signature is not None else None
+                })
+        return rows
+
+    def placement(self, names: List[str], vnodes: int) -> List[str]:
+        """Hashes this shard holds that belong elsewhere on the given ring."""
+        ring = HashRing(names, vnodes)
+        held = list(self.profiles) + list(self.duplicate_of)
+        return [h for h in held if ring.owner(h) != self.name]
+
+    def fetch(self, hashes: List[str]) -> List[StoredResume]:
+        return list(StoreService.read_many(hashes, db_path=self.db_path))
+
+    def drop(self, hashes: List[str]) -> int:
+        """Delete records; duplicates of deleted resumes are re-indexed."""
+        dropped = set(hashes)
+        promoted = [d for h in hashes for d in self.duplicates.get(h, ())]
+        deleted = StoreService.delete_many(hashes, self.db_path)
+        for content_hash in hashes:
+            self._forget(content_hash)
+        survivors = [h for h in promoted if h not in dropped]
+        for record in StoreService.read_many(survivors, fields=PROFILE_FIELDS, db_path=self.db_path):
+            self._forget(record.hash)
+            self._index(record)
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "resumes": len(self.profiles) + len(self.duplicate_of),
+            "duplicates": len(self.duplicate_of),
+            "db_bytes": self.db_path.stat().st_size if self.db_path.exists() else 0
+        }
+
+    def _index(self, record: StoredResume) -> None:
+        keywords = record.keywords
+        if record.keywords_version != MatcherService.KEYWORDS_VERSION:
+            keywords = frozenset(MatcherService.extract_keywords(StoreService.get(record.hash, self.db_path).text))
+        if record.duplicate_of:
+            self.duplicate_of[record.hash] = record.duplicate_of
+            self.duplicates.setdefault(record.duplicate_of, []).append(record.hash)
+        else:
+            self.profiles[record.hash] = (record.filename, keywords)
+
+    def _forget(self, content_hash: str) -> None:
+        self.profiles.pop(content_hash, None)
+        canonical = self.duplicate_of.pop(content_hash, None)
+        if canonical is not None:
+            siblings = self.duplicates.get(canonical, [])
+            if content_hash in siblings:
+                siblings.remove(content_hash)
+            if not siblings:
+                self.duplicates.pop(canonical, None)
+
+
+def serve_shard(name: str, address: Address, db_path: Optional[Path] = None, authkey: Optional[bytes] = None) -> None:
+    """
+    Run a shard server until a coordinator sends shutdown.
+
+    Raises:
+        ShardError: If no secret is set, or the address is not loopback
+            and SHARD_AUTHKEY is missing or too short.
+    """
+    if not is_loopback(address[0]) and len(SHARD_AUTHKEY) < MIN_AUTHKEY_BYTES:
+        raise ShardError(
+            f"Refusing to listen on {address[0]}: set SHARD_AUTHKEY to a secret of at least "
+            f"{MIN_AUTHKEY_BYTES} bytes, shared with the coordinator"
+        )
+    authkey = authkey or SHARD_AUTHKEY
+    if not authkey:
+        raise ShardError("SHARD_AUTHKEY is not set")
+
+    shard = ShardIndex(name, db_path or SHARDS_DIR / f"{name}.db")
+    shard.load()
+    stopped = threading.Event()
+
+    with Listener(address, authkey=authkey) as listener:
+        while not stopped.is_set():
+            try:
+                conn = listener.accept()
+            except (OSError, multiprocessing.AuthenticationError):
+                continue
+            threading.Thread(
+                target=_serve_connection, args=(shard, conn, address, authkey, stopped), daemon=True
+            ).start()
+
+
+def _serve_connection(
+    shard: ShardIndex, conn: Connection, address: Address, authkey: bytes, stopped: threading.Event
+) -> None:
+    with conn:
+        while True:
+            try:
+                operation, kwargs = conn.recv()
+            except (EOFError, OSError):
+                return
+            if operation == "shutdown":
+                stopped.set()
+                conn.send(("ok", None))
+                # Wake the accept() loop so it sees the stop flag
+                try:
+                    Client(address, authkey=authkey).close()
+                except OSError:
+                    pass
+                return
+            try:
+                reply = ("ok", shard.handle(operation, kwargs))
+            except Exception as e:
+                reply = ("error", f"{type(e).__name__}: {e}")
+            conn.send(reply)
+
+
+# ============ Coordinator ============
+
+class ShardClient:
+    """Persistent connection to one shard."""
+
+    def __init__(self, name: str, address: Address, authkey: bytes):
+        self.name = name
+        self.address = address
+        self.authkey = authkey
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+
+    def call(self, operation: str, **kwargs: Any) -> Any:
+        with self._lock:
+            for attempt in range(2):
+                try:
+                    if self._conn is None:
+                        self._conn = Client(self.address, authkey=self.authkey)
+                    self._conn.send((operation, kwargs))
+                    status, value = self._conn.recv()
+                    break
+                except (EOFError, OSError) as e:
+                    self.close()
+                    if attempt:
+                        raise ShardError(f"Shard {self.name} at {format_address(self.address)} unreachable: {e}")
+        if status == "error":
+            raise ShardError(f"Shard {self.name}: {value}")
+        return value
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+class ShardCluster:
+    """Coordinator: placement, scatter-gather queries and rebalancing."""
+
+    def __init__(self, shards: Dict[str, str], vnodes: int = SHARD_VNODES, authkey: Optional[bytes] = None):
+        self.vnodes = vnodes
+        self.authkey = authkey or SHARD_AUTHKEY
+        if not self.authkey:
+            raise ShardError("SHARD_AUTHKEY is not set")
+        self.clients = {name: ShardClient(name, parse_address(addr), self.authkey) for name, addr in shards.items()}
+        self.ring = HashRing(list(self.clients), vnodes)
+        self._processes: List[multiprocessing.Process] = []
+
+    # ----- Cluster membership -----
+
+    @classmethod
+    def load(cls, path: Path = SHARD_CLUSTER_FILE) -> "ShardCluster":
+        if not Path(path).exists():
+            raise ShardError(f"No cluster file at {path}; start shards with `shard start`")
+        config = json.loads(Path(path).read_text())
+        authkey = SHARD_AUTHKEY or bytes.fromhex(config.get("authkey", ""))
+        return cls(config["shards"], config.get("vnodes", SHARD_VNODES), authkey)
+
+    def save(self, path: Path = SHARD_CLUSTER_FILE) -> None:
+        """Write the cluster file, readable by the owner only when it holds a generated secret."""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        shards = {name: format_address(client.address) for name, client in sorted(self.clients.items())}
+        config: Dict[str, Any] = {"shards": shards, "vnodes": self.vnodes}
+        if self.authkey != SHARD_AUTHKEY:
+            config["authkey"] = self.authkey.hex()
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(json.dumps(config, indent=2))
+
+    @classmethod
+    def start_local(
+        cls,
+        count: int,
+        base_port: int = SHARD_BASE_PORT,
+        shards_dir: Path = SHARDS_DIR,
+        timeout: float = 30.0
+    ) -> "ShardCluster":
+        """
+        Spawn count shard processes on localhost and wait until they answer.
+        Without SHARD_AUTHKEY they share a secret generated for this cluster.
+        """
+        shards_dir = Path(shards_dir)
+        shards_dir.mkdir(parents=True, exist_ok=True)
+        names = [f"shard-{i}" for i in range(count)]
+        cluster = cls(
+            {name: f"127.0.0.1:{base_port + i}" for i, name in enumerate(names)},
+            authkey=SHARD_AUTHKEY or secrets.token_bytes(32)
+        )
+        for name, client in cluster.clients.items():
+            process = multiprocessing.Process(
+                target=serve_shard, args=(name, client.address, shards_dir / f"{name}.db", cluster.authkey), name=name
+            )
+            process.start()
+            cluster._processes.append(process)
+        cluster.wait_ready(timeout)
+        return cluster
+
+    def wait_ready(self, timeout: float = 30.0) -> None:
+        deadline = time.monotonic() + timeout
+        for client in self.clients.values():
+            while True:
+                try:
+                    client.call("ping")
+                    break
+                except ShardError:
+                    if time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.1)
+
+    def shutdown(self) -> None:
+        """Stop shard processes started by this coordinator."""
+        for client in self.clients.values():
+            try:
+                client.call("shutdown")
+            except ShardError:
+                pass
+            client.close()
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
+
+    def add_shard(self, name: str, address: str) -> Dict[str, int]:
+        """
+        Join a running shard and move to it the resumes the new ring
+        assigns to it. Records are copied before they are dropped from
+        their old shard, so queries during the move never miss them.
+
+        Returns:
+            Resumes moved from each existing shard.
+        """
+        if name in self.clients:
+            raise ShardError(f"Shard already in cluster: {name}")
+        new_client = ShardClient(name, parse_address(address), self.authkey)
+        new_client.call("ping")
+        new_ring = HashRing(list(self.clients) + [name], self.vnodes)
+
+        moved: Dict[str, int] = {}
+        with stage("shard_rebalance"):
+            for old_name, client in self.clients.items():
+                hashes = client.call("placement", names=new_ring.names, vnodes=self.vnodes)
+                for start in range(0, len(hashes), BATCH_SIZE):
+                    batch = hashes[start:start + BATCH_SIZE]
+                    records = client.call("fetch", hashes=batch)
+                    targets: Dict[str, List[StoredResume]] = {}
+                    for record in records:
+                        targets.setdefault(new_ring.owner(record.hash), []).append(record)
+                    for target, group in targets.items():
+                        (new_client if target == name else self.clients[target]).call("put", records=group)
+                    client.call("drop", hashes=batch)
+                moved[old_name] = len(hashes)
+
+        self.clients[name] = new_client
+        self.ring = new_ring
+        return moved
+
+    # ----- Data -----
+
+    def add_files(self, paths: Sequence[Path]) -> Dict[str, Any]:
+        """Send files to their owning shards, which parse and store them."""
+        totals: Dict[str, Any] = {"added": 0, "skipped": 0, "errors": []}
+        paths = [Path(p) for p in paths]
+        with ThreadPoolExecutor(max(1, len(self.clients))) as executor:
+            for start in range(0, len(paths), INGEST_BATCH * len(self.clients)):
+                groups: Dict[str, List[Tuple[str, bytes]]] = {}
+                for path in paths[start:start + INGEST_BATCH * len(self.clients)]:
+                    data = path.read_bytes()
+                    groups.setdefault(self.ring.owner(hash_bytes(data)), []).append((path.name, data))
+                outcomes = executor.map(
+                    lambda item: self.clients[item[0]].call("ingest", files=item[1]), groups.items()
+                )
+                for outcome in outcomes:
+                    totals["added"] += outcome["added"]
+                    totals["skipped"] += outcome["skipped"]
+                    totals["errors"].extend(outcome["errors"])
+        return totals
+
+    def query(self, jd_text: str, top_k: int = 20) -> List[Dict[str, Any]]:
+        """
+        Score every shard's resumes against a JD in parallel and merge the
+        per-shard top-k lists into the global top-k.
+
+        Shards only collapse their own near-duplicates; the merge collapses
+        those that landed on different shards (the better-ranked one is
+        kept), asking the shards for more rows when that leaves fewer than
+        top_k. Ties are broken by filename and hash, as in a single store.
+        """
+        jd_keywords = MatcherService.compile_jd(jd_text)
+        fetch = top_k
+        while True:
+            with stage("shard_scatter_gather"), ThreadPoolExecutor(max(1, len(self.clients))) as executor:
+                partials = list(executor.map(
+                    lambda client: client.call("query", jd_keywords=jd_keywords, top_k=fetch),
+                    self.clients.values()
+                ))
+            rows = self._merge(partials, top_k)
+            # A shard that filled its list may hold more rows for the places duplicates took
+            if len(rows) == top_k or all(len(partial) < fetch for partial in partials):
+                return rows
+            fetch *= 2
+
+    @staticmethod
+    def _merge(partials: List[List[Dict[str, Any]]], top_k: int) -> List[Dict[str, Any]]:
+        """Global top_k of sorted per-shard lists, near-duplicates collapsed."""
+        index = LSHIndex(DEDUP_NUM_PERM, DEDUP_THRESHOLD)
+        kept: Dict[str, Dict[str, Any]] = {}
+        seen = set()
+        # Scores are matches / len(jd_keywords) on every shard, so the match
+        # count orders rows exactly where the rounded scores could tie
+        for row in heapq.merge(*partials, key=lambda r: (-len(r["matching_skills"]), r["filename"], r["hash"])):
+            # A resume mid-move may briefly appear on two shards
+            if row["hash"] in seen:
+                continue
+            seen.add(row["hash"])
+            signature = signature_from_bytes(row.pop("signature"))
+            canonical = index.find(signature)
+            if canonical is not None:
+                kept[canonical]["duplicates"].extend([row["hash"], *row["duplicates"]])
+                continue
+            if len(kept) == top_k:
+                continue
+            kept[row["hash"]] = row
+            if signature is not None:
+                index.add(row["hash"], signature)
+        return list(kept.values())
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [{**client.call("stats"), "address": format_address(client.address)} for client in self.clients.values()]
+
+
+# Convenience function
+def query_shards(jd_text: str, top_k: int = 20) -> List[Dict[str, Any]]:
+    """Query the cluster described by the cluster file."""
+    return ShardCluster.load().query(jd_text, top_k)
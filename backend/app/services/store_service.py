@@ -0,0 +1,553 @@
+"""
+ResumeSense 2.0 - Resume Store Service
+SQLite store of parsed resumes keyed by the SHA-256 of the original file.
+Holds compressed text, structured ResumeData, the matcher keyword set and
+the versions that produced them, so a pool can be re-scored or re-analyzed
+without touching the source documents again.
+"""
+import hashlib
+import io
+import json
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass, fields as dataclass_fields
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import DEDUP_NUM_PERM, DEDUP_THRESHOLD, RESUME_STORE_DB, STORE_COMPRESSION_LEVEL
+from app.core.metrics import stage
+
+from .parser_service import ParserService
+from .nlp_service import NLPService, ResumeData
+from .matcher_service import MatcherService, MatchResultSet
+from .dedup_service import DedupService, Signature, band_keys, choose_bands, signature_from_bytes, similarity
+from .analytics_service import Contribution, SkillAnalytics
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    hash TEXT PRIMARY KEY,
+    filename TEXT NOT NULL,
+    ext TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    text BLOB NOT NULL,
+    text_chars INTEGER NOT NULL,
+    resume_data BLOB NOT NULL,
+    keywords BLOB NOT NULL,
+    parser_version TEXT NOT NULL,
+    analyzer_version TEXT NOT NULL,
+    keywords_version TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    signature BLOB,
+    duplicate_of TEXT
+);
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (band, key, hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS lsh_buckets_hash ON lsh_buckets (hash);
+"""
+
+# Columns added after the first release of the store
+MIGRATIONS = {
+    "signature": "ALTER TABLE resumes ADD COLUMN signature BLOB",
+    "duplicate_of": "ALTER TABLE resumes ADD COLUMN duplicate_of TEXT"
+}
+
+# Columns that are stored zlib-compressed
+COMPRESSED = ("text", "resume_data", "keywords")
+
+# Stay well under SQLite's bound-parameter limit for IN (...) queries
+BATCH_SIZE = 500
+
+
+@dataclass(slots=True)
+class StoredResume:
+    """
+    A row of the resume store. Bulk reads only decode the requested
+    fields; the others are left as None.
+    """
+    hash: str
+    filename: Optional[str] = None
+    ext: Optional[str] = None
+    size: Optional[int] = None
+    text: Optional[str] = None
+    resume_data: Optional[ResumeData] = None
+    keywords: Optional[FrozenSet[str]] = None
+    parser_version: Optional[str] = None
+    analyzer_version: Optional[str] = None
+    keywords_version: Optional[str] = None
+    signature: Optional[Signature] = None
+    duplicate_of: Optional[str] = None
+
+    @property
+    def current(self) -> bool:
+        """True if every stored column was produced by the running code."""
+        return (
+            self.parser_version == ParserService.VERSION
+            and self.analyzer_version == NLPService.VERSION
+            and self.keywords_version == MatcherService.KEYWORDS_VERSION
+        )
+
+
+FIELDS = tuple(f.name for f in dataclass_fields(StoredResume))
+
+
+def hash_bytes(data: bytes) -> str:
+    """Content hash used as the store key."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class StoreService:
+    """Reads and writes the parsed-resume store."""
+
+    @classmethod
+    def connect(cls, db_path: Path = RESUME_STORE_DB) -> sqlite3.Connection:
+        """Open a connection to the store, creating it if needed."""
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        cls._migrate(conn)
+        SkillAnalytics.ensure_schema(conn)
+        SkillAnalytics.sync(conn, lambda: cls._contributions(conn))
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(resumes)")}
+        missing = [name for name in MIGRATIONS if name not in columns]
+        if not missing:
+            return
+        for name in missing:
+            conn.execute(MIGRATIONS[name])
+        # Mark rows stale so refresh() computes their signatures
+        conn.execute("UPDATE resumes SET analyzer_version = ''")
+
+    @staticmethod
+    def _contributions(conn: sqlite3.Connection, hashes: Optional[Sequence[str]] = None) -> Iterator[Contribution]:
+        """Analytics contributions of stored rows (all rows if hashes is None)."""
+        if hashes is None:
+            cursor = conn.execute("SELECT resume_data, keywords, created_at FROM resumes")
+        else:
+            placeholders = ", ".join("?" * len(hashes))
+            cursor = conn.execute(
+                f"SELECT resume_data, keywords, created_at FROM resumes WHERE hash IN ({placeholders})", list(hashes)
+            )
+        for row in cursor:
+            keywords = _unpack(row["keywords"])
+            yield Contribution(
+                skills=tuple(json.loads(_unpack(row["resume_data"]))["skills"]),
+                keywords=frozenset(keywords.split("\n")) if keywords else frozenset(),
+                created_at=row["created_at"]
+            )
+
+    @classmethod
+    def build(cls, data: bytes, filename: str, ext: Optional[str] = None) -> StoredResume:
+        """
+        Parse and analyze one document into a store record.
+
+        Args:
+            data: Original file bytes (hashed for the key).
+            filename: Original file name.
+            ext: File type; defaults to the filename's suffix.
+        """
+        ext = (ext or Path(filename).suffix).lower()
+        text = ParserService.extract_stream(io.BytesIO(data), ext)
+        return cls.from_text(hash_bytes(data), text, filename, ext, len(data))
+
+    @classmethod
+    def from_text(cls, content_hash: str, text: str, filename: str, ext: str, size: int) -> StoredResume:
+        """Build a record from already-extracted text."""
+        return StoredResume(
+            hash=content_hash,
+            filename=filename,
+            ext=ext,
+            size=size,
+            text=text,
+            resume_data=NLPService.extract(text),
+            keywords=frozenset(MatcherService.extract_keywords(text)),
+            signature=DedupService.signature(text),
+            parser_version=ParserService.VERSION,
+            analyzer_version=NLPService.VERSION,
+            keywords_version=MatcherService.KEYWORDS_VERSION
+        )
+
+    @classmethod
+    def put_many(cls, records: Iterable[StoredResume], db_path: Path = RESUME_STORE_DB) -> int:
+        """
+        Insert or replace records in a single transaction.
+
+        Returns:
+            Number of records written.
+        """
+        # Last write wins for a hash given twice (counted once in analytics)
+        records = list({r.hash: r for r in records}.values())
+        if not records:
+            return 0
+
+        now = time.time()
+        bands, rows = choose_bands(DEDUP_NUM_PERM, DEDUP_THRESHOLD)
+        conn = cls.connect(db_path)
+        try:
+            with stage("store_write"):
+                conn.execute("BEGIN IMMEDIATE")
+                # Replaced rows give back their old analytics contribution;
+                # they keep their created_at (and so their time bucket)
+                removed: List[Contribution] = []
+                created: Dict[str, float] = {}
+                for start in range(0, len(records), BATCH_SIZE):
+                    batch = [r.hash for r in records[start:start + BATCH_SIZE]]
+                    removed.extend(cls._contributions(conn, batch))
+                    created.update(
+                        (row["hash"], row["created_at"]) for row in conn.execute(
+                            f"SELECT hash, created_at FROM resumes WHERE hash IN ({', '.join('?' * len(batch))})", batch
+                        )
+                    )
+                added = []
+                for r in records:
+                    # Re-indexing a row must not match its own old buckets
+                    conn.execute("DELETE FROM lsh_buckets WHERE hash = ?", (r.hash,))
+                    r.duplicate_of = cls._find_duplicate(conn, r, bands, rows)
+                    conn.execute(
+                        "INSERT INTO resumes (hash, filename, ext, size, text, text_chars, resume_data, keywords, "
+                        "parser_version, analyzer_version, keywords_version, created_at, updated_at, "
+                        "signature, duplicate_of) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(hash) DO UPDATE SET "
+                        "filename = excluded.filename, ext = excluded.ext, size = excluded.size, "
+                        "text = excluded.text, text_chars = excluded.text_chars, "
+                        "resume_data = excluded.resume_data, keywords = excluded.keywords, "
+                        "parser_version = excluded.parser_version, analyzer_version = excluded.analyzer_version, "
+                        "keywords_version = excluded.keywords_version, updated_at = excluded.updated_at, "
+                        "signature = excluded.signature, duplicate_of = excluded.duplicate_of",
+                        (
+                            r.hash, r.filename, r.ext, r.size,
+                            _pack(r.text), len(r.text),
+                            _pack(json.dumps(r.resume_data.to_dict())),
+                            _pack("\n".join(sorted(r.keywords))),
+                            r.parser_version, r.analyzer_version, r.keywords_version,
+                            now, now,
+                            r.signature.tobytes() if r.signature is not None else None,
+                            r.duplicate_of
+                        )
+                    )
+                    # Only canonical resumes are indexed; duplicates resolve to them
+                    if r.duplicate_of is None and r.signature is not None:
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO lsh_buckets (band, key, hash) VALUES (?, ?, ?)",
+                            [(band, key, r.hash) for band, key in enumerate(band_keys(r.signature, bands, rows))]
+                        )
+                    added.append(Contribution(tuple(r.resume_data.skills), r.keywords, created.get(r.hash, now)))
+                with stage("analytics_update"):
+                    SkillAnalytics.apply(conn, added, removed)
+                conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return len(records)
+
+    @staticmethod
+    def _find_duplicate(conn: sqlite3.Connection, record: StoredResume, bands: int, rows: int) -> Optional[str]:
+        """Hash of the most similar indexed resume above DEDUP_THRESHOLD, if any."""
+        if record.signature is None:
+            return None
+        candidates = set()
+        for band, key in enumerate(band_keys(record.signature, bands, rows)):
+            candidates.update(
+                row["hash"] for row in conn.execute(
+                    "SELECT hash FROM lsh_buckets WHERE band = ? AND key = ?", (band, key)
+                )
+            )
+        candidates.discard(record.hash)
+        if not candidates:
+            return None
+
+        best, best_score = None, DEDUP_THRESHOLD
+        placeholders = ", ".join("?" * len(candidates))
+        for row in conn.execute(f"SELECT hash, signature FROM resumes WHERE hash IN ({placeholders})", list(candidates)):
+            score = similarity(record.signature, signature_from_bytes(row["signature"]))
+            if score >= best_score:
+                best, best_score = row["hash"], score
+        return best
+
+    @classmethod
+    def add_files(
+        cls,
+        paths: Sequence[Path],
+        db_path: Path = RESUME_STORE_DB,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Parse and store files, skipping content already stored by the
+        current parser version.
+
+        Returns:
+            Dict with added/skipped counts and per-file errors.
+        """
+        added = skipped = 0
+        errors: List[Dict[str, str]] = []
+        seen = set()
+        paths = [Path(p) for p in paths]
+
+        # Work in batches so a large pool is never held in memory at once
+        for start in range(0, len(paths), BATCH_SIZE):
+            blobs: List[Tuple[Path, bytes, str]] = []
+            for path in paths[start:start + BATCH_SIZE]:
+                data = path.read_bytes()
+                blobs.append((path, data, hash_bytes(data)))
+
+            fresh = set() if force else {
+                r.hash for r in cls.read_many([h for _, _, h in blobs], fields=("parser_version",), db_path=db_path)
+                if r.parser_version == ParserService.VERSION
+            }
+
+            records = []
+            for path, data, content_hash in blobs:
+                if content_hash in fresh or content_hash in seen:
+                    skipped += 1
+                    continue
+                seen.add(content_hash)
+                try:
+                    records.append(cls.build(data, path.name))
+                except Exception as e:
+                    errors.append({"filename": str(path), "error": str(e) or type(e).__name__})
+            added += cls.put_many(records, db_path)
+
+        return {"added": added, "skipped": skipped, "errors": errors}
+
+    @classmethod
+    def delete_many(cls, hashes: Sequence[str], db_path: Path = RESUME_STORE_DB) -> int:
+        """Remove records by hash. Returns the number of rows deleted."""
+        hashes = list(hashes)
+        if not hashes:
+            return 0
+        deleted = 0
+        conn = cls.connect(db_path)
+        try:
+            bands, rows = choose_bands(DEDUP_NUM_PERM, DEDUP_THRESHOLD)
+            conn.execute("BEGIN IMMEDIATE")
+            for start in range(0, len(hashes), BATCH_SIZE):
+                batch = hashes[start:start + BATCH_SIZE]
+                placeholders = ", ".join("?" * len(batch))
+                SkillAnalytics.apply(conn, (), list(cls._contributions(conn, batch)))
+                deleted += conn.execute(f"DELETE FROM resumes WHERE hash IN ({placeholders})", batch).rowcount
+                conn.execute(f"DELETE FROM lsh_buckets WHERE hash IN ({placeholders})", batch)
+
+                # Duplicates of a deleted resume are deduplicated again, oldest
+                # first: the first of a group is promoted and indexed, the rest
+                # (and any matching another canonical resume) point to it
+                orphans = conn.execute(
+                    f"SELECT hash, signature FROM resumes WHERE duplicate_of IN ({placeholders}) "
+                    "ORDER BY created_at, hash", batch
+                ).fetchall()
+                for row in orphans:
+                    orphan = StoredResume(hash=row["hash"], signature=signature_from_bytes(row["signature"]))
+                    orphan.duplicate_of = cls._find_duplicate(conn, orphan, bands, rows)
+                    conn.execute(
+                        "UPDATE resumes SET duplicate_of = ? WHERE hash = ?", (orphan.duplicate_of, orphan.hash)
+                    )
+                    if orphan.duplicate_of is None and orphan.signature is not None:
+                        keys = band_keys(orphan.signature, bands, rows)
+                        conn.executemany(
+                            "INSERT OR IGNORE INTO lsh_buckets (band, key, hash) VALUES (?, ?, ?)",
+                            [(band, key, orphan.hash) for band, key in enumerate(keys)]
+                        )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return deleted
+
+    @classmethod
+    def get(cls, content_hash: str, db_path: Path = RESUME_STORE_DB) -> Optional[StoredResume]:
+        """Return a fully decoded record, or None if the hash is unknown."""
+        return next(iter(cls.read_many([content_hash], db_path=db_path)), None)
+
+    @classmethod
+    def read_many(
+        cls,
+        hashes: Optional[Sequence[str]] = None,
+        fields: Sequence[str] = FIELDS,
+        db_path: Path = RESUME_STORE_DB
+    ) -> Iterator[StoredResume]:
+        """
+        Stream records, decoding only the requested fields.
+
+        Args:
+            hashes: Keys to read; None reads the whole store.
+            fields: StoredResume fields to load. Re-scoring only needs
+                ("filename", "keywords"), which skips the text and
+                ResumeData columns entirely.
+        """
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields: {sorted(unknown)}. Supported: {FIELDS}")
+        columns = ", ".join(dict.fromkeys(("hash",) + tuple(fields)))
+
+        conn = cls.connect(db_path)
+        try:
+            if hashes is None:
+                cursor = conn.execute(f"SELECT {columns} FROM resumes ORDER BY hash")
+                while True:
+                    rows = cursor.fetchmany(BATCH_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield _decode(row)
+            else:
+                hashes = list(hashes)
+                for start in range(0, len(hashes), BATCH_SIZE):
+                    batch = hashes[start:start + BATCH_SIZE]
+                    placeholders = ", ".join("?" * len(batch))
+                    for row in conn.execute(f"SELECT {columns} FROM resumes WHERE hash IN ({placeholders})", batch):
+                        yield _decode(row)
+        finally:
+            conn.close()
+
+    @classmethod
+    def rescore(
+        cls,
+        jd_text: str,
+        hashes: Optional[Sequence[str]] = None,
+        top_k: Optional[int] = None,
+        collapse: bool = True,
+        db_path: Path = RESUME_STORE_DB
+    ) -> List[Dict[str, Any]]:
+        """
+        Score stored resumes against a job description using only the
+        stored keyword sets.
+
+        Args:
+            collapse: Skip near-duplicates; each kept result lists the
+                hashes of its duplicates.
+
+        Returns:
+            Results sorted by overall_score, best first. Scores are held
+            columnar while sorting; only the returned rows become dicts.
+        """
+        jd_keywords = MatcherService.compile_jd(jd_text)
+        results = MatchResultSet()
+        filenames: List[str] = []
+        duplicates: Dict[str, List[str]] = {}
+        fields = ("filename", "keywords", "keywords_version", "duplicate_of")
+        with stage("store_rescore"):
+            for record in cls.read_many(hashes, fields=fields, db_path=db_path):
+                if collapse and record.duplicate_of:
+                    duplicates.setdefault(record.duplicate_of, []).append(record.hash)
+                    continue
+                keywords = record.keywords
+                if record.keywords_version != MatcherService.KEYWORDS_VERSION:
+                    keywords = MatcherService.extract_keywords(cls.get(record.hash, db_path).text)
+                results.append(record.hash, MatcherService.match_keywords(keywords, jd_keywords, recommendations=False))
+                filenames.append(record.filename)
+
+        order = sorted(range(len(results)), key=lambda i: (-results.overall[i], filenames[i], results.ids[i]))
+        rows = []
+        for i in order[:top_k] if top_k else order:
+            row = {"hash": results.ids[i], "filename": filenames[i], **results.result(i).to_dict()}
+            if collapse:
+                row["duplicates"] = duplicates.get(row["hash"], [])
+            rows.append(row)
+        return rows
+
+    @classmethod
+    def refresh(cls, db_path: Path = RESUME_STORE_DB) -> Dict[str, int]:
+        """
+        Rebuild ResumeData and keywords for rows written by an older
+        analyzer or keyword version, from the stored text.
+
+        Rows from an older parser version need the original file and are
+        only counted (re-add them with add_files).
+        """
+        stale, reparse = [], 0
+        versions = ("parser_version", "analyzer_version", "keywords_version")
+        for record in cls.read_many(fields=versions, db_path=db_path):
+            if record.parser_version != ParserService.VERSION:
+                reparse += 1
+            elif not record.current:
+                stale.append(record.hash)
+
+        refreshed = 0
+        for start in range(0, len(stale), BATCH_SIZE):
+            batch = cls.read_many(stale[start:start + BATCH_SIZE], fields=("filename", "ext", "size", "text"), db_path=db_path)
+            refreshed += cls.put_many(
+                [cls.from_text(r.hash, r.text, r.filename, r.ext, r.size) for r in batch],
+                db_path
+            )
+        return {"refreshed": refreshed, "needs_reparse": reparse}
+
+    @classmethod
+    def rebuild_analytics(cls, db_path: Path = RESUME_STORE_DB) -> None:
+        """Recompute the skill analytics from every stored row."""
+        conn = cls.connect(db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            SkillAnalytics.rebuild(conn, cls._contributions(conn))
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    @classmethod
+    def stats(cls, db_path: Path = RESUME_STORE_DB) -> Dict[str, Any]:
+        """Row count, stored vs. raw text size and stale-row count."""
+        conn = cls.connect(db_path)
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) AS n, COALESCE(SUM(size), 0) AS source_bytes, "
+                "COALESCE(SUM(text_chars), 0) AS text_chars, "
+                "COALESCE(SUM(LENGTH(text) + LENGTH(resume_data) + LENGTH(keywords)), 0) AS stored_bytes, "
+                "COALESCE(SUM(parser_version != ? OR analyzer_version != ? OR keywords_version != ?), 0) AS stale, "
+                "COALESCE(SUM(duplicate_of IS NOT NULL), 0) AS duplicates "
+                "FROM resumes",
+                (ParserService.VERSION, NLPService.VERSION, MatcherService.KEYWORDS_VERSION)
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            "resumes": row["n"],
+            "source_bytes": row["source_bytes"],
+            "text_chars": row["text_chars"],
+            "stored_bytes": row["stored_bytes"],
+            "stale": row["stale"],
+            "duplicates": row["duplicates"],
+            "db_bytes": Path(db_path).stat().st_size if Path(db_path).exists() else 0
+        }
+
+
+def _pack(value: str) -> bytes:
+    return zlib.compress(value.encode("utf-8"), STORE_COMPRESSION_LEVEL)
+
+
+def _unpack(value: bytes) -> str:
+    return zlib.decompress(value).decode("utf-8")
+
+
+def _decode(row: sqlite3.Row) -> StoredResume:
+    values: Dict[str, Any] = {}
+    for key in row.keys():
+        value = row[key]
+        if key in COMPRESSED:
+            value = _unpack(value)
+            if key == "resume_data":
+                value = ResumeData(**json.loads(value))
+            elif key == "keywords":
+                value = frozenset(value.split("\n")) if value else frozenset()
+        elif key == "signature":
+            value = signature_from_bytes(value)
+        values[key] = value
+    return StoredResume(**values)
+
+
+# Convenience functions
+def store_resumes(paths: Sequence[Path], force: bool = False) -> Dict[str, Any]:
+    """Parse and store resume files in the default store."""
+    return StoreService.add_files(paths, force=force)
+
+
+def rescore_stored(jd_text: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Score every stored resume against a job description."""
+    return StoreService.rescore(jd_text, top_k=top_k)
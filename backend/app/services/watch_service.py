@@ -0,0 +1,274 @@
+"""
+ResumeSense 2.0 - Watch Service
+Incremental indexing of a folder that receives resumes over time (e.g. an
+ATS export). Each scan compares the folder with a persisted mtime/size/hash
+snapshot and only parses new or changed content; deletions are removed
+from the resume store.
+"""
+import hashlib
+import multiprocessing
+import os
+import signal
+import stat
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import RESUME_STORE_DB, UPLOAD_CHUNK_SIZE, WATCH_INTERVAL, WATCH_SETTLE_SECONDS
+from app.core.metrics import stage
+
+from .parser_service import ParserService
+from .store_service import StoreService, StoredResume
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watched_files (
+    root TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (root, path)
+);
+CREATE INDEX IF NOT EXISTS watched_files_hash ON watched_files (hash);
+"""
+
+
+@dataclass
+class SyncResult:
+    """What one scan of the watched folder changed."""
+    added: int = 0
+    changed: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    settling: int = 0
+    parsed: int = 0
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.added or self.changed or self.deleted or self.errors)
+
+
+class WatchService:
+    """Keeps the resume store in sync with a folder."""
+
+    @classmethod
+    def connect(cls, db_path: Path = RESUME_STORE_DB):
+        """Open the store database with the snapshot table created."""
+        conn = StoreService.connect(db_path)
+        conn.executescript(SCHEMA)
+        return conn
+
+    @classmethod
+    def sync(
+        cls,
+        root: Path,
+        pool: Optional[Any] = None,
+        db_path: Path = RESUME_STORE_DB,
+        settle_seconds: float = WATCH_SETTLE_SECONDS
+    ) -> SyncResult:
+        """
+        Bring the store up to date with root.
+
+        Files whose mtime and size match the snapshot are skipped without
+        being read. Changed files are hashed first, so touched-but-identical
+        files and content already in the store are not parsed again. Files
+        that vanish mid-scan count as deleted; files that fail to read or
+        parse stay out of the snapshot, so the next scan retries them.
+
+        Args:
+            root: Folder to index (searched recursively).
+            pool: Optional multiprocessing pool used to parse the delta.
+            db_path: Store database holding the snapshot.
+            settle_seconds: Skip files modified more recently than this.
+        """
+        started = time.perf_counter()
+        root = Path(root).resolve()
+        key = str(root)
+        result = SyncResult()
+
+        conn = cls.connect(db_path)
+        try:
+            snapshot = {
+                row["path"]: row
+                for row in conn.execute(
+                    "SELECT path, mtime_ns, size, hash FROM watched_files WHERE root = ?", (key,)
+                )
+            }
+        finally:
+            conn.close()
+
+        # 1. Stat pass: find candidates without reading file contents
+        seen = set()
+        candidates: List[Tuple[str, os.stat_result]] = []
+        now = time.time()
+        for path in _walk(root):
+            if path.suffix.lower() not in ParserService.SUPPORTED_EXTENSIONS:
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # Deleted or renamed since it was listed
+            if not stat.S_ISREG(st.st_mode):
+                continue
+            rel = str(path.relative_to(root))
+            seen.add(rel)
+            previous = snapshot.get(rel)
+            if previous is not None and (previous["mtime_ns"], previous["size"]) == (st.st_mtime_ns, st.st_size):
+                result.unchanged += 1
+            elif now - st.st_mtime < settle_seconds:
+                result.settling += 1
+            else:
+                candidates.append((rel, st))
+
+        # 2. Hash pass: only changed content needs parsing
+        hashed: List[Tuple[str, os.stat_result, str]] = []
+        with stage("watch_hash"):
+            for rel, st in candidates:
+                try:
+                    hashed.append((rel, st, _hash_file(root / rel)))
+                except FileNotFoundError:
+                    seen.discard(rel)
+                except OSError:
+                    # Unreadable for now (e.g. still locked by the writer)
+                    result.settling += 1
+
+        deleted = [rel for rel in snapshot if rel not in seen]
+        stored = {
+            r.hash for r in StoreService.read_many(
+                list({h for _, _, h in hashed}), fields=("parser_version",), db_path=db_path
+            )
+            if r.parser_version == ParserService.VERSION
+        }
+        to_parse: Dict[str, str] = {}
+        for rel, _, content_hash in hashed:
+            if content_hash not in stored and content_hash not in to_parse:
+                to_parse[content_hash] = str(root / rel)
+
+        # 3. Parse the delta
+        errors: Dict[str, str] = {}
+        records: List[StoredResume] = []
+        with stage("watch_parse"):
+            jobs = list(to_parse.values())
+            outcomes = pool.imap_unordered(_build, jobs) if pool is not None and len(jobs) > 1 else map(_build, jobs)
+            for path, record, error in outcomes:
+                if record is not None:
+                    records.append(record)
+                else:
+                    errors[path] = error
+        StoreService.put_many(records, db_path)
+        result.parsed = len(records)
+
+        # 4. Record the new snapshot and drop deletions
+        timestamp = time.time()
+        old_hashes = {snapshot[rel]["hash"] for rel in deleted}
+        conn = cls.connect(db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for rel, st, content_hash in hashed:
+                error = errors.get(to_parse.get(content_hash, ""))
+                if error:
+                    # Left out of the snapshot: retried on the next scan
+                    result.errors.append({"filename": rel, "error": error})
+                    continue
+                previous = snapshot.get(rel)
+                if previous is None:
+                    result.added += 1
+                elif previous["hash"] != content_hash:
+                    result.changed += 1
+                    old_hashes.add(previous["hash"])
+                conn.execute(
+                    "INSERT OR REPLACE INTO watched_files (root, path, mtime_ns, size, hash, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, rel, st.st_mtime_ns, st.st_size, content_hash, timestamp)
+                )
+            if deleted:
+                conn.executemany("DELETE FROM watched_files WHERE root = ? AND path = ?", [(key, rel) for rel in deleted])
+            result.deleted = len(deleted)
+
+            # Content no longer referenced by any watched file leaves the store
+            orphans = [
+                h for h in old_hashes
+                if conn.execute("SELECT 1 FROM watched_files WHERE hash = ? LIMIT 1", (h,)).fetchone() is None
+            ]
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        StoreService.delete_many(orphans, db_path)
+
+        result.elapsed_s = round(time.perf_counter() - started, 3)
+        return result
+
+    @classmethod
+    def watch(
+        cls,
+        root: Path,
+        workers: Optional[int] = None,
+        interval: float = WATCH_INTERVAL,
+        db_path: Path = RESUME_STORE_DB,
+        on_sync: Optional[Callable[[SyncResult], None]] = None,
+        stop_event: Optional[threading.Event] = None
+    ) -> None:
+        """
+        Sync root every interval seconds until stop_event is set (or the
+        process is interrupted). The first scan after a restart only reads
+        files that changed while the watcher was down.
+        """
+        root = Path(root)
+        if not root.is_dir():
+            raise ValueError(f"Not a directory: {root}")
+        stop_event = stop_event or threading.Event()
+        workers = workers or os.cpu_count() or 1
+
+        # One pool for the lifetime of the watcher; workers stay warm between scans
+        pool = multiprocessing.Pool(workers, initializer=_ignore_sigint) if workers > 1 else None
+        try:
+            while not stop_event.is_set():
+                result = cls.sync(root, pool=pool, db_path=db_path)
+                if on_sync:
+                    on_sync(result)
+                stop_event.wait(interval)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+
+def _ignore_sigint() -> None:
+    # Ctrl+C is handled by the watcher, which terminates the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _walk(root: Path) -> Iterator[Path]:
+    """Every file under root; directories removed mid-walk are skipped."""
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            yield Path(directory, filename)
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _build(path: str) -> Tuple[str, Optional[StoredResume], Optional[str]]:
+    """Parse one file in a worker; failures are returned, not raised."""
+    try:
+        return path, StoreService.build(Path(path).read_bytes(), Path(path).name), None
+    except Exception as e:
+        return path, None, str(e) or type(e).__name__
+
+
+# Convenience function
+def sync_folder(root: Path, db_path: Path = RESUME_STORE_DB) -> SyncResult:
+    """Run a single incremental scan of a folder."""
+    return WatchService.sync(root, db_path=db_path)
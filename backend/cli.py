@@ -7,8 +7,21 @@ Usage:
     python cli.py parse resume.pdf
     python cli.py analyze resume.pdf
     python cli.py match resume.pdf --jd "job description text or file"
+    python cli.py analyze resume.pdf --profile
+    python cli.py rank ./applications --jd jd.txt --top 25 --csv ranked.csv --dedup
+    python cli.py store add ./applications
+    python cli.py store rescore --jd jd.txt --top 25
+    python cli.py analytics top --bucket current && python cli.py analytics rare --jd jd.txt
+    python cli.py shard start -n 4
+    python cli.py shard add ./applications && python cli.py shard query --jd jd.txt
+    python cli.py watch /srv/ats-export --interval 10
+    python cli.py golden snapshot && python cli.py golden diff --fail-on-change
+    python cli.py bench --seed 42 --concurrency 1,4 --baseline data/bench/baseline.json
 """
+import functools
 import sys
+import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 
 # Add parent to path for imports
@@ -24,19 +37,67 @@ from rich import print as rprint
 from app.services.parser_service import parse_resume
 from app.services.nlp_service import analyze_resume
 from app.services.matcher_service import match_resume_to_jd
+from app.core.config import APP_VERSION, DATA_DIR
+from app.core.profiling import profile_run
 
 app = typer.Typer(
     name="resumesense",
     help="ResumeSense 2.0 - AI-Powered Resume Parser & Analytics",
     add_completion=False
 )
+store_app = typer.Typer(help="Persistent store of parsed resumes (re-score without re-parsing)")
+app.add_typer(store_app, name="store")
+shard_app = typer.Typer(help="Candidate index sharded across processes (scatter-gather top-k)")
+app.add_typer(shard_app, name="shard")
+golden_app = typer.Typer(help="Golden-corpus snapshots for validating engine changes")
+app.add_typer(golden_app, name="golden")
+analytics_app = typer.Typer(help="Pool-wide skill statistics over the resume store")
+app.add_typer(analytics_app, name="analytics")
 console = Console()
+err_console = Console(stderr=True)
+
+PROFILE_OPTION = typer.Option(
+    False, "--profile",
+    help="Profile with cProfile; saves the profile and a hot-function summary under data/profiles"
+)
+
+
+@contextmanager
+def profiling(enabled: bool, label: str):
+    """Profile the enclosed command when --profile is given."""
+    if not enabled:
+        yield
+        return
+    
+    result = None
+    try:
+        with profile_run(label) as result:
+            yield
+    finally:
+        if result is not None:
+            # stderr keeps --json / --output stdout clean
+            err_console.print()
+            err_console.print(result.summary, markup=False, highlight=False, soft_wrap=True)
+            err_console.print(f"[cyan]Profile saved:[/cyan] {result.data_path}", soft_wrap=True)
+
+
+def profiled(name: str, target: str):
+    """Run a command with a --profile option under profiling(), labelled name-<target file name>."""
+    def decorator(command):
+        @functools.wraps(command)
+        def wrapper(*args, **kwargs):
+            with profiling(kwargs.get("profile", False), f"{name}-{Path(kwargs[target]).name}"):
+                return command(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 @app.command()
+@profiled("parse", "file")
 def parse(
     file: Path = typer.Argument(..., help="Path to resume file (PDF, DOCX, TXT)"),
-    output: bool = typer.Option(False, "--output", "-o", help="Output raw text only")
+    output: bool = typer.Option(False, "--output", "-o", help="Output raw text only"),
+    profile: bool = PROFILE_OPTION
 ):
     """Extract raw text from a resume file."""
     try:
@@ -61,9 +122,11 @@ def parse(
 
 
 @app.command()
+@profiled("analyze", "file")
 def analyze(
     file: Path = typer.Argument(..., help="Path to resume file"),
-    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON")
+    json_output: bool = typer.Option(False, "--json", "-j", help="Output as JSON"),
+    profile: bool = PROFILE_OPTION
 ):
     """Analyze a resume and extract structured information."""
     try:
@@ -108,9 +171,11 @@ def analyze(
 
 
 @app.command()
+@profiled("match", "resume")
 def match(
     resume: Path = typer.Argument(..., help="Path to resume file"),
-    jd: str = typer.Option(..., "--jd", help="Job description text or path to file")
+    jd: str = typer.Option(..., "--jd", help="Job description text or path to file"),
+    profile: bool = PROFILE_OPTION
 ):
     """Match a resume against a job description."""
     try:
@@ -165,10 +230,666 @@ def match(
         raise typer.Exit(1)
 
 
+@app.command()
+@profiled("rank", "source")
+def rank(
+    source: Path = typer.Argument(..., help="Directory or zip archive of resumes"),
+    jd: str = typer.Option(..., "--jd", help="Job description text or path to file"),
+    top: int = typer.Option(20, "--top", "-k", help="Number of top candidates to show"),
+    workers: int = typer.Option(None, "--workers", "-w", help="Worker processes (default: CPU count)"),
+    output: Path = typer.Option(None, "--output", "-o", help="JSONL results/checkpoint file"),
+    csv_path: Path = typer.Option(None, "--csv", help="Also write results as CSV"),
+    fresh: bool = typer.Option(False, "--fresh", help="Ignore an existing checkpoint and start over"),
+    dedup: bool = typer.Option(False, "--dedup", help="Collapse near-duplicate resumes (MinHash/LSH)"),
+    profile: bool = PROFILE_OPTION
+):
+    """Rank every resume in a directory or zip against a job description."""
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+    from app.services.rank_service import rank_resumes
+    
+    try:
+        jd_text = jd
+        jd_path = Path(jd)
+        if jd_path.exists():
+            jd_text = jd_path.read_text()
+        
+        output = output or DATA_DIR / "rank" / f"{source.stem}.jsonl"
+        
+        with Progress(
+            TextColumn("[cyan]Ranking[/cyan]"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TextColumn("[red]{task.fields[errors]} errors[/red]"),
+            TimeRemainingColumn(),
+            console=console
+        ) as progress:
+            bar = progress.add_task("rank", total=None, errors=0)
+            errors = 0
+            
+            def on_start(pending: int, skipped: int):
+                if skipped:
+                    progress.console.print(f"[dim]Resuming: {skipped} files already scored in {output}[/dim]")
+                progress.update(bar, total=pending)
+            
+            def on_result(record: dict):
+                nonlocal errors
+                errors += bool(record.get("error"))
+                progress.update(bar, advance=1, errors=errors)
+            
+            summary = rank_resumes(
+                source, jd_text, output,
+                csv_path=csv_path, workers=workers, top_k=top, fresh=fresh, dedup=dedup,
+                on_start=on_start, on_result=on_result
+            )
+        
+        unique = summary.total - summary.errors - summary.duplicates
+        table = Table(title=f"Top {len(summary.top)} of {unique}", show_header=True)
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Resume", style="cyan")
+        table.add_column("Score", justify="right")
+        table.add_column("Matching", justify="right")
+        table.add_column("Top missing")
+        for i, record in enumerate(summary.top, 1):
+            score = record["overall_score"]
+            color = "green" if score >= 70 else "yellow" if score >= 40 else "red"
+            table.add_row(
+                str(i),
+                record["id"],
+                f"[{color}]{score}%[/{color}]",
+                str(len(record["matching_skills"])),
+                ", ".join(record["missing_skills"][:5])
+            )
+        console.print(table)
+        
+        console.print(
+            f"[dim]{summary.processed} scored, {summary.skipped} from checkpoint, "
+            + (f"{summary.duplicates} near-duplicates collapsed, " if dedup else "")
+            + f"{summary.errors} errors in {summary.elapsed_s:.1f}s. Results: {output}"
+            + (f", {csv_path}" if csv_path else "") + "[/dim]"
+        )
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+def _collect_resumes(paths: list[Path]) -> list[Path]:
+    """Expand directories into the supported resume files they contain."""
+    from app.services.parser_service import ParserService
+    
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                p for p in sorted(path.rglob("*"))
+                if p.is_file() and p.suffix.lower() in ParserService.SUPPORTED_EXTENSIONS
+            )
+        else:
+            files.append(path)
+    return files
+
+
+@store_app.command("add")
+def store_add(
+    paths: list[Path] = typer.Argument(..., help="Resume files or directories"),
+    force: bool = typer.Option(False, "--force", help="Re-parse files that are already stored")
+):
+    """Parse resumes once and keep text, ResumeData and keywords in the store."""
+    from app.services.store_service import store_resumes
+    
+    try:
+        files = _collect_resumes(paths)
+        
+        with console.status(f"[cyan]Storing {len(files)} files...[/cyan]"):
+            outcome = store_resumes(files, force=force)
+        
+        for error in outcome["errors"]:
+            console.print(f"[red]{error['filename']}: {error['error']}[/red]")
+        console.print(
+            f"[green]{outcome['added']} stored[/green], {outcome['skipped']} already stored, "
+            f"{len(outcome['errors'])} errors"
+        )
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@store_app.command("rescore")
+def store_rescore(
+    jd: str = typer.Option(..., "--jd", help="Job description text or path to file"),
+    top: int = typer.Option(20, "--top", "-k", help="Number of results to show"),
+    output_json: bool = typer.Option(False, "--json", "-j", help="Output all results as JSON")
+):
+    """Score every stored resume against a job description without re-parsing."""
+    import json
+    from app.services.store_service import rescore_stored
+    
+    try:
+        jd_text = jd
+        jd_path = Path(jd)
+        if jd_path.exists():
+            jd_text = jd_path.read_text()
+        
+        results = rescore_stored(jd_text, top_k=None if output_json else top)
+        
+        if output_json:
+            console.print_json(json.dumps(results))
+            return
+        
+        table = Table(title=f"Top {len(results)} stored resumes", show_header=True)
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Resume", style="cyan")
+        table.add_column("Score", justify="right")
+        table.add_column("Duplicates", justify="right")
+        table.add_column("Hash", style="dim")
+        for i, result in enumerate(results, 1):
+            table.add_row(
+                str(i), result["filename"], f"{result['overall_score']}%",
+                str(len(result["duplicates"])), result["hash"][:12]
+            )
+        console.print(table)
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@store_app.command("refresh")
+def store_refresh():
+    """Rebuild stored ResumeData/keywords after analyzer or matcher changes."""
+    from app.services.store_service import StoreService
+    
+    outcome = StoreService.refresh()
+    console.print(f"[green]{outcome['refreshed']} refreshed[/green] from stored text")
+    if outcome["needs_reparse"]:
+        console.print(
+            f"[yellow]{outcome['needs_reparse']} rows come from an older parser; "
+            "re-add the original files with `store add --force`[/yellow]"
+        )
+
+
+@store_app.command("stats")
+def store_stats():
+    """Show store size and compression."""
+    from app.services.store_service import StoreService
+    
+    stats = StoreService.stats()
+    table = Table(show_header=False)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Resumes", str(stats["resumes"]))
+    table.add_row("Stale rows", str(stats["stale"]))
+    table.add_row("Near-duplicates", str(stats["duplicates"]))
+    table.add_row("Source files", f"{stats['source_bytes'] / 1024:.1f} KB")
+    table.add_row("Extracted text", f"{stats['text_chars'] / 1024:.1f} K chars")
+    table.add_row("Stored (compressed)", f"{stats['stored_bytes'] / 1024:.1f} KB")
+    table.add_row("Database file", f"{stats['db_bytes'] / 1024:.1f} KB")
+    console.print(table)
+
+
+@shard_app.command("start")
+def shard_start(
+    count: int = typer.Option(4, "--count", "-n", help="Number of local shard processes"),
+    port: int = typer.Option(None, "--port", help="Port of the first shard (default: SHARD_BASE_PORT)")
+):
+    """Run N local shard processes until Ctrl+C and write the cluster file."""
+    import time
+    from app.core.config import SHARD_BASE_PORT, SHARD_CLUSTER_FILE
+    from app.services.shard_service import ShardCluster
+    
+    cluster = None
+    try:
+        with console.status(f"[cyan]Starting {count} shards...[/cyan]"):
+            cluster = ShardCluster.start_local(count, base_port=port or SHARD_BASE_PORT)
+            cluster.save()
+        for row in cluster.stats():
+            console.print(f"[green]{row['name']}[/green] {row['address']} ({row['resumes']} resumes)")
+        console.print(f"[dim]Cluster file: {SHARD_CLUSTER_FILE} (Ctrl+C to stop)[/dim]")
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        console.print("[dim]Stopping shards[/dim]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    finally:
+        if cluster is not None:
+            cluster.shutdown()
+
+
+@shard_app.command("serve")
+def shard_serve(
+    name: str = typer.Argument(..., help="Shard name, unique in the cluster"),
+    port: int = typer.Option(..., "--port", help="Port to listen on"),
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on")
+):
+    """
+    Run a single shard in the foreground (e.g. on another node); add it with `shard join`.
+    
+    The shard and the coordinator must share SHARD_AUTHKEY (required beyond loopback).
+    """
+    from app.services.shard_service import serve_shard
+    
+    console.print(f"[cyan]Shard {name} listening on {host}:{port}[/cyan]")
+    try:
+        serve_shard(name, (host, port))
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped[/dim]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@shard_app.command("join")
+def shard_join(
+    name: str = typer.Argument(..., help="Name the shard was started with"),
+    address: str = typer.Argument(..., help="host:port of the running shard")
+):
+    """Add a running shard to the cluster and move its share of resumes to it."""
+    from app.services.shard_service import ShardCluster
+    
+    try:
+        cluster = ShardCluster.load()
+        with console.status(f"[cyan]Rebalancing onto {name}...[/cyan]"):
+            moved = cluster.add_shard(name, address)
+        cluster.save()
+        for source, count in moved.items():
+            console.print(f"{source} -> {name}: {count} resumes")
+        console.print(f"[green]{sum(moved.values())} resumes moved[/green]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@shard_app.command("add")
+def shard_add(paths: list[Path] = typer.Argument(..., help="Resume files or directories")):
+    """Place resumes on their shards, which parse and index them in parallel."""
+    from app.services.shard_service import ShardCluster
+    
+    try:
+        files = _collect_resumes(paths)
+        cluster = ShardCluster.load()
+        with console.status(f"[cyan]Indexing {len(files)} files on {len(cluster.clients)} shards...[/cyan]"):
+            outcome = cluster.add_files(files)
+        for error in outcome["errors"]:
+            console.print(f"[red]{error['filename']}: {error['error']}[/red]")
+        console.print(
+            f"[green]{outcome['added']} indexed[/green], {outcome['skipped']} already indexed, "
+            f"{len(outcome['errors'])} errors"
+        )
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@shard_app.command("query")
+def shard_query(
+    jd: str = typer.Option(..., "--jd", help="Job description text or path to file"),
+    top: int = typer.Option(20, "--top", "-k", help="Number of results"),
+    output_json: bool = typer.Option(False, "--json", "-j", help="Output results as JSON")
+):
+    """Top-k resumes across all shards for a job description."""
+    import json
+    from app.services.shard_service import query_shards
+    
+    try:
+        jd_text = jd
+        jd_path = Path(jd)
+        if jd_path.exists():
+            jd_text = jd_path.read_text()
+        
+        results = query_shards(jd_text, top_k=top)
+        
+        if output_json:
+            console.print_json(json.dumps(results))
+            return
+        
+        table = Table(title=f"Top {len(results)} resumes", show_header=True)
+        table.add_column("#", justify="right", style="dim")
+        table.add_column("Resume", style="cyan")
+        table.add_column("Score", justify="right")
+        table.add_column("Shard", style="dim")
+        table.add_column("Hash", style="dim")
+        for i, result in enumerate(results, 1):
+            table.add_row(str(i), result["filename"], f"{result['overall_score']}%", result["shard"], result["hash"][:12])
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@shard_app.command("stats")
+def shard_stats():
+    """Show resumes held by each shard."""
+    from app.services.shard_service import ShardCluster
+    
+    try:
+        table = Table(show_header=True)
+        table.add_column("Shard", style="cyan")
+        table.add_column("Address")
+        table.add_column("Resumes", justify="right")
+        table.add_column("Near-duplicates", justify="right")
+        table.add_column("Database", justify="right")
+        for row in ShardCluster.load().stats():
+            table.add_row(
+                row["name"], row["address"], str(row["resumes"]), str(row["duplicates"]), f"{row['db_bytes'] / 1024:.1f} KB"
+            )
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@analytics_app.command("top")
+def analytics_top(
+    limit: int = typer.Option(20, "--limit", "-n", help="Number of skills"),
+    bucket: str = typer.Option(None, "--bucket", "-b", help="Time bucket label, or 'current' (default: whole pool)")
+):
+    """Most common skills across stored resumes."""
+    from app.services.analytics_service import top_skills
+    
+    try:
+        result = top_skills(limit, bucket)
+        title = f"Top skills in {result['bucket']}" if result["bucket"] else "Top skills"
+        table = Table(title=f"{title} ({result['resumes']} resumes)", show_header=True)
+        table.add_column("Skill", style="cyan")
+        table.add_column("Resumes", justify="right")
+        table.add_column("Share", justify="right")
+        for row in result["skills"]:
+            table.add_row(row["skill"], str(row["count"]), f"{row['share'] * 100:.1f}%")
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@analytics_app.command("related")
+def analytics_related(
+    skill: str = typer.Argument(..., help="Skill, e.g. python"),
+    limit: int = typer.Option(10, "--limit", "-n", help="Number of related skills")
+):
+    """Skills most often listed together with a skill."""
+    from app.services.analytics_service import related_skills
+    
+    try:
+        result = related_skills(skill, limit)
+        table = Table(title=f"Listed with {result['skill']} ({result['count']} resumes)", show_header=True)
+        table.add_column("Skill", style="cyan")
+        table.add_column("Together", justify="right")
+        table.add_column("Confidence", justify="right")
+        table.add_column("Lift", justify="right")
+        for row in result["related"]:
+            table.add_row(row["skill"], str(row["count"]), f"{row['confidence'] * 100:.1f}%", f"{row['lift']:.2f}")
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@analytics_app.command("rare")
+def analytics_rare(
+    jd: str = typer.Option(..., "--jd", help="Job description text or path to file"),
+    resume: Path = typer.Option(None, "--resume", "-r", help="Only the keywords this resume is missing")
+):
+    """How common a job description's keywords are across the pool, rarest first."""
+    from app.services.analytics_service import term_rarity
+    from app.services.matcher_service import MatcherService
+    
+    try:
+        jd_text = jd
+        jd_path = Path(jd)
+        if jd_path.exists():
+            jd_text = jd_path.read_text()
+        
+        if resume:
+            terms = match_resume_to_jd(parse_resume(resume), jd_text)["missing_skills"]
+        else:
+            terms = sorted(MatcherService.compile_jd(jd_text))
+        result = term_rarity(terms)
+        
+        title = f"Keyword rarity ({result['resumes']} resumes"
+        if result["approximate"]:
+            title += f", counts may be up to {result['error_bound']} high"
+        table = Table(title=title + ")", show_header=True)
+        table.add_column("Keyword", style="cyan")
+        table.add_column("Resumes", justify="right")
+        table.add_column("Share", justify="right")
+        table.add_column("Rare", justify="center")
+        for row in result["terms"]:
+            table.add_row(row["term"], str(row["count"]), f"{row['share'] * 100:.1f}%", "[yellow]yes[/yellow]" if row["rare"] else "")
+        console.print(table)
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@analytics_app.command("rebuild")
+def analytics_rebuild():
+    """Recompute the analytics from every stored resume."""
+    from app.services.store_service import StoreService
+    from app.services.analytics_service import analytics_summary
+    
+    StoreService.rebuild_analytics()
+    summary = analytics_summary()
+    console.print(f"[green]Rebuilt[/green] from {summary['resumes']} resumes ({summary['mode']} mode)")
+
+
+@app.command()
+def watch(
+    folder: Path = typer.Argument(..., help="Folder to index incrementally"),
+    interval: float = typer.Option(None, "--interval", "-i", help="Seconds between scans"),
+    workers: int = typer.Option(None, "--workers", "-w", help="Parser processes (default: CPU count)"),
+    once: bool = typer.Option(False, "--once", help="Run a single scan and exit")
+):
+    """Keep the resume store in sync with a folder, parsing only new or changed files."""
+    import time
+    from app.core.config import WATCH_INTERVAL
+    from app.services.watch_service import WatchService
+    
+    def report(result):
+        for error in result.errors:
+            console.print(f"[red]{error['filename']}: {error['error']}[/red]")
+        if result.has_changes or once:
+            console.print(
+                f"[dim]{time.strftime('%H:%M:%S')}[/dim] "
+                f"[green]+{result.added}[/green] [yellow]~{result.changed}[/yellow] [red]-{result.deleted}[/red] "
+                f"({result.parsed} parsed, {result.unchanged} unchanged, {result.settling} settling) "
+                f"in {result.elapsed_s:.2f}s"
+            )
+    
+    try:
+        if once:
+            report(WatchService.sync(folder))
+            return
+        console.print(f"[cyan]Watching {folder}[/cyan] [dim](Ctrl+C to stop)[/dim]")
+        WatchService.watch(folder, workers=workers, interval=interval or WATCH_INTERVAL, on_sync=report)
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped[/dim]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@golden_app.command("snapshot")
+def golden_snapshot(
+    seed: int = typer.Option(42, "--seed", help="Seed for the synthetic corpus"),
+    resumes: int = typer.Option(60, "--resumes", help="Number of synthetic resumes"),
+    jds: int = typer.Option(5, "--jds", help="Number of synthetic job descriptions"),
+    formats: str = typer.Option("pdf,docx,txt", "--formats", help="Resume formats to generate"),
+    engine: str = typer.Option(None, "--engine", help="module:attr of an Engine (default: current code)"),
+    output: Path = typer.Option(DATA_DIR / "golden" / "golden.json", "--output", "-o", help="Where to write the snapshot")
+):
+    """Record current parse/analyze/match outputs over a generated corpus."""
+    from app.services.corpus_service import generate_corpus
+    from app.services.golden_service import GoldenService, load_engine, save_golden
+    
+    try:
+        format_list = [f.strip() for f in formats.split(",") if f.strip()]
+        with tempfile.TemporaryDirectory(prefix="resumesense-golden-") as tmp:
+            corpus = generate_corpus(seed, resumes, jds, format_list, Path(tmp))
+            with console.status(f"[cyan]Snapshotting {resumes} resumes x {jds} JDs...[/cyan]"):
+                golden = GoldenService.snapshot(corpus, load_engine(engine))
+        save_golden(golden, output)
+        timings = ", ".join(f"{stage} {seconds * 1000:.0f} ms" for stage, seconds in golden["timings_s"].items())
+        console.print(f"[green]Snapshot written to {output}[/green] [dim]({timings})[/dim]")
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+
+@golden_app.command("diff")
+def golden_diff(
+    golden: Path = typer.Argument(DATA_DIR / "golden" / "golden.json", help="Snapshot to compare against"),
+    engine: str = typer.Option(None, "--engine", help="module:attr of an Engine (default: current code)"),
+    output: Path = typer.Option(None, "--output", "-o", help="Write the full diff report as JSON"),
+    fail_on_change: bool = typer.Option(False, "--fail-on-change", help="Exit with status 1 if any output changed")
+):
+    """Diff an engine's outputs against a snapshot, with accuracy deltas and speedups."""
+    import json
+    from app.services.golden_service import diff_against_golden, load_engine
+    
+    try:
+        with tempfile.TemporaryDirectory(prefix="resumesense-golden-") as tmp:
+            with console.status("[cyan]Re-running the golden corpus...[/cyan]"):
+                report = diff_against_golden(golden, Path(tmp), load_engine(engine))
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    table = Table(title=f"Compared with {golden.name}", show_header=True)
+    table.add_column("Field", style="cyan")
+    for column in ("changed", "exact", "precision", "recall", "F1", "score delta"):
+        table.add_column(column, justify="right")
+    for row in report["fields"]:
+        table.add_row(
+            row["field"],
+            f"{row['changed']}/{row['compared']}",
+            f"{row['exact_pct']:.2f}%",
+            *(f"{row[k]:.4f}" if k in row else "" for k in ("precision", "recall", "f1", "mean_abs_delta"))
+        )
+    console.print(table)
+    
+    speed = Table(title="Speed", show_header=True)
+    speed.add_column("Stage", style="cyan")
+    for column in ("golden ms", "current ms", "speedup"):
+        speed.add_column(column, justify="right")
+    for stage, factor in report["speedups"].items():
+        speed.add_row(
+            stage,
+            f"{report['timings_s']['golden'][stage] * 1000:.1f}",
+            f"{report['timings_s']['current'][stage] * 1000:.1f}",
+            f"{factor:.2f}x" if factor else "-"
+        )
+    console.print(speed)
+    
+    for row in report["fields"]:
+        for example in row["examples"][:2]:
+            if "golden" in example:
+                console.print(f"[yellow]{row['field']}[/yellow] {example['id']}: {example['golden']!r} -> {example['current']!r}")
+            else:
+                console.print(f"[yellow]{row['field']}[/yellow] {example['id']}: text changed")
+    
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        console.print(f"[dim]Report written to {output}[/dim]")
+    
+    if report["identical"]:
+        console.print("[green]All outputs identical to the snapshot[/green]")
+    elif fail_on_change:
+        raise typer.Exit(1)
+
+
+@app.command()
+def bench(
+    seed: int = typer.Option(42, "--seed", help="Seed for the synthetic corpus"),
+    resumes: int = typer.Option(30, "--resumes", help="Number of synthetic resumes"),
+    jds: int = typer.Option(5, "--jds", help="Number of synthetic job descriptions"),
+    formats: str = typer.Option("pdf,docx,txt", "--formats", help="Resume formats to generate"),
+    stages: str = typer.Option("parse,analyze,match,end_to_end", "--stages",
+                               help="Stages to run: parse, analyze, match, end_to_end, http, startup_cli, startup_api"),
+    concurrency: str = typer.Option("1", "--concurrency", "-c", help="Comma-separated worker counts, e.g. 1,4,8"),
+    iterations: int = typer.Option(1, "--iterations", "-n", help="Passes over the corpus per measurement"),
+    url: str = typer.Option(None, "--url", help="Base URL of a running API server (http stage)"),
+    output: Path = typer.Option(DATA_DIR / "bench" / "latest.json", "--output", "-o", help="Where to write the JSON report"),
+    baseline: Path = typer.Option(None, "--baseline", help="Baseline report to compare against"),
+    threshold: float = typer.Option(10.0, "--threshold", help="Regression threshold in percent"),
+    corpus_dir: Path = typer.Option(None, "--corpus-dir", help="Keep generated files here instead of a temp dir")
+):
+    """Benchmark parsing, analysis and matching on a synthetic corpus."""
+    from app.services.corpus_service import generate_corpus
+    from app.services.bench_service import BenchService, load_report, save_report
+    
+    try:
+        levels = [int(c) for c in concurrency.split(",") if c.strip()]
+        stage_list = [s.strip() for s in stages.split(",") if s.strip()]
+        format_list = [f.strip() for f in formats.split(",") if f.strip()]
+        
+        with tempfile.TemporaryDirectory(prefix="resumesense-bench-") as tmp:
+            target = corpus_dir or Path(tmp)
+            console.print(f"[dim]Generating {resumes} resumes and {jds} JDs (seed {seed}) in {target}[/dim]")
+            corpus = generate_corpus(seed, resumes, jds, format_list, target)
+            report = BenchService.run(
+                corpus,
+                stages=stage_list,
+                concurrency=levels,
+                iterations=iterations,
+                url=url,
+                progress=lambda line: console.print(f"[dim]{line}[/dim]")
+            )
+        
+        table = Table(title="Benchmark Results", show_header=True)
+        table.add_column("Benchmark", style="cyan")
+        for column in ("ops/s", "p50 ms", "p95 ms", "p99 ms", "errors"):
+            table.add_column(column, justify="right")
+        for key, result in report["results"].items():
+            table.add_row(
+                key,
+                f"{result['throughput_per_s']:.1f}",
+                f"{result['p50_ms']:.2f}",
+                f"{result['p95_ms']:.2f}",
+                f"{result['p99_ms']:.2f}",
+                str(result["errors"])
+            )
+        console.print(table)
+        
+        regressions = []
+        if baseline:
+            comparison = BenchService.compare(report, load_report(baseline), threshold)
+            report["comparison"] = {"baseline": str(baseline), "threshold_pct": threshold, "rows": comparison}
+            
+            diff = Table(title=f"Compared with {baseline.name}", show_header=True)
+            diff.add_column("Benchmark", style="cyan")
+            diff.add_column("throughput", justify="right")
+            diff.add_column("p95", justify="right")
+            diff.add_column("Status")
+            for row in comparison:
+                diff.add_row(
+                    row["benchmark"],
+                    f"{row['throughput_change_pct']:+.1f}%",
+                    f"{row['p95_change_pct']:+.1f}%",
+                    "[red]REGRESSION[/red]" if row["regression"] else "[green]ok[/green]"
+                )
+            console.print(diff)
+            regressions = [r for r in comparison if r["regression"]]
+        
+        save_report(report, output)
+        console.print(f"[dim]Report written to {output}[/dim]")
+        
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    
+    if regressions:
+        console.print(f"[red]{len(regressions)} regression(s) above {threshold}%[/red]")
+        raise typer.Exit(1)
+
+
 @app.command()
 def version():
     """Show version information."""
-    console.print("[cyan]ResumeSense[/cyan] 2.0.0")
+    console.print(f"[cyan]ResumeSense[/cyan] {APP_VERSION}")
     console.print("[dim]AI-Powered Resume Parser & Analytics Platform[/dim]")
 
 
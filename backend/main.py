@@ -2,28 +2,94 @@
 ResumeSense 2.0 - FastAPI Application
 Main entry point for the REST API.
 """
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Header, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-import tempfile
-import os
+from typing import AsyncIterator, Optional, List
 
-from app.services.parser_service import parse_resume
-from app.services.nlp_service import analyze_resume
-from app.services.matcher_service import match_resume_to_jd
+from app.api.batch import BATCH_OPERATIONS, shutdown_executor, stream_results
+from app.api.responses import CompressionMiddleware, FastJSONResponse, etag_matches, not_modified, result_etag
+from app.api.uploads import ARCHIVE_TYPES, FORM_OVERHEAD_BYTES, RESUME_TYPES, UploadLimitMiddleware, ingest_upload
+from app.services.parser_service import parse_resume_stream
+from app.services.analytics_service import (
+    analytics_summary, related_skills, skill_trends, term_rarity, top_skills
+)
+from app.services.cache_service import cached_analyze_resume, cached_match_resume_to_jd
+from app.services.matcher_service import MatcherService
 from app.services.saliency_service import analyze_resume_saliency
-from app.core.config import API_HOST, API_PORT
-from pathlib import Path
+from app.services.pipeline_service import run_pipeline
+from app.services.job_service import JobWorkerPool, submit_job, get_job, cancel_job
+from app.core.admission import AdmissionMiddleware, admission
+from app.core.backends import warm_up
+from app.core.config import (
+    ADMIN_TOKEN, ADMISSION_ENABLED, API_HOST, API_PORT, APP_VERSION, JOB_POLL_INTERVAL, JOB_WORKERS,
+    MAX_BATCH_UPLOAD_BYTES, PROGRESS_HEARTBEAT_SECONDS, WARM_UP_BACKENDS
+)
+from app.core.coalesce import fingerprint, single_flight
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.profiling import ProfilingMiddleware, is_admin, load_summary
+from app.core.progress import REQUEST_ID, ProgressFull, ProgressMiddleware, format_event, hub, report
+
+# Server-Sent Event responses must not be cached or buffered by proxies
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop the background job workers with the server."""
+    if WARM_UP_BACKENDS:
+        # Pay for the heavy imports now rather than in the first request
+        await asyncio.to_thread(warm_up)
+    pool = JobWorkerPool(JOB_WORKERS) if JOB_WORKERS > 0 else None
+    if pool:
+        pool.start()
+    yield
+    if pool:
+        pool.stop()
+    shutdown_executor()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="ResumeSense 2.0",
     description="AI-Powered Resume Parser & Analytics Platform",
-    version="2.0.0"
+    version=APP_VERSION,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
-# Enable CORS for frontend
+# Refuse oversized uploads before the multipart body is parsed
+app.add_middleware(
+    UploadLimitMiddleware,
+    overrides={
+        "/api/jobs": MAX_BATCH_UPLOAD_BYTES + FORM_OVERHEAD_BYTES,
+        "/api/batch": MAX_BATCH_UPLOAD_BYTES + FORM_OVERHEAD_BYTES
+    }
+)
+
+# On-demand per-request profiling for admins (X-Profile header)
+if ADMIN_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+# Per-endpoint concurrency budgets; excess load is shed with 429/503
+if ADMISSION_ENABLED:
+    app.add_middleware(AdmissionMiddleware, controller=admission)
+
+# Stage events for requests sent with an issued X-Request-ID (GET /api/progress/{id});
+# outside admission so shed requests end their stream with "failed"
+app.add_middleware(ProgressMiddleware)
+
+# gzip/brotli for large complete responses (inside metrics: sizes are wire sizes)
+app.add_middleware(CompressionMiddleware)
+
+# Latency, in-flight and response size for every request
+app.add_middleware(MetricsMiddleware, router=app.router)
+
+# Enable CORS for frontend. Outermost, so 413/429/503 and other responses
+# produced by the middlewares above still carry the CORS headers
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -44,6 +110,42 @@ class AnalyzeRequest(BaseModel):
     text: str
 
 
+class RarityRequest(BaseModel):
+    terms: List[str] = []
+    jd_text: Optional[str] = None
+    resume_text: Optional[str] = None
+
+
+# ============ Shared work ============
+# Upload handlers run their parse/model work through single_flight, keyed by
+# the upload's content hash and any parameters that change the result, so
+# identical concurrent uploads (several tabs, client retries) share one run.
+# The shared run gets its own copy of the upload, made only by the leader:
+# Starlette closes the leader's file when its request ends, while followers
+# may still be waiting. Stage events go to the leader's progress stream
+# only; a follower's stream gets just "accepted" and "completed"/"failed".
+
+def _parse_upload(stream, ext: str) -> str:
+    text = parse_resume_stream(stream, ext)
+    report("parsed", {"char_count": len(text)})
+    return text
+
+
+def _analyze_upload(stream, ext: str) -> dict:
+    data = cached_analyze_resume(_parse_upload(stream, ext))
+    report("analyzed", {"resume_data": data})
+    return data
+
+
+def _match_upload(stream, ext: str, jd_text: str) -> dict:
+    resume_text = _parse_upload(stream, ext)
+    resume_data = cached_analyze_resume(resume_text)
+    report("analyzed", {"resume_data": resume_data})
+    match_result = cached_match_resume_to_jd(resume_text, jd_text)
+    report("matched", {"match_result": match_result})
+    return {"resume_data": resume_data, "match_result": match_result}
+
+
 # ============ Endpoints ============
 
 @app.get("/")
@@ -52,33 +154,43 @@ async def root():
     return {
         "status": "running",
         "service": "ResumeSense 2.0",
-        "version": "2.0.0"
+        "version": APP_VERSION
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker process."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/admission")
+async def admission_status():
+    """Live usage of the per-endpoint admission budgets in this worker process."""
+    return {"enabled": ADMISSION_ENABLED, "budgets": admission.snapshot()}
+
+
 @app.post("/api/parse")
-async def parse_file(file: UploadFile = File(...)):
+async def parse_file(
+    response: Response,
+    file: UploadFile = File(...),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Parse a resume file and extract raw text.
     
     Supports: PDF, DOCX, TXT
     """
-    # Validate file extension
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in {".pdf", ".docx", ".doc", ".txt"}:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type: {ext}. Supported: PDF, DOCX, TXT"
-        )
+    upload = await ingest_upload(file)
+    etag = result_etag("parse", upload.sha256, file.filename)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    # Save to temp file and process
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        text = parse_resume(tmp_path)
+        text = await single_flight.do(
+            "parse", upload.sha256, lambda: asyncio.to_thread(_parse_upload, upload.detached(), upload.ext)
+        )
+        response.headers["ETag"] = etag
         
         return {
             "success": True,
@@ -88,33 +200,28 @@ async def parse_file(file: UploadFile = File(...)):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
 
 
 @app.post("/api/analyze")
-async def analyze_file(file: UploadFile = File(...)):
+async def analyze_file(
+    response: Response,
+    file: UploadFile = File(...),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Analyze a resume file and extract structured information.
     """
-    # First parse the file
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in {".pdf", ".docx", ".doc", ".txt"}:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type: {ext}"
-        )
+    upload = await ingest_upload(file)
+    etag = result_etag("analyze", upload.sha256, file.filename)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
         # Parse and analyze
-        text = parse_resume(tmp_path)
-        data = analyze_resume(text)
+        data = await single_flight.do(
+            "analyze", upload.sha256, lambda: asyncio.to_thread(_analyze_upload, upload.detached(), upload.ext)
+        )
+        response.headers["ETag"] = etag
         
         return {
             "success": True,
@@ -123,13 +230,14 @@ async def analyze_file(file: UploadFile = File(...)):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
 
 
 @app.post("/api/analyze/text")
-async def analyze_text(request: AnalyzeRequest):
+async def analyze_text(
+    request: AnalyzeRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Analyze resume text directly (for already-parsed content).
     """
@@ -139,12 +247,21 @@ async def analyze_text(request: AnalyzeRequest):
             detail="Text too short. Please provide more content."
         )
     
-    data = analyze_resume(request.text)
+    etag = result_etag("analyze_text", request.text)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    data = cached_analyze_resume(request.text)
+    response.headers["ETag"] = etag
     return {"success": True, "data": data}
 
 
 @app.post("/api/match")
-async def match_resume(request: MatchRequest):
+async def match_resume(
+    request: MatchRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Match resume text against a job description.
     """
@@ -154,53 +271,54 @@ async def match_resume(request: MatchRequest):
             detail="Both resume_text and jd_text are required."
         )
     
-    result = match_resume_to_jd(request.resume_text, request.jd_text)
+    etag = result_etag("match_text", request.resume_text, request.jd_text)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    result = cached_match_resume_to_jd(request.resume_text, request.jd_text)
+    response.headers["ETag"] = etag
     return {"success": True, "result": result}
 
 
 @app.post("/api/match/file")
 async def match_file(
+    response: Response,
     file: UploadFile = File(...),
-    jd_text: str = Form(...)
+    jd_text: str = Form(...),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Upload a resume file and match against job description text.
     """
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in {".pdf", ".docx", ".doc", ".txt"}:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type: {ext}"
-        )
+    upload = await ingest_upload(file)
+    etag = result_etag("match", upload.sha256, file.filename, jd_text)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
         # Parse, analyze, and match
-        resume_text = parse_resume(tmp_path)
-        data = analyze_resume(resume_text)
-        match_result = match_resume_to_jd(resume_text, jd_text)
+        result = await single_flight.do(
+            "match",
+            (upload.sha256, fingerprint(jd_text)),
+            lambda: asyncio.to_thread(_match_upload, upload.detached(), upload.ext, jd_text)
+        )
+        response.headers["ETag"] = etag
         
         return {
             "success": True,
             "filename": file.filename,
-            "resume_data": data,
-            "match_result": match_result
+            **result
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
 
 
 @app.post("/api/saliency")
 async def analyze_saliency(
+    response: Response,
     file: UploadFile = File(...),
-    api_key: Optional[str] = Form(None)
+    api_key: Optional[str] = Form(None),
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     Analyze a resume PDF for visual attention patterns.
@@ -210,21 +328,19 @@ async def analyze_saliency(
     
     Requires GOOGLE_API_KEY environment variable or api_key form field.
     """
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext != ".pdf":
-        raise HTTPException(
-            status_code=400,
-            detail="Saliency analysis only supports PDF files"
-        )
+    upload = await ingest_upload(file, allowed={".pdf"})
+    etag = result_etag("saliency", upload.sha256, file.filename, api_key)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=ext) as tmp:
-            content = await file.read()
-            tmp.write(content)
-            tmp_path = tmp.name
-        
-        # Analyze saliency using Gemini Vision
-        result = analyze_resume_saliency(Path(tmp_path), api_key)
+        # Analyze saliency using Gemini Vision. The key is part of the
+        # coalescing key so one caller's key never serves another's request.
+        result = await single_flight.do(
+            "saliency",
+            (upload.sha256, fingerprint(api_key)),
+            lambda: asyncio.to_thread(analyze_resume_saliency, upload.detached(), api_key)
+        )
         
         if not result.get("success", False):
             raise HTTPException(
@@ -232,6 +348,7 @@ async def analyze_saliency(
                 detail=result.get("error", "Saliency analysis failed")
             )
         
+        response.headers["ETag"] = etag
         return {
             "success": True,
             "filename": file.filename,
@@ -249,9 +366,270 @@ async def analyze_saliency(
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'tmp_path' in locals():
-            os.unlink(tmp_path)
+
+
+@app.post("/api/pipeline")
+async def pipeline(
+    response: Response,
+    file: UploadFile = File(...),
+    jd_text: Optional[str] = Form(None),
+    api_key: Optional[str] = Form(None),
+    saliency: bool = Form(True),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Run parse, analyze, match and saliency on a single upload.
+    
+    The file is uploaded and parsed once; analysis and JD matching run
+    concurrently with the saliency render and Gemini call. Saliency
+    failures (e.g. missing API key) are reported in the "saliency" field
+    without failing the other stages.
+    """
+    upload = await ingest_upload(file)
+    etag = result_etag("pipeline", upload.sha256, file.filename, jd_text, api_key, str(saliency))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        result = await single_flight.do(
+            "pipeline",
+            (upload.sha256, fingerprint(jd_text, api_key, str(saliency))),
+            lambda: run_pipeline(upload.detached(), jd_text, api_key, saliency, ext=upload.ext)
+        )
+        response.headers["ETag"] = etag
+        
+        return {
+            "success": True,
+            "filename": file.filename,
+            **result
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/jobs", status_code=202)
+async def create_job(
+    operation: str = Form(...),
+    files: List[UploadFile] = File(...),
+    jd_text: Optional[str] = Form(None)
+):
+    """
+    Submit a background job over one or more files.
+    
+    Operations: parse, analyze, match, rank (match + sort by score) and
+    saliency. match and rank require jd_text; saliency uses the server's
+    GOOGLE_API_KEY. Poll GET /api/jobs/{job_id} for progress and results.
+    """
+    allowed = {".pdf"} if operation == "saliency" else RESUME_TYPES
+    uploads = []
+    for file in files:
+        upload = await ingest_upload(file, allowed=allowed)
+        uploads.append((upload.filename, upload.ext, upload.file))
+    
+    try:
+        # Copies the files into JOBS_DIR and writes SQLite: off the event loop
+        job_id = await asyncio.to_thread(submit_job, operation, uploads, {"jd_text": jd_text} if jd_text else {})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"success": True, "job_id": job_id, "status": "queued", "total": len(uploads)}
+
+
+@app.post("/api/batch")
+async def batch(
+    operation: str = Form("analyze"),
+    files: List[UploadFile] = File(...),
+    jd_text: Optional[str] = Form(None)
+):
+    """
+    Process many resumes in one request: any mix of files and zip archives.
+    
+    Streams application/x-ndjson: one line per resume as it finishes
+    ({"index", "filename", "success", ...result or "error"}), then a
+    {"done": true, ...} summary line. Operations: parse, analyze, match
+    (requires jd_text).
+    """
+    if operation not in BATCH_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown operation: {operation}. Supported: {', '.join(BATCH_OPERATIONS)}")
+    if operation == "match" and not jd_text:
+        raise HTTPException(status_code=400, detail="jd_text is required for match")
+    
+    # Archives are checked against the batch limit; their members, and plain
+    # files, against the per-file limit while streaming
+    uploads = [
+        await ingest_upload(file, allowed=RESUME_TYPES | ARCHIVE_TYPES, max_bytes=MAX_BATCH_UPLOAD_BYTES)
+        for file in files
+    ]
+    return StreamingResponse(stream_results(operation, uploads, jd_text), media_type="application/x-ndjson")
+
+
+@app.get("/api/jobs/{job_id}")
+async def job_status(job_id: str, results: bool = True):
+    """Report job progress and, unless results=false, per-file results."""
+    job = await asyncio.to_thread(get_job, job_id, results)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return {"success": True, **job}
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Follow a job over Server-Sent Events.
+    
+    Sends a "progress" event whenever the counts change, a "result" event
+    per file as it finishes (with its result), and ends with "completed",
+    "failed" or "cancelled".
+    """
+    job = await asyncio.to_thread(get_job, job_id, False)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    async def events() -> AsyncIterator[bytes]:
+        seq = 0
+        reported = set()
+        last_progress = None
+        idle = 0.0
+        while True:
+            state = await asyncio.to_thread(get_job, job_id, False)
+            if state is None:
+                return
+            payloads = []
+            if state["progress"] != last_progress:
+                finished = state["progress"]["done"] + state["progress"]["failed"]
+                if last_progress is None or finished != last_progress["done"] + last_progress["failed"]:
+                    # Only read the stored results when files have finished
+                    state = await asyncio.to_thread(get_job, job_id, True) or state
+                last_progress = state["progress"]
+                payloads.append(("progress", {"status": state["status"], **last_progress}))
+            for item in state.get("results", []):
+                if item["status"] in ("done", "failed") and item["index"] not in reported:
+                    reported.add(item["index"])
+                    payloads.append(("result", item))
+            if state["status"] in ("completed", "failed", "cancelled"):
+                payloads.append((state["status"], {"status": state["status"], **last_progress}))
+            for event, data in payloads:
+                seq += 1
+                yield format_event(seq, event, data)
+            if state["status"] in ("completed", "failed", "cancelled"):
+                return
+            idle = 0.0 if payloads else idle + JOB_POLL_INTERVAL
+            if idle >= PROGRESS_HEARTBEAT_SECONDS:
+                idle = 0.0
+                yield format_event(0, "heartbeat", None)
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.delete("/api/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Cancel a job. Files already being processed finish; the rest are skipped."""
+    if not await asyncio.to_thread(cancel_job, job_id):
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return {"success": True, **await asyncio.to_thread(get_job, job_id, False)}
+
+
+# ============ Analytics ============
+# Pool-wide skill statistics over the resume store, maintained as resumes
+# are stored; every query reads a bounded number of rows.
+
+@app.get("/api/analytics")
+async def analytics():
+    """Pool size and analytics settings."""
+    return {"success": True, **await asyncio.to_thread(analytics_summary)}
+
+
+@app.get("/api/analytics/skills")
+async def analytics_skills(limit: int = 20, bucket: Optional[str] = None):
+    """
+    Most common skills across the pool, or among resumes stored in one time
+    bucket ("current", or a label such as 2024-W10 / 2024-03-05 / 2024-03).
+    """
+    return {"success": True, **await asyncio.to_thread(top_skills, limit, bucket)}
+
+
+@app.get("/api/analytics/trends")
+async def analytics_trends(periods: int = 4, limit: int = 10):
+    """Top skills per time bucket for the current and previous periods."""
+    return {"success": True, "buckets": await asyncio.to_thread(skill_trends, periods, limit)}
+
+
+@app.get("/api/analytics/skills/{skill}/related")
+async def analytics_related(skill: str, limit: int = 10):
+    """Skills most often listed together with a skill, with confidence and lift."""
+    return {"success": True, **await asyncio.to_thread(related_skills, skill, limit)}
+
+
+@app.post("/api/analytics/rarity")
+async def analytics_rarity(request: RarityRequest):
+    """
+    How common keywords are across the pool, rarest first.
+    
+    Pass terms directly, a jd_text (all of its keywords), or a jd_text and
+    resume_text (the keywords the resume is missing).
+    """
+    terms = list(request.terms)
+    if request.jd_text and request.resume_text:
+        terms += cached_match_resume_to_jd(request.resume_text, request.jd_text)["missing_skills"]
+    elif request.jd_text:
+        terms += sorted(MatcherService.compile_jd(request.jd_text))
+    if not terms:
+        raise HTTPException(status_code=400, detail="Provide terms or jd_text.")
+    return {"success": True, **await asyncio.to_thread(term_rarity, terms)}
+
+
+# ============ Progress ============
+
+@app.post("/api/progress", status_code=201)
+async def create_progress():
+    """
+    Issue a request ID for following one request's stages.
+    
+    Send it as X-Request-ID on the request and follow
+    GET /api/progress/{request_id}. IDs are unguessable, valid for one
+    request and expire after PROGRESS_TTL_SECONDS unused.
+    """
+    try:
+        request_id = hub.issue()
+    except ProgressFull:
+        raise HTTPException(status_code=503, detail="Too many progress streams open, retry later")
+    return {"success": True, "request_id": request_id}
+
+
+@app.get("/api/progress/{request_id}")
+async def progress_events(request_id: str, request: Request):
+    """
+    Follow a request sent with the same X-Request-ID over Server-Sent Events.
+    
+    Subscribe before or after sending the request; past events are replayed
+    (after Last-Event-ID on reconnect). Stage events carry partial results:
+    accepted, parsed, analyzed, matched, rendered, model-responded, then
+    completed or failed with the HTTP status.
+    """
+    if not REQUEST_ID.match(request_id) or request_id not in hub:
+        raise HTTPException(status_code=404, detail="Unknown or expired request ID; get one from POST /api/progress")
+    try:
+        last_event_id = int(request.headers.get("last-event-id", "0"))
+    except ValueError:
+        last_event_id = 0
+    
+    async def events() -> AsyncIterator[bytes]:
+        async for seq, event, data in hub.subscribe(request_id, last_event_id):
+            yield format_event(seq, event, data)
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@app.get("/api/admin/profiles/{profile_id}", response_class=PlainTextResponse)
+async def profile_summary(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Return the hot-function summary of a captured request profile."""
+    if not is_admin(x_admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    summary = load_summary(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail=f"Profile not found: {profile_id}")
+    return PlainTextResponse(summary)
 
 
 # ============ Run Server ============
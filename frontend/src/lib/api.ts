@@ -106,3 +106,176 @@ export async function analyzeSaliency(file: File, apiKey?: string): Promise<Sali
 
     return response.json();
 }
+
+// ============ Pipeline ============
+
+export interface PipelineResponse {
+    success: boolean;
+    filename: string;
+    resume_data: ResumeData;
+    match_result: MatchResult | null;
+    saliency: (Partial<SaliencyResponse> & { error?: string }) | null;
+    char_count: number;
+    timings: Record<string, number>;
+}
+
+export type StageEvent =
+    | 'accepted' | 'parsed' | 'analyzed' | 'matched' | 'rendered' | 'model-responded'
+    | 'completed' | 'failed';
+
+const STAGE_EVENTS: StageEvent[] = [
+    'accepted', 'parsed', 'analyzed', 'matched', 'rendered', 'model-responded', 'completed', 'failed',
+];
+
+/**
+ * Get a server-issued request ID to send as X-Request-ID (one request).
+ */
+export async function createProgressId(): Promise<string> {
+    const response = await fetch(`${API_BASE}/api/progress`, { method: 'POST' });
+    if (!response.ok) {
+        const error = await response.json();
+        throw new Error(error.detail || 'Failed to create progress stream');
+    }
+    return (await response.json()).request_id;
+}
+
+/**
+ * Follow the stage events of a request sent with X-Request-ID: requestId.
+ * Each event carries the partial result of its stage. Returns a function
+ * that stops listening; the stream also closes on completed/failed.
+ */
+export function followProgress(
+    requestId: string,
+    onStage: (event: StageEvent, data: Record<string, unknown>) => void
+): () => void {
+    const source = new EventSource(`${API_BASE}/api/progress/${encodeURIComponent(requestId)}`);
+    STAGE_EVENTS.forEach(event => {
+        source.addEventListener(event, message => {
+            onStage(event, JSON.parse((message as MessageEvent).data));
+            if (event === 'completed' || event === 'failed') source.close();
+        });
+    });
+    return () => source.close();
+}
+
+export async function runPipeline(
+    file: File,
+    options: {
+        jdText?: string;
+        apiKey?: string;
+        saliency?: boolean;
+        onStage?: (event: StageEvent, data: Record<string, unknown>) => void;
+    } = {}
+): Promise<PipelineResponse> {
+    const formData = new FormData();
+    formData.append('file', file);
+    if (options.jdText) {
+        formData.append('jd_text', options.jdText);
+    }
+    if (options.apiKey) {
+        formData.append('api_key', options.apiKey);
+    }
+    formData.append('saliency', String(options.saliency ?? true));
+
+    // Subscribe first so no stage is missed (past events are replayed anyway)
+    const headers: Record<string, string> = {};
+    let stop = () => {};
+    if (options.onStage) {
+        const requestId = await createProgressId();
+        headers['X-Request-ID'] = requestId;
+        stop = followProgress(requestId, options.onStage);
+    }
+
+    try {
+        const response = await fetch(`${API_BASE}/api/pipeline`, {
+            method: 'POST',
+            body: formData,
+            headers,
+        });
+
+        if (!response.ok) {
+            const error = await response.json();
+            throw new Error(error.detail || 'Failed to run pipeline');
+        }
+
+        return await response.json();
+    } catch (error) {
+        stop();
+        throw error;
+    }
+}
+
+// ============ Batch ============
+
+export interface BatchItem {
+    index: number;
+    filename: string;
+    success: boolean;
+    error?: string;
+    data?: ResumeData;
+    resume_data?: ResumeData;
+    match_result?: MatchResult;
+    elapsed_ms?: number;
+}
+
+export interface BatchSummary {
+    done: true;
+    total: number;
+    succeeded: number;
+    failed: number;
+    elapsed_ms: number;
+}
+
+/**
+ * Upload many resumes (files and/or .zip archives) in one request and
+ * receive each result through onItem as soon as the server finishes it.
+ */
+export async function runBatch(
+    files: File[],
+    onItem: (item: BatchItem) => void,
+    options: { operation?: 'parse' | 'analyze' | 'match'; jdText?: string } = {}
+): Promise<BatchSummary> {
+    const formData = new FormData();
+    formData.append('operation', options.operation ?? (options.jdText ? 'match' : 'analyze'));
+    if (options.jdText) {
+        formData.append('jd_text', options.jdText);
+    }
+    files.forEach(file => formData.append('files', file));
+
+    const response = await fetch(`${API_BASE}/api/batch`, {
+        method: 'POST',
+        body: formData,
+    });
+
+    if (!response.ok || !response.body) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || 'Failed to process batch');
+    }
+
+    // NDJSON: one JSON object per line, the last one is the summary
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let summary: BatchSummary | null = null;
+    for (;;) {
+        const { done, value } = await reader.read();
+        buffer += decoder.decode(value, { stream: !done });
+        const lines = buffer.split('\n');
+        buffer = done ? '' : lines.pop() ?? '';
+        for (const line of lines) {
+            if (!line.trim()) continue;
+            const message = JSON.parse(line);
+            if (message.done) {
+                summary = message;
+            } else {
+                onItem(message);
+            }
+        }
+        if (done) break;
+    }
+
+    if (!summary) {
+        throw new Error('Batch stream ended early');
+    }
+    return summary;
+}